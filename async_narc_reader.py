@@ -0,0 +1,118 @@
+"""
+async_narc_reader.py - asyncio 서비스용 비동기 NARC 추출 API
+
+NarcReader.extract_file과 PNG 인코딩은 블로킹 작업이므로, 크기가 제한된
+스레드 풀에서 실행하여 이벤트 루프를 막지 않도록 합니다.
+동시에 실행 중인 작업 수는 세마포어로 제한되며(백프레셔),
+호출 측 태스크가 취소되면 대기 중인 작업도 함께 취소됩니다.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from narc_reader import NarcReader
+from pokemon_sprite_converter import PokemonSpriteConverter
+
+
+class AsyncNarcReader:
+    """NarcReader의 비동기 래퍼"""
+
+    def __init__(self, filename: str, max_workers: int = 4, max_pending: int = 32,
+                 is_diamond_pearl: bool = False, use_index: bool = False):
+        """
+        Args:
+            filename: NARC 파일 경로
+            max_workers: 파일 읽기/PNG 인코딩용 스레드 수
+            max_pending: 동시에 스레드 풀에 제출할 수 있는 최대 작업 수 (백프레셔)
+            is_diamond_pearl: DP 포맷 여부 (PNG 렌더링용)
+            use_index: True면 사이드카 인덱스(.idx) 사용
+        """
+        self.reader = NarcReader(filename, use_index=use_index)
+        self.converter = PokemonSpriteConverter(is_diamond_pearl)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="narc-reader")
+        self._slots = asyncio.Semaphore(max_pending)
+
+    async def __aenter__(self) -> "AsyncNarcReader":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self.reader)
+
+    async def close(self) -> None:
+        """스레드 풀 종료 (실행 중인 작업은 마저 끝나고, 대기 중인 작업은 취소)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func, *args):
+        """블로킹 함수를 스레드 풀에서 실행 (max_pending개까지만 동시 제출)"""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def extract(self, file_id: int) -> bytes:
+        """지정된 ID의 파일을 비동기로 추출"""
+        return await self._run(self.reader.extract_file, file_id)
+
+    async def extract_many(self, file_ids: Iterable[int]) -> List[bytes]:
+        """여러 파일을 동시에 추출 (입력 순서대로 반환)
+
+        하나라도 실패하거나 호출이 취소되면 나머지 작업도 취소됩니다.
+        """
+        tasks = [asyncio.ensure_future(self.extract(file_id)) for file_id in file_ids]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def iter_entries(self, file_ids: Optional[Iterable[int]] = None,
+                           prefetch: Optional[int] = None) -> AsyncIterator[Tuple[int, bytes]]:
+        """엔트리를 순서대로 (file_id, data)로 순회
+
+        최대 prefetch개까지만 미리 읽어 두므로, 소비자가 느리면 읽기도 함께 멈춥니다.
+
+        Args:
+            file_ids: 순회할 파일 ID들 (None이면 전체)
+            prefetch: 미리 읽을 최대 엔트리 수 (기본: max_pending)
+        """
+        if file_ids is None:
+            file_ids = range(len(self.reader))
+        if prefetch is None:
+            prefetch = self.max_pending
+
+        pending = []
+        file_id_iter = iter(file_ids)
+        try:
+            for file_id in file_id_iter:
+                pending.append((file_id, asyncio.ensure_future(self.extract(file_id))))
+                if len(pending) >= prefetch:
+                    head_id, head_task = pending.pop(0)
+                    yield head_id, await head_task
+
+            while pending:
+                head_id, head_task = pending.pop(0)
+                yield head_id, await head_task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def render_png(self, sprite_id: int, palette_id: int) -> bytes:
+        """스프라이트/팔레트 엔트리를 읽어 PNG 바이트로 렌더링"""
+        sprite_data, palette_data = await self.extract_many([sprite_id, palette_id])
+        return await self._run(self.converter.pokemon_to_png_bytes, sprite_data, palette_data)
+
+
+# 사용 예제
+if __name__ == "__main__":
+    async def _example():
+        async with AsyncNarcReader("pl_pokegra.narc") as reader:
+            # 이상해씨(#001) 수컷 앞모습, 노말 팔레트
+            png_data = await reader.render_png(1 * 6 + 3, 1 * 6 + 4)
+            print(f"PNG 렌더링 완료: {len(png_data)} bytes")
+
+    asyncio.run(_example())
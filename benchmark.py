@@ -0,0 +1,200 @@
+"""
+benchmark.py - 변환 파이프라인 성능 측정 도구
+
+실제 아카이브 전체를 대상으로 각 단계를 실행하고 소요 시간과 출력 크기를 보고합니다.
+변환 함수들의 진행 로그는 측정 중에는 출력하지 않습니다.
+
+사용법:
+    python benchmark.py compression <pl_pokegra.narc> [--png-bits 4] [--repeat 3]
+    python benchmark.py atlas <pl_pokegra.narc> [--repeat 3]
+    python benchmark.py arena <narc> [--workers 4]
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def _quiet():
+    """변환 함수들의 print 출력 억제"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _directory_size(path: str) -> Tuple[int, int]:
+    """디렉토리 아래 파일 수와 전체 바이트 수"""
+    file_count = 0
+    total_bytes = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_count += 1
+            total_bytes += os.path.getsize(os.path.join(root, name))
+    return file_count, total_bytes
+
+
+def time_best(func: Callable[[], object], repeat: int = 1, setup: Optional[Callable[[], object]] = None) -> float:
+    """func를 repeat번 실행하여 가장 빠른 시간(초) 반환
+
+    Args:
+        func: 측정할 함수
+        repeat: 반복 횟수
+        setup: 매 실행 전에 호출할 준비 함수 (측정에서 제외)
+    """
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        with _quiet():
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_compression_profiles(narc_file: str, is_diamond_pearl: bool = False, png_bits: int = 8,
+                               profiles: Optional[List[str]] = None, repeat: int = 1) -> List[Dict]:
+    """압축 프로파일별 convert_narc_to_pngs 소요 시간과 출력 크기 측정
+
+    Args:
+        narc_file: pl_pokegra.narc 경로
+        is_diamond_pearl: DP 포맷 여부
+        png_bits: 출력 PNG 비트 수 (8 또는 4)
+        profiles: 측정할 프로파일들 (None이면 전체)
+        repeat: 프로파일별 반복 횟수 (가장 빠른 시간 사용)
+
+    Returns:
+        List[Dict]: 프로파일별 {'profile', 'seconds', 'files', 'bytes'}
+    """
+    from png_chunks import COMPRESSION_PROFILES
+    from pokemon_sprite_converter import convert_narc_to_pngs
+
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="pokegra_bench_")
+    try:
+        for profile in profiles or list(COMPRESSION_PROFILES):
+            output_dir = os.path.join(work_dir, profile)
+
+            def reset_output():
+                shutil.rmtree(output_dir, ignore_errors=True)
+
+            seconds = time_best(
+                lambda: convert_narc_to_pngs(narc_file, output_dir, is_diamond_pearl, png_bits, profile),
+                repeat, setup=reset_output)
+            file_count, total_bytes = _directory_size(output_dir)
+            results.append({'profile': profile, 'seconds': seconds, 'files': file_count, 'bytes': total_bytes})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def bench_atlas_export(narc_file: str, is_diamond_pearl: bool = False, repeat: int = 1) -> List[Dict]:
+    """스프라이트별 PNG 추출과 아틀라스 내보내기의 시간/출력 크기 비교
+
+    Returns:
+        List[Dict]: 방식별 {'mode', 'seconds', 'files', 'bytes'}
+    """
+    from pokemon_sprite_converter import convert_narc_to_pngs
+    from sprite_atlas import export_narc_to_atlas
+
+    modes = [
+        ('pngs', lambda output_dir: convert_narc_to_pngs(narc_file, output_dir, is_diamond_pearl)),
+        ('atlas', lambda output_dir: export_narc_to_atlas(narc_file, output_dir, is_diamond_pearl)),
+    ]
+
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="pokegra_bench_")
+    try:
+        for mode, run in modes:
+            output_dir = os.path.join(work_dir, mode)
+            seconds = time_best(lambda: run(output_dir), repeat,
+                                setup=lambda: shutil.rmtree(output_dir, ignore_errors=True))
+            file_count, total_bytes = _directory_size(output_dir)
+            results.append({'mode': mode, 'seconds': seconds, 'files': file_count, 'bytes': total_bytes})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def print_table(rows: List[Dict], columns: List[Tuple[str, str, str]]) -> None:
+    """결과 표 출력
+
+    Args:
+        rows: 결과 행들
+        columns: [(키, 헤더, 포맷 문자열), ...]
+    """
+    cells = [[header for _, header, _ in columns]]
+    for row in rows:
+        cells.append([format(row[key], fmt) for key, _, fmt in columns])
+
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    for line in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="변환 파이프라인 성능 측정")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compression_parser = subparsers.add_parser("compression", help="PNG 압축 프로파일별 시간/크기 비교")
+    compression_parser.add_argument("narc_file", help="pl_pokegra.narc 경로")
+    compression_parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    compression_parser.add_argument("--png-bits", type=int, choices=(4, 8), default=8)
+    compression_parser.add_argument("--repeat", type=int, default=1, help="프로파일별 반복 횟수")
+
+    atlas_parser = subparsers.add_parser("atlas", help="PNG 개별 추출과 아틀라스 내보내기 비교")
+    atlas_parser.add_argument("narc_file", help="pl_pokegra.narc 경로")
+    atlas_parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    atlas_parser.add_argument("--repeat", type=int, default=1, help="방식별 반복 횟수")
+
+    arena_parser = subparsers.add_parser("arena", help="공유 메모리 아레나 attach와 워커별 디코딩 비교")
+    arena_parser.add_argument("narc_file", help="NARC 경로")
+    arena_parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    arena_parser.add_argument("--workers", type=int, default=4)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compression":
+        rows = bench_compression_profiles(args.narc_file, args.dp, args.png_bits, repeat=args.repeat)
+        baseline = next((row for row in rows if row['profile'] == 'default'), rows[0])
+        for row in rows:
+            row['kib'] = row['bytes'] / 1024
+            row['size_ratio'] = row['bytes'] / baseline['bytes'] if baseline['bytes'] else 0.0
+            row['speedup'] = baseline['seconds'] / row['seconds'] if row['seconds'] else 0.0
+
+        print(f"압축 프로파일 비교: {args.narc_file} ({args.png_bits}bpp, {rows[0]['files']}개 PNG)")
+        print_table(rows, [('profile', 'profile', 's'), ('seconds', 'seconds', '.3f'),
+                           ('kib', 'KiB', '.1f'), ('size_ratio', 'size', '.3f'), ('speedup', 'speed', '.2f')])
+    elif args.command == "atlas":
+        rows = bench_atlas_export(args.narc_file, args.dp, args.repeat)
+        for row in rows:
+            row['kib'] = row['bytes'] / 1024
+
+        print(f"아틀라스 내보내기 비교: {args.narc_file}")
+        print_table(rows, [('mode', 'mode', 's'), ('seconds', 'seconds', '.3f'),
+                           ('files', 'files', 'd'), ('kib', 'KiB', '.1f')])
+    elif args.command == "arena":
+        from sprite_arena import measure_arena
+
+        result = measure_arena(args.narc_file, args.dp, args.workers)
+        rows = [
+            {'step': 'create (decode once)', 'ms': result['decode_seconds'] * 1000},
+            {'step': 'worker attach', 'ms': result['attach_seconds'] * 1000},
+            {'step': 'worker decode', 'ms': result['worker_decode_seconds'] * 1000},
+        ]
+
+        print(f"공유 메모리 아레나: {args.narc_file} (스프라이트 {result['sprites']}개, "
+              f"{result['bytes'] / 1024 / 1024:.1f} MB, 워커 {args.workers}개)")
+        print_table(rows, [('step', 'step', 's'), ('ms', 'ms', '.2f')])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
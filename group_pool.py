@@ -0,0 +1,60 @@
+"""
+group_pool.py - 도감번호 그룹 단위 병렬 처리
+
+palette_processor / png_editor.palette_swap의 process_group은 그룹(도감번호)끼리
+서로 독립적인 CPU 작업이므로 프로세스 풀에서 나누어 실행할 수 있습니다.
+
+- 결과는 입력 순서대로 돌려줍니다.
+- 그룹별 예외는 워커 안에서 잡아 문자열로 돌려주므로, 한 그룹이 실패해도
+  나머지 그룹은 계속 처리됩니다 (직렬 실행의 try/except와 동일).
+- 워커의 print 출력은 그룹별로 모아 두었다가 순서대로 출력할 수 있도록 함께 돌려줍니다.
+"""
+
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+
+class GroupOutcome(NamedTuple):
+    """그룹 하나의 처리 결과"""
+    group_number: int
+    result: Any
+    error: Optional[str]
+    log: str
+
+
+def _run_group_captured(process_group: Callable, args: Tuple) -> Tuple[Any, Optional[str], str]:
+    """워커 프로세스: 출력을 모으며 process_group 실행 (예외는 문자열로 반환)"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            result = process_group(*args)
+            error = None
+        except Exception as e:
+            result = None
+            error = str(e)
+    return result, error, buffer.getvalue()
+
+
+def run_groups_in_pool(process_group: Callable, group_args: Sequence[Tuple], jobs: int) -> Iterator[GroupOutcome]:
+    """process_group(*args)들을 프로세스 풀에서 실행하고 입력 순서대로 결과 반환
+
+    Args:
+        process_group: 모듈 최상위 함수 (첫 번째 인자는 그룹 번호)
+        group_args: 그룹별 인자 튜플 리스트
+        jobs: 워커 프로세스 수
+
+    Yields:
+        GroupOutcome: 입력 순서대로의 그룹 결과
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_run_group_captured, process_group, args) for args in group_args]
+
+        for args, future in zip(group_args, futures):
+            try:
+                result, error, log = future.result()
+            except Exception as e:
+                # 워커 프로세스 자체가 죽은 경우 등
+                result, error, log = None, str(e) or type(e).__name__, ""
+            yield GroupOutcome(args[0], result, error, log)
@@ -2,7 +2,6 @@ import numpy as np
 import os
 from PIL import Image
 from typing import List, Tuple, Optional, Set
-from collections import Counter
 
 
 class IndexedBitmapHandler:
@@ -20,45 +19,24 @@ class IndexedBitmapHandler:
         print(f"    C# 스타일 8bpp 변환: {image.mode} → Format8bppIndexed")
 
         if image.mode in ['RGB', 'RGBA']:
-            # 알파 채널 처리
-            if image.mode == 'RGBA':
-                background = Image.new('RGB', image.size, (0, 0, 0))
-                background.paste(image, mask=image.split()[-1])
-                image = background
-
-            # C# 로직 재현: 픽셀별 정확한 색상 매칭
+            # 알파 채널 처리 + 픽셀마다 0xRRGGBB 색상 키로 변환
             width, height = image.size
-            pixels = list(image.getdata())
-
-            new_palette = []  # 발견된 색상들 (C# newPalette)
-            pixel_indices = []  # 각 픽셀의 인덱스 (C# array)
-
-            # 첫 번째 픽셀로 시작
-            if pixels:
-                first_color = pixels[0]
-                new_palette.append(first_color)
-                pixel_indices.append(0)
-                print(f"      첫 번째 색상: {first_color}")
-
-            # 나머지 픽셀들 처리 (C# 로직과 동일)
-            for i, pixel_color in enumerate(pixels[1:], 1):
-                match_found = False
-
-                # 기존 팔레트에서 정확한 색상 찾기
-                for j, palette_color in enumerate(new_palette):
-                    if pixel_color == palette_color:  # C#: if (Pixel == newPalette[j])
-                        pixel_indices.append(j)
-                        match_found = True
-                        break
+            color_keys = self._color_keys(image)
+            if color_keys.size:
+                print(f"      첫 번째 색상: {self._key_to_rgb(color_keys[0])}")
+
+            # C# 로직 재현: 처음 등장한 순서로 팔레트 인덱스 부여 (정확한 색상 일치)
+            colors, first_positions, inverse = np.unique(color_keys, return_index=True, return_inverse=True)
+            appearance_order = np.argsort(first_positions, kind='stable')
 
-                if not match_found:
-                    # 새로운 색상 발견
-                    if len(new_palette) >= 256:  # C#: if (index >= 256)
-                        print(f"      변환 실패: 256색 초과 ({len(new_palette)}색)")
-                        return None
+            if len(colors) > 256:  # C#: if (index >= 256)
+                print(f"      변환 실패: 256색 초과 (256색)")
+                return None
 
-                    new_palette.append(pixel_color)
-                    pixel_indices.append(len(new_palette) - 1)
+            rank = np.empty(len(colors), dtype=np.int64)
+            rank[appearance_order] = np.arange(len(colors))
+            new_palette = colors[appearance_order]  # 발견된 색상들 (C# newPalette)
+            pixel_indices = rank[inverse]  # 각 픽셀의 인덱스 (C# array)
 
             print(f"      총 {len(new_palette)}색 발견")
 
@@ -66,52 +44,31 @@ class IndexedBitmapHandler:
             if len(new_palette) > 16:
                 print(f"      16색으로 제한 필요: {len(new_palette)}색 → 16색")
 
-                # 사용빈도 기반으로 상위 16색 선택
-                from collections import Counter
-                color_counts = Counter(pixels)
-                most_common_colors = [color for color, count in color_counts.most_common(16)]
-
-                # 색상 매핑 테이블 생성
-                color_mapping = {}
-                for i, color in enumerate(most_common_colors):
-                    color_mapping[color] = i
-
-                # 매핑되지 않은 색상을 가장 가까운 색상으로 매핑
-                for color in new_palette:
-                    if color not in color_mapping:
-                        min_distance = float('inf')
-                        best_match = 0
+                # 사용빈도 기반으로 상위 16색 선택 (Counter.most_common 순서: 빈도 내림차순, 같으면 처음 등장 순)
+                counts = np.bincount(pixel_indices, minlength=len(new_palette))
+                most_common = np.lexsort((np.arange(len(new_palette)), -counts))[:16]
 
-                        for mapped_color in most_common_colors:
-                            distance = sum((a - b) ** 2 for a, b in zip(color, mapped_color))
-                            if distance < min_distance:
-                                min_distance = distance
-                                best_match = color_mapping[mapped_color]
-
-                        color_mapping[color] = best_match
+                # 색상 매핑 테이블 생성 (매핑되지 않은 색상은 가장 가까운 색상으로, 거리가 같으면 빈도 순서상 앞의 색)
+                rgb = np.stack([(new_palette >> 16) & 0xFF, (new_palette >> 8) & 0xFF, new_palette & 0xFF],
+                               axis=1).astype(np.int64)
+                distances = ((rgb[:, None, :] - rgb[most_common][None, :, :]) ** 2).sum(axis=2)
+                color_mapping = np.argmin(distances, axis=1)
+                color_mapping[most_common] = np.arange(len(most_common))
 
                 # 픽셀 인덱스 재매핑
-                pixel_indices = [color_mapping[pixels[i]] for i in range(len(pixels))]
-                new_palette = most_common_colors
+                pixel_indices = color_mapping[pixel_indices]
+                new_palette = new_palette[most_common]
 
             # PIL Image 생성
-            new_image = Image.new('P', (width, height))
-            new_image.putdata(pixel_indices)
-
-            # 팔레트 설정
-            flat_palette = []
-            for color in new_palette:
-                flat_palette.extend(color)
-
-            # 16색 미만이면 검은색으로 채움
-            while len(flat_palette) < 48:  # 16 * 3
-                flat_palette.extend([0, 0, 0])
+            new_image = Image.frombytes('P', (width, height), pixel_indices.astype(np.uint8).tobytes())
 
-            # 256색까지 확장
-            while len(flat_palette) < 768:  # 256 * 3
-                flat_palette.extend([0, 0, 0])
+            # 팔레트 설정 (16색 미만이면 검은색으로 채우고 256색까지 확장)
+            flat_palette = np.zeros(768, dtype=np.uint8)
+            flat_palette[0:len(new_palette) * 3:3] = (new_palette >> 16) & 0xFF
+            flat_palette[1:len(new_palette) * 3:3] = (new_palette >> 8) & 0xFF
+            flat_palette[2:len(new_palette) * 3:3] = new_palette & 0xFF
 
-            new_image.putpalette(flat_palette)
+            new_image.putpalette(flat_palette.tobytes())
             print(f"      C# 스타일 8bpp 변환 완료")
 
             return new_image
@@ -123,6 +80,29 @@ class IndexedBitmapHandler:
 
         return image
 
+    @staticmethod
+    def _color_keys(image: Image.Image) -> np.ndarray:
+        """RGB/RGBA 이미지의 픽셀들을 0xRRGGBB uint32 키 배열로 변환 (행 우선 순서)
+
+        RGBA는 검은 배경에 알파 마스크로 붙여넣은 결과와 같게 합성합니다
+        (PIL paste의 블렌딩과 같은 정수 연산: 색 * 알파 / 255 반올림, 알파 0은 검은색, 255는 원래 색).
+        """
+        pixels = np.asarray(image, dtype=np.uint8)
+        rgb = pixels[..., :3].astype(np.uint32)
+
+        if image.mode == 'RGBA':
+            alpha = pixels[..., 3]
+            if not np.all(alpha == 255):
+                rgb = rgb * alpha[..., None] + 128
+                rgb = ((rgb >> 8) + rgb) >> 8
+
+        return ((rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]).reshape(-1)
+
+    @staticmethod
+    def _key_to_rgb(color_key) -> Tuple[int, int, int]:
+        color_key = int(color_key)
+        return (color_key >> 16) & 0xFF, (color_key >> 8) & 0xFF, color_key & 0xFF
+
     def convert_to_8bpp_indexed(self, image: Image.Image) -> Image.Image:
         """C# Convert 함수 재현: 다양한 포맷을 8bpp 인덱스로 변환"""
 
@@ -146,30 +126,14 @@ class IndexedBitmapHandler:
 
         print(f"    색상 표준화 중...")
 
-        # 원본 색상과 표준화된 색상 비교용
-        changes_made = False
-
-        standardized_palette = []
-        for i in range(0, min(len(palette), 48), 3):  # 16색만 처리
-            original_r, original_g, original_b = palette[i:i + 3]
-
-            # 8의 배수로 조정
-            std_r = original_r - (original_r % 8)
-            std_g = original_g - (original_g % 8)
-            std_b = original_b - (original_b % 8)
-
-            standardized_palette.extend([std_r, std_g, std_b])
+        # 16색만 8의 배수로 조정 (x - x % 8 == x & ~7)
+        original = np.array(palette[:48], dtype=np.uint8)
+        standardized = original & 0xF8
+        changes_made = bool(np.any(standardized != original))
 
-            if (std_r != original_r) or (std_g != original_g) or (std_b != original_b):
-                changes_made = True
-
-        # 16색 미만이면 검은색으로 채움
-        while len(standardized_palette) < 48:
-            standardized_palette.extend([0, 0, 0])
-
-        # 256색 팔레트로 확장
-        while len(standardized_palette) < 768:
-            standardized_palette.extend([0, 0, 0])
+        # 256색 팔레트로 확장 (16색 미만이면 검은색으로 채움)
+        standardized_palette = np.zeros(768, dtype=np.uint8)
+        standardized_palette[:standardized.size] = standardized
 
         if changes_made:
             print(f"      색상이 8의 배수로 조정되었습니다")
@@ -177,7 +141,7 @@ class IndexedBitmapHandler:
             print(f"      모든 색상이 이미 표준화되어 있습니다")
 
         new_image = image.copy()
-        new_image.putpalette(standardized_palette)
+        new_image.putpalette(standardized_palette.tobytes())
         return new_image
 
     def palette_size(self, image: Image.Image) -> int:
@@ -209,65 +173,43 @@ class IndexedBitmapHandler:
             return image
 
         # 사용빈도 순으로 상위 16색 선택
-        pixels = list(image.getdata())
-        color_counts = Counter(pixels)
-
-        # 가장 많이 사용된 16색 선택
-        most_common_colors = [color for color, count in color_counts.most_common(16)]
+        # Counter.most_common과 같은 순서: 빈도 내림차순, 같으면 처음 등장한 순서
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1)
+        counts = np.bincount(pixels, minlength=256)
+        present, first_positions = np.unique(pixels, return_index=True)
+        order = np.lexsort((first_positions, -counts[present]))
+        most_common_colors = present[order[:16]]
 
         print(f"      상위 16색으로 압축합니다")
 
-        # 색상 매핑 테이블 생성
-        color_mapping = {}
-        for i, old_index in enumerate(most_common_colors):
-            color_mapping[old_index] = i
-
-        # 매핑되지 않은 색상은 가장 가까운 색상으로 매핑
-        palette = image.getpalette()
-        for pixel_index in used_indices:
-            if pixel_index not in color_mapping:
-                # 가장 가까운 색상 찾기
-                if pixel_index * 3 + 2 < len(palette):
-                    target_color = palette[pixel_index * 3:pixel_index * 3 + 3]
-
-                    min_distance = float('inf')
-                    best_match = 0
-
-                    for mapped_index in most_common_colors:
-                        if mapped_index * 3 + 2 < len(palette):
-                            mapped_color = palette[mapped_index * 3:mapped_index * 3 + 3]
-                            distance = sum((a - b) ** 2 for a, b in zip(target_color, mapped_color))
-                            if distance < min_distance:
-                                min_distance = distance
-                                best_match = color_mapping[mapped_index]
-
-                    color_mapping[pixel_index] = best_match
-                else:
-                    color_mapping[pixel_index] = 0
-
-        # 픽셀 데이터 재매핑
-        new_pixels = [color_mapping.get(pixel, 0) for pixel in pixels]
-
-        # 새로운 팔레트 생성
-        new_palette = []
-        for i in range(16):
-            if i < len(most_common_colors):
-                old_index = most_common_colors[i]
-                if old_index * 3 + 2 < len(palette):
-                    new_palette.extend(palette[old_index * 3:old_index * 3 + 3])
-                else:
-                    new_palette.extend([0, 0, 0])
-            else:
-                new_palette.extend([0, 0, 0])
-
-        # 256색까지 확장
-        while len(new_palette) < 768:
-            new_palette.extend([0, 0, 0])
-
-        # 새 이미지 생성
-        new_image = Image.new('P', image.size)
-        new_image.putdata(new_pixels)
-        new_image.putpalette(new_palette)
+        # 팔레트 (범위를 벗어난 인덱스는 유효하지 않음으로 표시)
+        palette = image.getpalette() or []
+        palette_count = len(palette) // 3
+        palette_colors = np.zeros((256, 3), dtype=np.int64)
+        palette_colors[:palette_count] = np.array(palette[:palette_count * 3], dtype=np.int64).reshape(-1, 3)
+        has_color = np.arange(256) < palette_count
+
+        # 색상 매핑 테이블 (256칸 LUT, 사용되지 않은 인덱스는 0)
+        color_mapping = np.zeros(256, dtype=np.uint8)
+        color_mapping[most_common_colors] = np.arange(len(most_common_colors), dtype=np.uint8)
+
+        # 매핑되지 않은 색상은 가장 가까운 색상으로 매핑 (거리가 같으면 빈도 순서상 앞의 색)
+        unmapped = np.array(sorted(index for index in set(used_indices) - set(most_common_colors.tolist())
+                                   if 0 <= index < 256), dtype=np.int64)
+        if unmapped.size:
+            distances = ((palette_colors[unmapped][:, None, :] - palette_colors[most_common_colors][None, :, :]) ** 2).sum(axis=2)
+            distances = np.where(has_color[most_common_colors][None, :], distances, np.iinfo(np.int64).max)
+            best_match = np.argmin(distances, axis=1).astype(np.uint8)
+            color_mapping[unmapped] = np.where(has_color[unmapped], best_match, 0)
+
+        # 새로운 팔레트 생성 (256색까지 확장)
+        new_palette = np.zeros((256, 3), dtype=np.uint8)
+        new_palette[:len(most_common_colors)] = np.where(
+            has_color[most_common_colors][:, None], palette_colors[most_common_colors], 0)
+
+        # 픽셀 데이터 재매핑 후 새 이미지 생성
+        new_image = Image.frombytes('P', image.size, color_mapping[pixels].tobytes())
+        new_image.putpalette(new_palette.tobytes())
 
         print(f"      팔레트 압축 완료: 16색")
 
@@ -279,8 +221,7 @@ class IndexedBitmapHandler:
         if image.mode != 'P':
             return set()
 
-        pixels = list(image.getdata())
-        return set(pixels)
+        return set(np.unique(np.asarray(image, dtype=np.uint8)).tolist())
 
     def resize_with_padding(self, image: Image.Image, top: int, bottom: int, left: int, right: int) -> Image.Image:
         """C# Resize 함수 재현: 패딩 추가"""
@@ -452,6 +393,15 @@ class IndexedBitmapHandler:
 
         # 1. 이미지 로드
         image = Image.open(image_path)
+
+        return self.preprocess_image_for_pokemon_format(image, image_path, auto_color, auto_convert,
+                                                        allow_shrinking, sprite_number, is_diamond_pearl)
+
+    def preprocess_image_for_pokemon_format(self, image: Image.Image, name: str = "", auto_color: bool = True,
+                                            auto_convert: bool = True, allow_shrinking: bool = True,
+                                            sprite_number: int = 2, is_diamond_pearl: bool = False) -> Image.Image:
+        """메모리의 이미지를 포켓몬 포맷에 맞게 전처리 (파일을 읽지 않는 버전)"""
+
         print(f"    원본: {image.size}, {image.mode}")
 
         # 2. 8bpp 인덱스로 변환
@@ -476,18 +426,14 @@ class IndexedBitmapHandler:
                 print(f"      경고: 16색을 초과합니다 ({palette_size}색)")
 
         # 5. 크기 조정
-        image = self.check_size_pokemon_format(image, image_path, sprite_number, is_diamond_pearl)
+        image = self.check_size_pokemon_format(image, name, sprite_number, is_diamond_pearl)
 
         print(f"    전처리 완료: {image.size}")
         return image
 
 
-def preprocess_reference_image_for_pokemon(image_path: str, is_diamond_pearl: bool = False) -> Image.Image:
-    """기준 이미지를 포켓몬 포맷에 맞게 전처리하는 헬퍼 함수"""
-
-    handler = IndexedBitmapHandler()
-
-    # 파일명에서 스프라이트 정보 추출
+def sprite_number_from_filename(image_path: str) -> int:
+    """파일명에서 스프라이트 번호(C# CheckSize의 sprite_number) 추출"""
     filename = os.path.basename(image_path).lower()
     sprite_number = 2  # 기본값
 
@@ -502,12 +448,20 @@ def preprocess_reference_image_for_pokemon(image_path: str, is_diamond_pearl: bo
         else:
             sprite_number = 3
 
+    return sprite_number
+
+
+def preprocess_reference_image_for_pokemon(image_path: str, is_diamond_pearl: bool = False) -> Image.Image:
+    """기준 이미지를 포켓몬 포맷에 맞게 전처리하는 헬퍼 함수"""
+
+    handler = IndexedBitmapHandler()
+
     return handler.preprocess_for_pokemon_format(
         image_path=image_path,
         auto_color=True,
         auto_convert=True,
         allow_shrinking=True,
-        sprite_number=sprite_number,
+        sprite_number=sprite_number_from_filename(image_path),
         is_diamond_pearl=is_diamond_pearl
     )
 
@@ -0,0 +1,193 @@
+"""
+input_scanner.py - input/<M|F>/<도감번호>/ 입력 트리 스캐너
+
+os.scandir로 input/M, input/F를 한 번만 순회하며 파일을 분류하고
+종(도감번호)별 작업 계획을 만듭니다.
+
+- 분류: 앞/뒷모습, 일반/색다른, 256x64 시트 / 160x80 추출본 / 기타 크기
+- 이미지 크기는 PNG IHDR만 읽어 확인합니다 (다른 포맷은 PIL 헤더 읽기).
+- DirEntry의 stat 결과(크기, mtime)를 계획에 보관하므로, 이전 계획을 넘기면
+  바뀌지 않은 파일은 다시 열지 않고, 바뀐 종만 골라낼 수 있습니다.
+  계획은 JSON으로 저장해 다음 실행에서 다시 쓸 수 있습니다.
+"""
+
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+GENDER_FOLDERS = {'M': 'male', 'F': 'female'}
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+SHEET_SIZE = (256, 64)
+SPRITE_SIZE = (160, 80)
+SCAN_CACHE_VERSION = 1
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class ScannedFile(NamedTuple):
+    """스캔된 입력 파일 하나"""
+    path: str
+    gender: str         # 'M' 또는 'F'
+    slot: str           # 'male_front' 등 NARC 슬롯 이름 (시트는 앞모습 슬롯)
+    is_shiny: bool
+    kind: str           # 'sheet' (256x64), 'sprite' (160x80), 'image' (기타 크기, 전처리에서 조정)
+    size: int           # 파일 크기 (bytes)
+    mtime_ns: int
+
+
+class DexWorkPlan(NamedTuple):
+    """도감번호 하나의 작업 계획"""
+    dex_number: int
+    files: Tuple[ScannedFile, ...]
+
+    def gender_files(self, kinds: Iterable[str] = ('sprite', 'image')) -> Dict[str, List[str]]:
+        """{'M': [파일들], 'F': [파일들]} 형태 (지정한 종류만)
+
+        기본값은 개별 스프라이트이며, kinds=('sheet',)로 256x64 시트만 얻습니다.
+        """
+        kinds = set(kinds)
+        result: Dict[str, List[str]] = {}
+        for scanned in self.files:
+            if scanned.kind in kinds:
+                result.setdefault(scanned.gender, []).append(scanned.path)
+        return result
+
+
+def classify_sprite_name(file_name: str, gender: str) -> Tuple[str, bool]:
+    """파일명을 (NARC 슬롯 이름, 색다른 여부)로 분류
+
+    파일명에 'back'이 있으면 뒷모습, 없으면 앞모습이며 'shiny'가 있으면 색다른 버전입니다.
+
+    Args:
+        file_name: 파일명 (front.png, back_shiny.png, 001MFront.png 등)
+        gender: 'M' 또는 'F' (폴더 이름)
+
+    Returns:
+        Tuple[str, bool]: ('male_front', False) 형태
+    """
+    name = os.path.splitext(file_name)[0].lower()
+    direction = 'back' if 'back' in name else 'front'
+    return f"{GENDER_FOLDERS[gender]}_{direction}", 'shiny' in name
+
+
+def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """이미지 크기 (PNG는 IHDR 24바이트만 읽음), 읽을 수 없으면 None"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+        if header[:8] == _PNG_SIGNATURE and header[12:16] == b'IHDR':
+            return struct.unpack('>II', header[16:24])
+
+        from PIL import Image
+        with Image.open(path) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def _image_kind(image_size: Optional[Tuple[int, int]]) -> str:
+    if image_size == SHEET_SIZE:
+        return 'sheet'
+    if image_size == SPRITE_SIZE:
+        return 'sprite'
+    return 'image'
+
+
+def scan_input_tree(input_dir: str, previous: Optional[Dict[int, DexWorkPlan]] = None) -> Dict[int, DexWorkPlan]:
+    """input/M, input/F를 한 번 순회하여 도감번호별 작업 계획 생성
+
+    Args:
+        input_dir: M/, F/ 폴더가 있는 입력 디렉토리
+        previous: 이전 스캔 결과 (크기/mtime이 같은 파일은 분류를 재사용)
+
+    Returns:
+        Dict[int, DexWorkPlan]: 도감번호 순서의 작업 계획
+    """
+    known = {}
+    if previous:
+        known = {scanned.path: scanned for plan in previous.values() for scanned in plan.files}
+
+    dex_files: Dict[int, List[ScannedFile]] = {}
+
+    for gender in GENDER_FOLDERS:
+        gender_dir = os.path.join(input_dir, gender)
+        try:
+            dex_entries = sorted((entry for entry in os.scandir(gender_dir) if entry.is_dir()),
+                                 key=lambda entry: entry.name)
+        except FileNotFoundError:
+            continue
+
+        for dex_entry in dex_entries:
+            if not dex_entry.name.isdigit():
+                print(f"경고: 도감번호 폴더가 아닙니다: {dex_entry.path}")
+                continue
+
+            files = dex_files.setdefault(int(dex_entry.name), [])
+            for entry in sorted(os.scandir(dex_entry.path), key=lambda entry: entry.name):
+                if not entry.name.lower().endswith(IMAGE_EXTENSIONS) or not entry.is_file():
+                    continue
+
+                stat = entry.stat()
+                cached = known.get(entry.path)
+                if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                    files.append(cached)
+                    continue
+
+                slot_name, is_shiny = classify_sprite_name(entry.name, gender)
+                files.append(ScannedFile(entry.path, gender, slot_name, is_shiny,
+                                         _image_kind(read_image_size(entry.path)),
+                                         stat.st_size, stat.st_mtime_ns))
+
+    return {dex_number: DexWorkPlan(dex_number, tuple(files))
+            for dex_number, files in sorted(dex_files.items()) if files}
+
+
+def changed_dex_numbers(previous: Dict[int, DexWorkPlan], current: Dict[int, DexWorkPlan]) -> Set[int]:
+    """이전 스캔 대비 파일이 추가/삭제/변경된 도감번호"""
+    def fingerprint(plan):
+        return {(scanned.path, scanned.size, scanned.mtime_ns) for scanned in plan.files}
+
+    changed = set(previous) ^ set(current)
+    for dex_number in set(previous) & set(current):
+        if fingerprint(previous[dex_number]) != fingerprint(current[dex_number]):
+            changed.add(dex_number)
+    return changed
+
+
+def save_scan_cache(plans: Dict[int, DexWorkPlan], cache_path: str) -> None:
+    """작업 계획을 JSON으로 저장"""
+    data = {
+        'version': SCAN_CACHE_VERSION,
+        'files': [list(scanned) for plan in plans.values() for scanned in plan.files],
+    }
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load_scan_cache(cache_path: str) -> Dict[int, DexWorkPlan]:
+    """저장된 작업 계획 읽기 (없거나 버전이 다르면 빈 계획)
+
+    도감번호는 경로의 폴더 이름에서 다시 얻습니다.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get('version') != SCAN_CACHE_VERSION:
+        return {}
+
+    dex_files: Dict[int, List[ScannedFile]] = {}
+    for values in data['files']:
+        scanned = ScannedFile(*values)
+        dex_number = int(os.path.basename(os.path.dirname(scanned.path)))
+        dex_files.setdefault(dex_number, []).append(scanned)
+    return {dex_number: DexWorkPlan(dex_number, tuple(files)) for dex_number, files in sorted(dex_files.items())}
+
+
+def list_image_files(folder: str) -> List[str]:
+    """폴더 바로 아래의 이미지 파일 경로들 (이름 순)"""
+    return sorted(entry.path for entry in os.scandir(folder)
+                  if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file())
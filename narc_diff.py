@@ -0,0 +1,223 @@
+"""
+narc_diff.py - 두 NARC 아카이브를 엔트리 단위로 비교하는 도구
+
+원본 pl_pokegra.narc와 수정된 빌드 사이에서 무엇이 바뀌었는지 빠르게 확인합니다.
+1. 엔트리 크기 비교 → 2. mmap 슬라이스 위의 blake2b 해시 비교
+3. 변경된 스프라이트/팔레트 엔트리만 디코딩하여 종/슬롯/픽셀 수 보고
+디스크에 아무것도 추출하지 않습니다.
+"""
+
+import mmap
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from narc_reader import NarcReader, hash_entry
+from pokemon_sprite_converter import PokemonSpriteConverter
+
+# pl_pokegra.narc의 종당 6개 엔트리 배치
+POKEGRA_SLOT_NAMES = ["female_back", "male_back", "female_front", "male_front",
+                      "normal_palette", "shiny_palette"]
+
+SPRITE_SIZE = 6448
+PALETTE_SIZE = 72
+
+
+class EntryChange(NamedTuple):
+    """엔트리 단위 변경 정보"""
+    file_id: int
+    kind: str  # 'changed', 'added', 'removed'
+    old_size: int
+    new_size: int
+
+
+class SpriteChange(NamedTuple):
+    """디코딩된 스프라이트/팔레트 변경 정보"""
+    species: int
+    slot: str
+    changed_pixels: Optional[int]  # 팔레트는 변경된 색상 수, 구조 변경은 None
+
+
+@contextmanager
+def _mapped(filename: str):
+    """NARC 파일을 읽기 전용 mmap으로 연다 (빈 파일은 b'')"""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def diff_entries(old_reader: NarcReader, new_reader: NarcReader) -> List[EntryChange]:
+    """두 NARC의 엔트리를 크기 → 해시 순으로 비교
+
+    Args:
+        old_reader: 원본 NARC 리더
+        new_reader: 비교할 NARC 리더
+
+    Returns:
+        list: 변경된 엔트리 목록 (file_id 순)
+    """
+    changes = []
+
+    with _mapped(old_reader.filename) as old_map, _mapped(new_reader.filename) as new_map:
+        old_view = memoryview(old_map)
+        new_view = memoryview(new_map)
+        try:
+            common = min(old_reader.entries_count, new_reader.entries_count)
+
+            for file_id in range(common):
+                old_entry = old_reader.file_entries[file_id]
+                new_entry = new_reader.file_entries[file_id]
+
+                # 1단계: 크기가 다르면 해시 없이 바로 변경으로 판정
+                if old_entry.size != new_entry.size:
+                    changes.append(EntryChange(file_id, 'changed', old_entry.size, new_entry.size))
+                    continue
+
+                # 2단계: 같은 크기면 해시 비교 (사이드카 인덱스가 있으면 저장된 해시 사용)
+                if old_reader.entry_hashes is not None:
+                    old_hash = old_reader.entry_hashes[file_id]
+                else:
+                    old_hash = hash_entry(old_view[old_entry.offset:old_entry.offset + old_entry.size])
+                if new_reader.entry_hashes is not None:
+                    new_hash = new_reader.entry_hashes[file_id]
+                else:
+                    new_hash = hash_entry(new_view[new_entry.offset:new_entry.offset + new_entry.size])
+                if old_hash != new_hash:
+                    changes.append(EntryChange(file_id, 'changed', old_entry.size, new_entry.size))
+
+            for file_id in range(common, old_reader.entries_count):
+                changes.append(EntryChange(file_id, 'removed', old_reader.file_entries[file_id].size, 0))
+
+            for file_id in range(common, new_reader.entries_count):
+                changes.append(EntryChange(file_id, 'added', 0, new_reader.file_entries[file_id].size))
+        finally:
+            old_view.release()
+            new_view.release()
+
+    return changes
+
+
+def describe_sprite_changes(old_reader: NarcReader, new_reader: NarcReader, changes: List[EntryChange],
+                            is_diamond_pearl: bool = False) -> List[SpriteChange]:
+    """변경된 엔트리 중 스프라이트/팔레트만 디코딩하여 변경 내용 분석
+
+    Args:
+        old_reader: 원본 NARC 리더
+        new_reader: 비교할 NARC 리더
+        changes: diff_entries() 결과
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        list: 종/슬롯별 변경 정보
+    """
+    converter = PokemonSpriteConverter(is_diamond_pearl)
+    sprite_changes = []
+
+    for change in changes:
+        species, slot_index = divmod(change.file_id, 6)
+        slot = POKEGRA_SLOT_NAMES[slot_index]
+
+        if change.kind != 'changed':
+            sprite_changes.append(SpriteChange(species, slot, None))
+            continue
+
+        if slot_index < 4 and change.old_size == change.new_size == SPRITE_SIZE:
+            old_image = converter._parse_sprite(old_reader.extract_file(change.file_id))
+            new_image = converter._parse_sprite(new_reader.extract_file(change.file_id))
+            old_pixels = np.frombuffer(old_image.tobytes(), dtype=np.uint8)
+            new_pixels = np.frombuffer(new_image.tobytes(), dtype=np.uint8)
+            sprite_changes.append(SpriteChange(species, slot, int(np.count_nonzero(old_pixels != new_pixels))))
+
+        elif slot_index >= 4 and change.old_size == change.new_size == PALETTE_SIZE:
+            old_palette = converter._parse_palette(old_reader.extract_file(change.file_id))[:48]
+            new_palette = converter._parse_palette(new_reader.extract_file(change.file_id))[:48]
+            changed_colors = sum(1 for i in range(0, 48, 3) if old_palette[i:i + 3] != new_palette[i:i + 3])
+            sprite_changes.append(SpriteChange(species, slot, changed_colors))
+
+        else:
+            # 크기 자체가 바뀐 경우 (빈 슬롯 ↔ 스프라이트 등)
+            sprite_changes.append(SpriteChange(species, slot, None))
+
+    return sprite_changes
+
+
+def narc_diff(old_narc: str, new_narc: str, is_diamond_pearl: bool = False, decode: bool = True,
+              use_index: bool = False) -> dict:
+    """두 NARC 파일을 비교하고 결과를 출력
+
+    Args:
+        old_narc: 원본 NARC 파일 경로
+        new_narc: 비교할 NARC 파일 경로
+        is_diamond_pearl: DP 포맷 여부
+        decode: True면 변경된 스프라이트/팔레트를 디코딩하여 상세 비교
+        use_index: True면 사이드카 인덱스(.idx)의 엔트리 테이블과 해시를 재사용
+
+    Returns:
+        dict: {'entries': [EntryChange], 'sprites': [SpriteChange]}
+    """
+    for path in (old_narc, new_narc):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"NARC file not found: {path}")
+
+    start = time.perf_counter()
+
+    old_reader = NarcReader(old_narc, use_index=use_index)
+    new_reader = NarcReader(new_narc, use_index=use_index)
+
+    changes = diff_entries(old_reader, new_reader)
+    sprite_changes = describe_sprite_changes(old_reader, new_reader, changes, is_diamond_pearl) if decode else []
+
+    elapsed = time.perf_counter() - start
+
+    print(f"NARC 비교: {old_narc} ({len(old_reader)}개) ↔ {new_narc} ({len(new_reader)}개)")
+
+    if not changes:
+        print("  변경된 엔트리 없음")
+
+    if decode:
+        for change, sprite_change in zip(changes, sprite_changes):
+            if sprite_change.changed_pixels is None:
+                detail = f"{change.kind} ({change.old_size} → {change.new_size} bytes)"
+            elif sprite_change.slot.endswith('_palette'):
+                detail = f"색상 {sprite_change.changed_pixels}개 변경"
+            else:
+                detail = f"픽셀 {sprite_change.changed_pixels}개 변경"
+            print(f"  포켓몬 #{sprite_change.species:03d} {sprite_change.slot} (#{change.file_id}): {detail}")
+    else:
+        for change in changes:
+            print(f"  #{change.file_id}: {change.kind} ({change.old_size} → {change.new_size} bytes)")
+
+    print(f"총 {len(changes)}개 엔트리 변경 ({elapsed * 1000:.1f} ms)")
+
+    return {'entries': changes, 'sprites': sprite_changes}
+
+
+def main(argv=None):
+    """명령줄 실행: python narc_diff.py <원본.narc> <수정본.narc> [--dp] [--no-decode] [--use-index]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="두 NARC 파일을 엔트리 단위로 비교")
+    parser.add_argument("old_narc", help="원본 NARC 파일")
+    parser.add_argument("new_narc", help="비교할 NARC 파일")
+    parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    parser.add_argument("--no-decode", action="store_true", help="스프라이트 디코딩 없이 엔트리만 비교")
+    parser.add_argument("--use-index", action="store_true", help="사이드카 인덱스(.idx) 사용")
+    args = parser.parse_args(argv)
+
+    result = narc_diff(args.old_narc, args.new_narc, args.dp, decode=not args.no_decode,
+                       use_index=args.use_index)
+    return 1 if result['entries'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
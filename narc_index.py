@@ -0,0 +1,168 @@
+"""
+narc_index.py - 대용량 NARC용 사이드카 인덱스 (<파일명>.idx)
+
+매 실행마다 NARC 헤더/BTAF를 다시 파싱하고 원본 구조(original_structure)를
+새로 만드는 대신, 파싱 결과를 JSON 사이드카 파일에 저장해 두고 재사용합니다.
+
+저장 내용:
+- 엔트리 테이블 (실제 파일 위치 기준 offset, size)
+- 엔트리별 내용 해시 (blake2b)
+- pl_pokegra 구조 메타데이터 (종별 유효 스프라이트 슬롯, 팔레트 유무)
+
+인덱스는 파일 크기, mtime, 헤더+BTAF 해시로 키가 매겨지며,
+아카이브가 바뀌면 자동으로 무효화되어 다시 생성됩니다.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Optional
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+
+def index_path_for(narc_file: str) -> str:
+    """NARC 파일에 대응하는 사이드카 인덱스 경로"""
+    return narc_file + INDEX_SUFFIX
+
+
+def _read_table_hash(narc_file: str) -> str:
+    """엔트리 단위 파싱 없이 NARC 헤더 + BTAF 섹션을 통째로 읽어 해시"""
+    from narc_reader import hash_entry
+
+    with open(narc_file, 'rb') as f:
+        header = f.read(16)
+        if len(header) != 16 or header[:4] != b'NARC':
+            raise ValueError("Invalid NARC file: wrong magic signature")
+
+        first_section_offset = struct.unpack('<H', header[12:14])[0]
+        f.seek(first_section_offset)
+        btaf_header = f.read(12)
+        if len(btaf_header) != 12 or btaf_header[:4] != b'BTAF':
+            raise ValueError("Invalid NARC file: BTAF section not found")
+
+        btaf_size = struct.unpack('<I', btaf_header[4:8])[0]
+        f.seek(0)
+        return hash_entry(f.read(first_section_offset + btaf_size)).hex()
+
+
+def _archive_key(narc_file: str) -> dict:
+    """인덱스 유효성 검사용 키 (파일 크기, mtime, 헤더 해시)"""
+    stat = os.stat(narc_file)
+    return {
+        'file_size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'table_hash': _read_table_hash(narc_file),
+    }
+
+
+def build_narc_index(narc_file: str) -> dict:
+    """NARC 파일을 파싱하여 인덱스 생성
+
+    Args:
+        narc_file: NARC 파일 경로
+
+    Returns:
+        dict: 인덱스 데이터
+    """
+    from narc_reader import NarcReader, hash_entry
+    from pokemon_sprite_converter import analyze_pokegra_structure
+
+    reader = NarcReader(narc_file)
+
+    # 엔트리별 내용 해시 (mmap 슬라이스 위에서 계산)
+    entry_hashes = []
+    with open(narc_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > 0 and reader.entries_count:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for entry in reader.file_entries:
+                        entry_hashes.append(hash_entry(view[entry.offset:entry.offset + entry.size]).hex())
+                finally:
+                    view.release()
+
+    structure = analyze_pokegra_structure(reader)
+
+    return {
+        'version': INDEX_VERSION,
+        'key': _archive_key(narc_file),
+        'total_size': reader.total_size,
+        'table_size': reader.table_size,
+        'entries': [[entry.offset, entry.size] for entry in reader.file_entries],
+        'entry_hashes': entry_hashes,
+        'structure': structure,
+    }
+
+
+def _decode_index(index: dict) -> dict:
+    """JSON으로 읽은 인덱스의 구조 정보 키를 정수로 복원"""
+    index['structure'] = {int(pokemon_id): info for pokemon_id, info in index['structure'].items()}
+    return index
+
+
+def load_narc_index(narc_file: str) -> Optional[dict]:
+    """유효한 사이드카 인덱스를 읽기 (없거나 오래되었으면 None)
+
+    Args:
+        narc_file: NARC 파일 경로
+
+    Returns:
+        dict: 인덱스 데이터 또는 None
+    """
+    index_path = index_path_for(narc_file)
+    if not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if index.get('version') != INDEX_VERSION:
+        return None
+
+    # 크기/mtime은 stat만으로 먼저 비교하고, 일치할 때만 헤더 해시 확인
+    stat = os.stat(narc_file)
+    key = index.get('key', {})
+    if key.get('file_size') != stat.st_size or key.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    if key.get('table_hash') != _read_table_hash(narc_file):
+        return None
+
+    return _decode_index(index)
+
+
+def save_narc_index(narc_file: str, index: dict) -> None:
+    """사이드카 인덱스를 원자적으로 저장 (저장 실패는 경고만 출력)"""
+    index_path = index_path_for(narc_file)
+    temp_path = index_path + '.tmp'
+
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(temp_path, index_path)
+    except OSError as e:
+        print(f"경고: NARC 인덱스 저장 실패 ({index_path}): {e}")
+
+
+def load_or_build_narc_index(narc_file: str) -> dict:
+    """사이드카 인덱스를 읽고, 없거나 오래되었으면 새로 생성하여 저장
+
+    Args:
+        narc_file: NARC 파일 경로
+
+    Returns:
+        dict: 인덱스 데이터
+    """
+    index = load_narc_index(narc_file)
+    if index is not None:
+        return index
+
+    print(f"NARC 인덱스 생성 중: {index_path_for(narc_file)}")
+    index = build_narc_index(narc_file)
+    save_narc_index(narc_file, index)
+    return index
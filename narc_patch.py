@@ -0,0 +1,246 @@
+"""
+narc_patch.py - NARC 바이너리 패치(델타) 생성 및 적용
+
+스프라이트 하나를 고칠 때마다 전체 pl_pokegra.narc를 배포하지 않도록,
+변경된 엔트리만 (file_id, new_bytes) 레코드로 담은 패치 파일을 만듭니다.
+
+패치 포맷 (리틀 엔디언):
+    헤더: magic 'NPCH'(4) + version(2) + reserved(2)
+          + 원본 테이블 해시(16) + 결과 엔트리 수(4) + 레코드 수(4)
+    레코드: file_id(4) + 원본 크기(4) + 원본 엔트리 해시(16) + 새 크기(4) + 데이터(4바이트 정렬)
+
+원본 테이블 해시는 NARC 헤더 + BTAF 섹션의 blake2b 해시이며, 각 레코드는
+교체할 원본 엔트리의 해시를 함께 저장합니다. 따라서 패치 크기와 적용 시간은
+아카이브 전체가 아니라 변경된 엔트리 수에만 비례합니다.
+"""
+
+import os
+import shutil
+import struct
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+from narc_reader import NarcReader, hash_entry, write_narc
+
+PATCH_MAGIC = b'NPCH'
+PATCH_VERSION = 1
+NEW_ENTRY_SIZE = 0xFFFFFFFF  # 원본에 없던 엔트리 표시
+
+
+class PatchRecord(NamedTuple):
+    """패치 레코드 하나"""
+    file_id: int
+    base_size: int
+    base_hash: bytes
+    data: bytes
+
+
+def _read_entry_or_none(reader: NarcReader, file_id: int) -> Optional[bytes]:
+    """원본에 있는 엔트리면 데이터, 없으면 None"""
+    if file_id < reader.entries_count:
+        return reader.extract_file(file_id)
+    return None
+
+
+def create_narc_patch(original_narc: str, file_data_list: List[bytes], patch_path: str) -> int:
+    """원본 NARC와 새 파일 데이터 리스트를 비교하여 패치 파일 생성
+
+    Args:
+        original_narc: 원본 NARC 파일 경로
+        file_data_list: 새 NARC의 파일 번호 순서 데이터 리스트
+        patch_path: 생성할 패치 파일 경로
+
+    Returns:
+        int: 패치에 담긴 레코드 수
+    """
+    if not os.path.exists(original_narc):
+        raise FileNotFoundError(f"NARC file not found: {original_narc}")
+
+    reader = NarcReader(original_narc)
+    records = []
+
+    for file_id, data in enumerate(file_data_list):
+        # 크기가 다르면 원본을 읽지 않고 바로 레코드 생성
+        if file_id < reader.entries_count and reader.file_entries[file_id].size == len(data):
+            original_data = reader.extract_file(file_id)
+            if original_data == data:
+                continue
+        else:
+            original_data = _read_entry_or_none(reader, file_id)
+
+        if original_data is None:
+            records.append(PatchRecord(file_id, NEW_ENTRY_SIZE, b'\x00' * 16, data))
+        else:
+            records.append(PatchRecord(file_id, len(original_data), hash_entry(original_data), data))
+
+    _write_patch(patch_path, hash_entry(reader.read_table()), len(file_data_list), records)
+
+    print(f"패치 생성 완료: {patch_path} ({len(records)}개 엔트리 변경)")
+    return len(records)
+
+
+def create_narc_patch_from_narc(original_narc: str, modified_narc: str, patch_path: str) -> int:
+    """두 NARC 파일로부터 패치 생성
+
+    Args:
+        original_narc: 원본 NARC 파일 경로
+        modified_narc: 수정된 NARC 파일 경로
+        patch_path: 생성할 패치 파일 경로
+
+    Returns:
+        int: 패치에 담긴 레코드 수
+    """
+    modified_reader = NarcReader(modified_narc)
+    file_data_list = [modified_reader.extract_file(i) for i in range(len(modified_reader))]
+    return create_narc_patch(original_narc, file_data_list, patch_path)
+
+
+def _write_patch(patch_path: str, table_hash: bytes, entries_count: int, records: List[PatchRecord]) -> None:
+    """패치 파일 기록"""
+    with open(patch_path, 'wb') as f:
+        f.write(PATCH_MAGIC)
+        f.write(struct.pack('<HH', PATCH_VERSION, 0))
+        f.write(table_hash)
+        f.write(struct.pack('<II', entries_count, len(records)))
+
+        for record in records:
+            f.write(struct.pack('<II', record.file_id, record.base_size))
+            f.write(record.base_hash)
+            f.write(struct.pack('<I', len(record.data)))
+            f.write(record.data)
+            f.write(b'\x00' * (-len(record.data) % 4))
+
+
+def read_narc_patch(patch_path: str) -> dict:
+    """패치 파일 파싱
+
+    Returns:
+        dict: {'table_hash': bytes, 'entries_count': int, 'records': [PatchRecord]}
+    """
+    with open(patch_path, 'rb') as f:
+        header = f.read(32)
+        if len(header) != 32 or header[:4] != PATCH_MAGIC:
+            raise ValueError("Invalid NARC patch: wrong magic signature")
+
+        version = struct.unpack('<H', header[4:6])[0]
+        if version != PATCH_VERSION:
+            raise ValueError(f"Unsupported NARC patch version: {version}")
+
+        table_hash = header[8:24]
+        entries_count, record_count = struct.unpack('<II', header[24:32])
+
+        records = []
+        for i in range(record_count):
+            record_header = f.read(28)
+            if len(record_header) != 28:
+                raise ValueError(f"Invalid NARC patch: record {i} header too short")
+
+            file_id, base_size = struct.unpack('<II', record_header[:8])
+            base_hash = record_header[8:24]
+            size = struct.unpack('<I', record_header[24:28])[0]
+
+            data = f.read(size)
+            if len(data) != size:
+                raise ValueError(f"Invalid NARC patch: record {i} data too short")
+            f.read(-size % 4)
+
+            records.append(PatchRecord(file_id, base_size, base_hash, data))
+
+    return {'table_hash': table_hash, 'entries_count': entries_count, 'records': records}
+
+
+def _verify_base(reader: NarcReader, patch: dict) -> None:
+    """패치가 주어진 원본 NARC에 대한 것인지 검증"""
+    if hash_entry(reader.read_table()) != patch['table_hash']:
+        raise ValueError("Patch does not match original NARC: table hash mismatch")
+
+    for record in patch['records']:
+        if record.base_size == NEW_ENTRY_SIZE:
+            continue
+        if record.file_id >= reader.entries_count or \
+                reader.file_entries[record.file_id].size != record.base_size or \
+                hash_entry(reader.extract_file(record.file_id)) != record.base_hash:
+            raise ValueError(f"Patch does not match original NARC: entry {record.file_id} differs")
+
+
+def apply_narc_patch(original_narc: str, patch_path: str, output_narc: str = None) -> None:
+    """원본 NARC에 패치 적용
+
+    모든 변경 엔트리의 크기가 원본과 같으면 엔트리 위치에 직접 덮어쓰고,
+    크기가 달라지면 NARC를 새로 기록합니다.
+
+    Args:
+        original_narc: 원본 NARC 파일 경로
+        patch_path: 패치 파일 경로
+        output_narc: 결과 NARC 경로 (None이면 원본을 제자리에서 수정)
+    """
+    if not os.path.exists(original_narc):
+        raise FileNotFoundError(f"NARC file not found: {original_narc}")
+
+    reader = NarcReader(original_narc)
+    patch = read_narc_patch(patch_path)
+    _verify_base(reader, patch)
+
+    records = patch['records']
+    in_place = patch['entries_count'] == reader.entries_count and all(
+        record.base_size == len(record.data) for record in records
+    )
+    target = output_narc or original_narc
+
+    if in_place:
+        if os.path.abspath(target) != os.path.abspath(original_narc):
+            shutil.copyfile(original_narc, target)
+
+        with open(target, 'r+b') as f:
+            for record in records:
+                f.seek(reader.file_entries[record.file_id].offset)
+                f.write(record.data)
+
+        print(f"패치 적용 완료 (제자리 쓰기): {target} ({len(records)}개 엔트리)")
+        return
+
+    # 크기가 바뀐 엔트리가 있으면 전체 재기록
+    replacements: Dict[int, bytes] = {record.file_id: record.data for record in records}
+    file_data_list = []
+    for file_id in range(patch['entries_count']):
+        if file_id in replacements:
+            file_data_list.append(replacements[file_id])
+        else:
+            file_data_list.append(reader.extract_file(file_id))
+
+    write_narc(file_data_list, target)
+    print(f"패치 적용 완료 (재기록): {target} ({len(records)}개 엔트리)")
+
+
+def main(argv=None):
+    """명령줄 실행
+
+    python narc_patch.py create <원본.narc> <수정본.narc> <패치>
+    python narc_patch.py apply <원본.narc> <패치> [결과.narc]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NARC 바이너리 패치 생성/적용")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="두 NARC로부터 패치 생성")
+    create_parser.add_argument("original_narc")
+    create_parser.add_argument("modified_narc")
+    create_parser.add_argument("patch")
+
+    apply_parser = subparsers.add_parser("apply", help="원본 NARC에 패치 적용")
+    apply_parser.add_argument("original_narc")
+    apply_parser.add_argument("patch")
+    apply_parser.add_argument("output_narc", nargs="?", default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "create":
+        create_narc_patch_from_narc(args.original_narc, args.modified_narc, args.patch)
+    else:
+        apply_narc_patch(args.original_narc, args.patch, args.output_narc)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
+import hashlib
 import struct
 import os
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional
 from pathlib import Path
 
 
@@ -10,17 +11,43 @@ class FileEntry(NamedTuple):
     size: int
 
 
+def hash_entry(data) -> bytes:
+    """엔트리 데이터의 빠른 해시 (blake2b, 16바이트)"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
 class NarcReader:
     """NARC 파일 읽기/쓰기를 위한 클래스"""
 
-    def __init__(self, filename: str = None):
+    def __init__(self, filename: str = None, use_index: bool = False):
+        """
+        Args:
+            filename: NARC 파일 경로
+            use_index: True면 <filename>.idx 사이드카 인덱스로 파싱을 건너뜀 (없거나 오래되면 재생성)
+        """
         self.filename = filename
         self.entries_count = 0
         self.file_entries: List[FileEntry] = []
         self.total_size = 0
+        self.table_size = 0  # NARC 헤더 + BTAF 섹션 크기
+        self.entry_hashes: Optional[List[bytes]] = None  # 인덱스에서 읽은 엔트리 해시
+        self.index: Optional[dict] = None
 
         if filename and os.path.exists(filename):
-            self._parse_narc_file()
+            if use_index:
+                from narc_index import load_or_build_narc_index
+                self._load_index(load_or_build_narc_index(filename))
+            else:
+                self._parse_narc_file()
+
+    def _load_index(self, index: dict):
+        """사이드카 인덱스로부터 엔트리 테이블 복원"""
+        self.index = index
+        self.total_size = index['total_size']
+        self.table_size = index['table_size']
+        self.file_entries = [FileEntry(offset, size) for offset, size in index['entries']]
+        self.entries_count = len(self.file_entries)
+        self.entry_hashes = [bytes.fromhex(h) for h in index['entry_hashes']]
 
     def _parse_narc_file(self):
         """NARC 파일을 파싱하여 파일 엔트리 정보를 추출"""
@@ -54,6 +81,7 @@ class NarcReader:
 
             btaf_size = struct.unpack('<I', btaf_header[4:8])[0]
             self.entries_count = struct.unpack('<I', btaf_header[8:12])[0]
+            self.table_size = first_section_offset + btaf_size
 
             # 파일 엔트리 읽기
             self.file_entries = []
@@ -97,6 +125,11 @@ class NarcReader:
             f.seek(entry.offset)
             return f.read(entry.size)
 
+    def read_table(self) -> bytes:
+        """NARC 헤더와 BTAF 섹션(엔트리 테이블)의 원본 바이트 반환"""
+        with open(self.filename, 'rb') as f:
+            return f.read(self.table_size)
+
     def extract_all_files(self, output_dir: str) -> None:
         """모든 파일을 지정된 디렉토리에 추출"""
         output_path = Path(output_dir)
@@ -151,34 +184,33 @@ def unpack_narc(narc_file: str, output_dir: str) -> NarcReader:
     return reader
 
 
-def pack_narc(input_dir: str, output_narc: str) -> None:
-    """폴더의 파일들을 NARC 파일로 패킹하는 함수
+def load_bin_files(input_dir: str) -> List[bytes]:
+    """폴더의 file_XXXX.bin 파일 데이터를 파일 번호 순으로 읽기 (pack_narc의 파일 순서 규칙)
 
     Args:
-        input_dir: 패킹할 파일들이 있는 폴더
-        output_narc: 생성할 NARC 파일 경로
+        input_dir: file_XXXX.bin 파일들이 있는 폴더
+
+    Returns:
+        list: 파일 번호 순서의 바이트 데이터 리스트
     """
     input_path = Path(input_dir)
-    if not input_path.exists() or not input_path.is_dir():
-        raise FileNotFoundError(f"Input directory not found: {input_dir}")
-
-    # .bin 파일들을 숫자 순으로 정렬
     files = sorted([f for f in input_path.glob("*.bin")],
                    key=lambda x: int(x.stem.split('_')[1]) if '_' in x.stem else 0)
 
-    if not files:
-        raise ValueError(f"No .bin files found in {input_dir}")
-
-    print(f"Packing {len(files)} files into NARC: {output_narc}")
-
-    # 파일 데이터들 읽기
     file_data_list = []
     for file_path in files:
         with open(file_path, 'rb') as f:
-            data = f.read()
-            file_data_list.append(data)
-            print(f"Added: {file_path.name} ({len(data)} bytes)")
+            file_data_list.append(f.read())
+    return file_data_list
+
+
+def write_narc(file_data_list: List[bytes], output_narc: str) -> None:
+    """메모리의 파일 데이터 리스트를 NARC 파일로 기록
 
+    Args:
+        file_data_list: 파일 번호 순서의 바이트 데이터 리스트
+        output_narc: 생성할 NARC 파일 경로
+    """
     # NARC 파일 생성
     with open(output_narc, 'wb') as narc_file:
         entries_count = len(file_data_list)
@@ -263,6 +295,28 @@ def pack_narc(input_dir: str, output_narc: str) -> None:
                 if padding_needed > 0:
                     narc_file.write(b'\x00' * padding_needed)
 
+
+def pack_narc(input_dir: str, output_narc: str) -> None:
+    """폴더의 파일들을 NARC 파일로 패킹하는 함수
+
+    Args:
+        input_dir: 패킹할 파일들이 있는 폴더
+        output_narc: 생성할 NARC 파일 경로
+    """
+    input_path = Path(input_dir)
+    if not input_path.exists() or not input_path.is_dir():
+        raise FileNotFoundError(f"Input directory not found: {input_dir}")
+
+    # .bin 파일들을 숫자 순으로 읽기
+    file_data_list = load_bin_files(input_dir)
+
+    if not file_data_list:
+        raise ValueError(f"No .bin files found in {input_dir}")
+
+    print(f"Packing {len(file_data_list)} files into NARC: {output_narc}")
+
+    write_narc(file_data_list, output_narc)
+
     print(f"Successfully created NARC file: {output_narc}")
 
 
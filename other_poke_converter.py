@@ -1,20 +1,24 @@
 import os
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from pokemon_sprite_converter import PokemonSpriteConverter
+from pokemon_sprite_converter import PokemonSpriteConverter, SpeciesPalettes
 
 
 class OtherPokeConverter:
     """pl_otherpoke.narc 전용 변환기 - 특별한 폼과 언노운 처리"""
 
-    def __init__(self, is_diamond_pearl: bool = False):
+    def __init__(self, is_diamond_pearl: bool = False, png_bits: int = 8, compression: str = 'default'):
         self.is_diamond_pearl = is_diamond_pearl
-        self.converter = PokemonSpriteConverter(is_diamond_pearl)
+        self.converter = PokemonSpriteConverter(is_diamond_pearl, png_bits, compression)
 
         # otherpoke.narc 구조 정의
         self.sprite_structure = self._define_sprite_structure()
         self.palette_structure = self._define_palette_structure()
 
+        # 추출 중 공유 팔레트 캐시 (언노운 28폼이 156/157을 공유하는 경우 등)
+        self._palette_data_cache: Dict[int, bytes] = {}
+        self._palette_contexts: Dict[Tuple[Optional[bytes], Optional[bytes]], SpeciesPalettes] = {}
+
     def _define_sprite_structure(self) -> Dict:
         """스프라이트 파일 구조 정의"""
         structure = {
@@ -268,6 +272,9 @@ class OtherPokeConverter:
 
         print(f"pl_otherpoke.narc 변환 시작: {len(reader)} 파일")
 
+        self._palette_data_cache.clear()
+        self._palette_contexts.clear()
+
         # 각 포켓몬별로 처리
         for pokemon_name, sprite_info in self.sprite_structure.items():
             pokemon_dir = output_path / pokemon_name
@@ -317,12 +324,10 @@ class OtherPokeConverter:
                 sprite_data = reader.extract_file(start_idx)
                 if len(sprite_data) > 48:  # 유효한 스프라이트 데이터인지 확인
                     # 폼별 팔레트 찾기
-                    normal_palette, _ = self._find_palettes_for_form(reader, pokemon_name, forms[0], palette_info)
-                    if not normal_palette:
-                        normal_palette = self._create_default_palette()
+                    palettes = self._find_palette_context_for_form(reader, pokemon_name, forms[0], palette_info)
 
                     output_file = output_dir / f"{forms[0]}.png"
-                    self.converter.pokemon_to_png(sprite_data, normal_palette, str(output_file))
+                    self.converter.sprite_to_png(sprite_data, palettes.normal, str(output_file))
 
     def _extract_form_sprites(self, reader, output_dir: Path, form_name: str, back_idx: int, front_idx: int,
                               palette_info: Dict, pokemon_name: str):
@@ -336,22 +341,24 @@ class OtherPokeConverter:
                 print(f"  {form_name}: 스프라이트 데이터가 너무 작음 (건너뜀)")
                 return
 
-            # 팔레트 찾기 (폼별 팔레트 지원)
-            normal_palette, shiny_palette = self._find_palettes_for_form(reader, pokemon_name, form_name, palette_info)
+            # 팔레트 찾기 (폼별 팔레트 지원, 공유 팔레트는 한 번만 파싱)
+            palettes = self._find_palette_context_for_form(reader, pokemon_name, form_name, palette_info)
 
-            if normal_palette:
+            variants = []
+            if palettes.normal:
                 # 노말 버전
-                back_file = output_dir / f"{form_name}_back_normal.png"
-                front_file = output_dir / f"{form_name}_front_normal.png"
-                self.converter.pokemon_to_png(back_data, normal_palette, str(back_file))
-                self.converter.pokemon_to_png(front_data, normal_palette, str(front_file))
+                variants.append(('normal', palettes.normal))
 
             # shiny 버전이 있는 경우만 생성
-            if shiny_palette and self._has_shiny_palette(pokemon_name, form_name):
-                back_file = output_dir / f"{form_name}_back_shiny.png"
-                front_file = output_dir / f"{form_name}_front_shiny.png"
-                self.converter.pokemon_to_png(back_data, shiny_palette, str(back_file))
-                self.converter.pokemon_to_png(front_data, shiny_palette, str(front_file))
+            if palettes.shiny and self._has_shiny_palette(pokemon_name, form_name):
+                variants.append(('shiny', palettes.shiny))
+
+            # 앞/뒷모습 각각 한 번만 복호화하여 모든 팔레트 버전 저장
+            for direction, sprite_data in (('back', back_data), ('front', front_data)):
+                self.converter.sprite_to_pngs(sprite_data, [
+                    (palette, str(output_dir / f"{form_name}_{direction}_{variant}.png"))
+                    for variant, palette in variants
+                ])
 
             print(f"  {form_name}: back#{back_idx}, front#{front_idx} 추출 완료")
 
@@ -384,12 +391,12 @@ class OtherPokeConverter:
                 form_palette_info = form_palettes[form_name]
 
                 if 'normal' in form_palette_info and form_palette_info['normal'] < len(reader.file_entries):
-                    normal_palette = reader.extract_file(form_palette_info['normal'])
+                    normal_palette = self._extract_palette(reader, form_palette_info['normal'])
                     print(f"    {pokemon_name} {form_name} 노말 팔레트: #{form_palette_info['normal']}")
 
                 # shiny 팔레트가 정의되어 있는 경우만 추출
                 if 'shiny' in form_palette_info and form_palette_info['shiny'] < len(reader.file_entries):
-                    shiny_palette = reader.extract_file(form_palette_info['shiny'])
+                    shiny_palette = self._extract_palette(reader, form_palette_info['shiny'])
                     print(f"    {pokemon_name} {form_name} 색다른 팔레트: #{form_palette_info['shiny']}")
             else:
                 print(f"    경고: {pokemon_name}의 {form_name} 폼에 대한 팔레트 정보 없음")
@@ -405,6 +412,26 @@ class OtherPokeConverter:
 
         return normal_palette, shiny_palette
 
+    def _extract_palette(self, reader, palette_idx: int) -> bytes:
+        """팔레트 엔트리 추출 (같은 인덱스는 한 번만 읽음)"""
+        palette_data = self._palette_data_cache.get(palette_idx)
+        if palette_data is None:
+            palette_data = reader.extract_file(palette_idx)
+            self._palette_data_cache[palette_idx] = palette_data
+        return palette_data
+
+    def _find_palette_context_for_form(self, reader, pokemon_name: str, form_name: str,
+                                       palette_info: Dict) -> SpeciesPalettes:
+        """폼의 팔레트 디코딩 컨텍스트 (같은 팔레트 조합은 한 번만 파싱)"""
+        normal_palette, shiny_palette = self._find_palettes_for_form(reader, pokemon_name, form_name, palette_info)
+
+        key = (normal_palette, shiny_palette)
+        palettes = self._palette_contexts.get(key)
+        if palettes is None:
+            palettes = SpeciesPalettes(self.converter, normal_palette, shiny_palette)
+            self._palette_contexts[key] = palettes
+        return palettes
+
     def _create_default_palette(self) -> bytes:
         """기본 그레이스케일 팔레트 생성"""
         header = bytes([
@@ -422,9 +449,17 @@ class OtherPokeConverter:
 
         return header + b''.join(colors)
 
-    def pngs_to_otherpoke(self, input_dir: str, output_narc: str, original_narc: str = None) -> None:
-        """PNG들을 pl_otherpoke.narc로 변환"""
-        from narc_reader import pack_narc, NarcReader
+    def pngs_to_otherpoke(self, input_dir: str, output_narc: str, original_narc: str = None,
+                          patch_output: str = None, use_index: bool = False) -> None:
+        """PNG들을 pl_otherpoke.narc로 변환
+
+        patch_output 지정시 원본 대비 패치 파일 생성,
+        use_index=True면 원본 NARC의 사이드카 인덱스(.idx)로 헤더 파싱을 건너뜀
+        """
+        from narc_reader import pack_narc, NarcReader, load_bin_files
+
+        if patch_output and not original_narc:
+            raise ValueError("patch_output requires original_narc")
 
         input_path = Path(input_dir)
         temp_dir = Path("temp_otherpoke_data")
@@ -434,7 +469,7 @@ class OtherPokeConverter:
         original_structure = None
         if original_narc and os.path.exists(original_narc):
             print(f"원본 otherpoke.narc 구조 분석 중: {original_narc}")
-            original_reader = NarcReader(original_narc)
+            original_reader = NarcReader(original_narc, use_index=use_index)
             original_structure = original_reader
 
         try:
@@ -475,9 +510,14 @@ class OtherPokeConverter:
                 self._pack_pokemon_palettes_direct(pokemon_dir, temp_dir, pokemon_name,
                                                    palette_info, original_structure)
 
-            # NARC 파일 생성
-            pack_narc(str(temp_dir), output_narc)
-            print(f"pl_otherpoke.narc 생성 완료: {output_narc}")
+            if patch_output:
+                # 원본 대비 변경된 엔트리만 패치로 기록
+                from narc_patch import create_narc_patch
+                create_narc_patch(original_narc, load_bin_files(str(temp_dir)), patch_output)
+            else:
+                # NARC 파일 생성
+                pack_narc(str(temp_dir), output_narc)
+                print(f"pl_otherpoke.narc 생성 완료: {output_narc}")
 
         finally:
             # 임시 파일들 정리
@@ -608,17 +648,20 @@ class OtherPokeConverter:
 
 
 # 사용 예제 함수들
-def convert_otherpoke_to_pngs(narc_file: str, output_dir: str, is_diamond_pearl: bool = False) -> None:
-    """pl_otherpoke.narc를 PNG들로 변환하는 편의 함수"""
-    converter = OtherPokeConverter(is_diamond_pearl)
+def convert_otherpoke_to_pngs(narc_file: str, output_dir: str, is_diamond_pearl: bool = False,
+                              png_bits: int = 8, compression: str = 'default') -> None:
+    """pl_otherpoke.narc를 PNG들로 변환하는 편의 함수 (png_bits=4면 16색 4bpp PNG,
+    compression은 'fast'/'default'/'max' 압축 프로파일)"""
+    converter = OtherPokeConverter(is_diamond_pearl, png_bits, compression)
     converter.otherpoke_to_pngs(narc_file, output_dir)
 
 
 def convert_pngs_to_otherpoke(input_dir: str, output_narc: str, original_narc: str = None,
-                              is_diamond_pearl: bool = False) -> None:
+                              is_diamond_pearl: bool = False, patch_output: str = None,
+                              use_index: bool = False) -> None:
     """PNG들을 pl_otherpoke.narc로 변환하는 편의 함수"""
     converter = OtherPokeConverter(is_diamond_pearl)
-    converter.pngs_to_otherpoke(input_dir, output_narc, original_narc)
+    converter.pngs_to_otherpoke(input_dir, output_narc, original_narc, patch_output, use_index)
 
 
 # 메인 실행부
@@ -8,10 +8,11 @@ KEEP: 이 파일의 모든 함수는 매우 정교하므로 함부로 수정하
 TODO: pokemon_sprite_converter.py에서 이 모듈의 함수들을 호출하게 될 예정
 """
 
+import hashlib
 from PIL import Image
 import numpy as np
 from collections import Counter
-from indexed_bitmap_handler import preprocess_reference_image_for_pokemon
+from preprocess_cache import preprocess_for_pokemon_cached
 
 
 def rgb_to_hex(rgb):
@@ -41,8 +42,19 @@ def extract_palette_from_original_image(image_path, max_colors=16):
     """
     print(f"    빠른 팔레트 분석: {image_path.split('/')[-1]}")
 
-    img = Image.open(image_path)
+    return extract_palette_from_image(Image.open(image_path), max_colors)
 
+
+def extract_palette_from_image(img, max_colors=16):
+    """메모리의 원본 이미지에서 빠른 팔레트 추출 (extract_palette_from_original_image의 파일 없는 버전)
+
+    Args:
+        img: PIL Image
+        max_colors: 최대 색상 수 (기본 16)
+
+    Returns:
+        tuple: (palette_colors, used_indices) 또는 (None, None)
+    """
     # 인덱스 컬러로 변환 (빠른 분석용)
     if img.mode != 'P':
         img = img.convert('P', palette=Image.ADAPTIVE, colors=max_colors)
@@ -95,6 +107,27 @@ def find_optimal_reference(image_files):
         else:
             print(f"      팔레트 추출 실패: {image_path.split('/')[-1]}")
 
+    selected = select_optimal_reference(image_palettes)
+    if selected is None:
+        return None
+
+    best_path, best_score = selected
+    print(f"    ✅ 선택된 기준 이미지: {best_path.split('/')[-1]} (호환성 점수: {best_score:.1f})")
+
+    return best_path
+
+
+def select_optimal_reference(image_palettes):
+    """팔레트 호환성 점수가 가장 좋은 기준 선택
+
+    KEEP: find_optimal_reference의 점수 계산 (키는 경로가 아니어도 됨)
+
+    Args:
+        image_palettes: {키: palette_colors} 딕셔너리
+
+    Returns:
+        tuple: (best_key, best_score) 또는 None
+    """
     if not image_palettes:
         print("    분석 가능한 이미지가 없습니다")
         return None
@@ -123,11 +156,7 @@ def find_optimal_reference(image_files):
         candidate_scores.append((ref_path, total_score))
 
     # 점수가 가장 낮은 (호환성이 가장 좋은) 이미지 선택
-    best_path, best_score = min(candidate_scores, key=lambda x: x[1])
-
-    print(f"    ✅ 선택된 기준 이미지: {best_path.split('/')[-1]} (호환성 점수: {best_score:.1f})")
-
-    return best_path
+    return min(candidate_scores, key=lambda x: x[1])
 
 
 def extract_palette_from_processed_image(image: Image.Image, max_colors=16):
@@ -183,7 +212,7 @@ def preprocess_reference_only(reference_path, is_diamond_pearl=False):
 
     try:
         # 포켓몬 포맷으로 전처리
-        processed_image = preprocess_reference_image_for_pokemon(reference_path, is_diamond_pearl)
+        processed_image = preprocess_for_pokemon_cached(reference_path, is_diamond_pearl)
 
         # 전처리된 이미지의 팔레트 추출
         reference_palette, reference_used_indices = extract_palette_from_processed_image(processed_image)
@@ -384,8 +413,23 @@ def palette_match_to_reference(reference_palette, target_image_path, is_diamond_
     print(f"      팔레트 매칭: {target_image_path.split('/')[-1]}")
 
     # 1. 대상 이미지도 포켓몬 포맷으로 전처리
-    target_processed = preprocess_reference_image_for_pokemon(target_image_path, is_diamond_pearl)
+    target_processed = preprocess_for_pokemon_cached(target_image_path, is_diamond_pearl)
+
+    return palette_match_processed_to_reference(reference_palette, target_processed)
 
+
+def palette_match_processed_to_reference(reference_palette, target_processed):
+    """전처리된 대상 이미지를 기준 팔레트에 맞춰 변환 (palette_match_to_reference의 파일 없는 버전)
+
+    KEEP: 팔레트 매칭 알고리즘은 정교하므로 유지
+
+    Args:
+        reference_palette: 기준 팔레트 색상 리스트
+        target_processed: 포켓몬 포맷으로 전처리된 대상 이미지 (PIL Image)
+
+    Returns:
+        PIL Image: 매칭된 이미지 또는 None
+    """
     # 2. 전처리된 대상 이미지의 팔레트 추출
     target_palette, target_used_indices = extract_palette_from_processed_image(target_processed)
 
@@ -465,9 +509,17 @@ def match_others_to_reference(reference_palette, other_image_files, reference_pa
     Returns:
         dict: {image_path: matched_image} 딕셔너리
     """
-    print(f"  다른 이미지들을 기준 팔레트에 맞춰 변환 중...")
+    return dict(iter_match_others_to_reference(reference_palette, other_image_files, reference_path,
+                                               is_diamond_pearl))
 
-    processed_others = {}
+
+def iter_match_others_to_reference(reference_palette, other_image_files, reference_path, is_diamond_pearl=False):
+    """match_others_to_reference의 스트리밍 버전: 변환된 이미지를 하나씩 (image_path, matched_image)로 반환
+
+    호출하는 쪽이 이미지를 저장/검증한 뒤 바로 놓을 수 있으므로
+    그룹의 모든 이미지를 동시에 메모리에 둘 필요가 없습니다.
+    """
+    print(f"  다른 이미지들을 기준 팔레트에 맞춰 변환 중...")
 
     for image_path in other_image_files:
         if image_path == reference_path:
@@ -479,18 +531,15 @@ def match_others_to_reference(reference_palette, other_image_files, reference_pa
         try:
             # 대상 이미지를 기준 팔레트에 맞춰 변환
             matched_image = palette_match_to_reference(reference_palette, image_path, is_diamond_pearl)
-
-            if matched_image:
-                processed_others[image_path] = matched_image
-                print(f"      ✅ 변환 완료")
-            else:
-                print(f"      ❌ 변환 실패")
-
         except Exception as e:
             print(f"      변환 실패: {e}")
             continue
 
-    return processed_others
+        if matched_image:
+            print(f"      ✅ 변환 완료")
+            yield image_path, matched_image
+        else:
+            print(f"      ❌ 변환 실패")
 
 
 # =============================================================================
@@ -498,33 +547,49 @@ def match_others_to_reference(reference_palette, other_image_files, reference_pa
 # KEEP: 검증 로직은 품질 관리에 중요
 # =============================================================================
 
-def perform_verification(processed_images, processed_shinies, reference_palette):
-    """팔레트 통일 및 포맷 호환성 검증
+def summarize_processed_sprite(image):
+    """검증에 필요한 정보만 담은 작은 요약 (이미지 자체는 보관하지 않음)
 
-    KEEP: 검증 로직은 품질 관리에 중요
+    Args:
+        image: 처리된 이미지 (PIL Image)
+
+    Returns:
+        dict: {'mode', 'size', 'palette_hash', 'used_colors'}
+    """
+    summary = {'mode': image.mode, 'size': image.size, 'palette_hash': None, 'used_colors': 0}
+
+    if image.mode == 'P':
+        img_palette = image.getpalette()
+        if img_palette:
+            summary['palette_hash'] = _palette_hash(img_palette[:48])
+        summary['used_colors'] = int(np.count_nonzero(np.bincount(np.asarray(image).reshape(-1), minlength=256)))
+
+    return summary
+
+
+def _palette_hash(flat_palette):
+    """평탄화된 팔레트 값 리스트의 해시 (리스트 비교와 같은 결과)"""
+    return hashlib.sha1(repr(list(flat_palette)).encode()).hexdigest()
+
+
+def _report_verification(records):
+    """이미지별 검증 기록을 출력하고 결과 dict 생성
 
     Args:
-        processed_images: 처리된 일반 이미지 딕셔너리
-        processed_shinies: 처리된 Shiny 이미지 딕셔너리
-        reference_palette: 기준 팔레트
+        records: [{'name', 'mode', 'size', 'palette_match', 'used_colors'}, ...]
 
     Returns:
-        dict: 검증 결과 {'unified': bool, 'compatible': bool}
+        dict: {'unified': bool, 'compatible': bool, 'images': records}
     """
     print(f"\n  📋 검증 단계")
 
     # 팔레트 통일 검증
-    reference_palette_flat = []
-    for color in reference_palette:
-        reference_palette_flat.extend(color)
-
     all_unified = True
-    all_images = {**processed_images, **processed_shinies}
 
-    for filename, img in all_images.items():
-        if img.mode == 'P':
-            img_palette = img.getpalette()
-            if img_palette and img_palette[:48] == reference_palette_flat[:48]:
+    for record in records:
+        filename = record['name']
+        if record['mode'] == 'P':
+            if record['palette_match']:
                 print(f"    ✅ {filename}: 팔레트 완전 일치")
             else:
                 print(f"    ❌ {filename}: 팔레트 불일치")
@@ -536,62 +601,351 @@ def perform_verification(processed_images, processed_shinies, reference_palette)
     # 포켓몬 포맷 호환성 검증
     format_compatible = True
 
-    for filename, img in all_images.items():
+    for record in records:
+        filename = record['name']
         # 크기 검증
-        if img.size != (160, 80):
-            print(f"    ❌ {filename}: 크기 불일치 {img.size}")
+        if record['size'] != (160, 80):
+            print(f"    ❌ {filename}: 크기 불일치 {record['size']}")
             format_compatible = False
 
         # 팔레트 모드 및 색상 수 검증
-        if img.mode != 'P':
+        if record['mode'] != 'P':
             print(f"    ❌ {filename}: 팔레트 모드 아님")
             format_compatible = False
-        else:
-            used_colors = len(set(img.getdata()))
-            if used_colors > 16:
-                print(f"    ❌ {filename}: 색상 수 초과 ({used_colors}색)")
-                format_compatible = False
+        elif record['used_colors'] > 16:
+            print(f"    ❌ {filename}: 색상 수 초과 ({record['used_colors']}색)")
+            format_compatible = False
 
     print(f"  - 팔레트 통일: {'✅' if all_unified else '❌'}")
     print(f"  - 포맷 호환성: {'✅' if format_compatible else '❌'}")
 
     return {
         'unified': all_unified,
-        'compatible': format_compatible
+        'compatible': format_compatible,
+        'images': records
     }
 
 
+class VerificationAccumulator:
+    """스프라이트를 하나씩 받아 요약만 보관하는 검증기
+
+    KEEP: perform_verification과 같은 판정/출력 (이미지는 add 후 바로 놓아도 됨)
+    """
+
+    def __init__(self, reference_palette):
+        reference_palette_flat = []
+        for color in reference_palette:
+            reference_palette_flat.extend(color)
+        self.reference_hash = _palette_hash(reference_palette_flat[:48])
+        self.summaries = {}
+
+    def add(self, filename, image):
+        """처리된 스프라이트 하나 추가 (같은 이름이면 덮어씀)"""
+        self.add_summary(filename, summarize_processed_sprite(image))
+
+    def add_summary(self, filename, summary):
+        self.summaries[filename] = summary
+
+    def finish(self):
+        """검증 결과 출력 및 반환
+
+        Returns:
+            dict: 검증 결과 {'unified': bool, 'compatible': bool, 'images': 이미지별 기록}
+        """
+        records = []
+        for filename, summary in self.summaries.items():
+            records.append({
+                'name': filename,
+                'mode': summary['mode'],
+                'size': summary['size'],
+                'palette_match': summary['palette_hash'] is not None and summary['palette_hash'] == self.reference_hash,
+                'used_colors': summary['used_colors'],
+            })
+        return _report_verification(records)
+
+
+def _used_color_counts(flat_planes):
+    """(N, 픽셀 수) 인덱스 배열의 이미지별 사용 색 수
+
+    인덱스가 모두 16 미만이면 이미지별 16비트 비트셋을 OR로 모아 세고,
+    아니면 이미지별로 256칸씩 떨어진 위치에 bincount합니다.
+    """
+    count = len(flat_planes)
+    if count == 0 or flat_planes.size == 0:
+        return np.zeros(count, dtype=np.int64)
+
+    if int(flat_planes.max()) < 16:
+        bits = np.bitwise_or.reduce(np.left_shift(np.uint16(1), flat_planes, dtype=np.uint16), axis=1)
+        return np.unpackbits(bits.astype('<u2').view(np.uint8).reshape(count, 2), axis=1).sum(axis=1)
+
+    offsets = flat_planes.astype(np.intp) + (np.arange(count, dtype=np.intp) * 256)[:, None]
+    return np.count_nonzero(np.bincount(offsets.reshape(-1), minlength=count * 256).reshape(count, 256), axis=1)
+
+
+def verify_sprite_stack(planes, palettes, reference_palette, names=None):
+    """배열 스프라이트 묶음 검증 (이미지 객체 없이 한 번의 배열 연산으로 처리)
+
+    Args:
+        planes: (N, 80, 160) uint8 인덱스 배열
+        palettes: (N, 16, 3) 이미지별 RGB 팔레트 배열
+        reference_palette: 기준 팔레트 색상 리스트
+        names: 이미지 이름 리스트 (None이면 'sprite_0' ...)
+
+    Returns:
+        dict: 검증 결과 {'unified': bool, 'compatible': bool, 'images': 이미지별 기록}
+    """
+    planes = np.asarray(planes, dtype=np.uint8)
+    palettes = np.asarray(palettes, dtype=np.int64).reshape(len(planes), 16, 3)
+    count = len(planes)
+    if names is None:
+        names = [f"sprite_{i}" for i in range(count)]
+
+    # 팔레트 통일: 기준 팔레트가 16색 전체일 때만 getpalette()[:48] 비교와 같은 의미
+    if len(reference_palette) >= 16:
+        reference = np.asarray(reference_palette[:16], dtype=np.int64).reshape(16, 3)
+        palette_match = (palettes == reference).all(axis=(1, 2))
+    else:
+        palette_match = np.zeros(count, dtype=bool)
+
+    used_colors = _used_color_counts(planes.reshape(count, -1))
+
+    size = (planes.shape[2], planes.shape[1]) if planes.ndim == 3 else None
+    records = [{'name': names[i], 'mode': 'P', 'size': size, 'palette_match': bool(palette_match[i]),
+                'used_colors': int(used_colors[i])} for i in range(count)]
+    return _report_verification(records)
+
+
+def perform_verification(processed_images, processed_shinies, reference_palette):
+    """팔레트 통일 및 포맷 호환성 검증
+
+    KEEP: 검증 로직은 품질 관리에 중요
+
+    인덱스/팔레트 배열 묶음은 verify_sprite_stack을 직접 사용합니다.
+
+    Args:
+        processed_images: 처리된 일반 이미지 딕셔너리
+        processed_shinies: 처리된 Shiny 이미지 딕셔너리
+        reference_palette: 기준 팔레트
+
+    Returns:
+        dict: 검증 결과 {'unified': bool, 'compatible': bool, 'images': 이미지별 기록}
+    """
+    verifier = VerificationAccumulator(reference_palette)
+
+    all_images = {**processed_images, **processed_shinies}
+    for filename, img in all_images.items():
+        verifier.add(filename, img)
+
+    return verifier.finish()
+
+
 # =============================================================================
-# 통합 API 함수들 (향후 pokemon_sprite_converter.py에서 호출용)
-# TODO: 이 섹션은 향후 확장 예정
+# 통합 API 함수들 (pokemon_sprite_converter.py 등에서 호출용)
+# 파일을 읽거나 쓰지 않고 메모리의 이미지 데이터만으로 처리하며,
+# 결과는 게임 포맷 바이너리 (스프라이트 RGCN, 팔레트 NCLR)로 돌려줍니다.
 # =============================================================================
 
-def process_pokemon_palette_unification(pokemon_sprites_data, is_diamond_pearl=False):
-    """포켓몬 하나의 모든 스프라이트 팔레트 통일
+SHINY_SUFFIX = '_shiny'
 
-    TODO: pokemon_sprite_converter.py에서 호출할 통합 API
+
+def load_sprite_image(image_data):
+    """메모리의 이미지 데이터를 PIL Image로 변환 (디스크 I/O 없음)
+
+    Args:
+        image_data: PNG 등 인코딩된 bytes, PIL Image, 또는 (H, W[, 3|4]) uint8 배열
+
+    Returns:
+        Image.Image: PIL 이미지
+    """
+    if isinstance(image_data, Image.Image):
+        return image_data
+
+    if isinstance(image_data, (bytes, bytearray, memoryview)):
+        import io
+        image = Image.open(io.BytesIO(bytes(image_data)))
+        image.load()
+        return image
+
+    array = np.asarray(image_data)
+    if array.dtype != np.uint8 or array.ndim not in (2, 3) or (array.ndim == 3 and array.shape[2] not in (3, 4)):
+        raise ValueError(f"지원하지 않는 이미지 데이터: {type(image_data).__name__} {array.dtype} {array.shape}")
+    return Image.fromarray(array)
+
+
+def _preprocess_sprite_data(sprite_type, image_data, is_diamond_pearl=False):
+    """이미지 데이터 하나를 포켓몬 포맷으로 전처리 (sprite_type으로 스프라이트 번호 결정)"""
+    from indexed_bitmap_handler import IndexedBitmapHandler, sprite_number_from_filename
+
+    return IndexedBitmapHandler().preprocess_image_for_pokemon_format(
+        load_sprite_image(image_data), sprite_type,
+        sprite_number=sprite_number_from_filename(sprite_type), is_diamond_pearl=is_diamond_pearl)
+
+
+def unify_sprite_images(pokemon_sprites_data, is_diamond_pearl=False):
+    """포켓몬 하나의 스프라이트들을 메모리에서 팔레트 통일 (바이너리 변환 전 단계)
 
     Args:
         pokemon_sprites_data: {sprite_type: image_data} 딕셔너리
+            (색다른 버전은 '<sprite_type>_shiny' 키)
         is_diamond_pearl: DP 포맷 여부
 
     Returns:
-        dict: {sprite_type: (processed_sprite_data, palette_data)}
+        tuple: ({sprite_type: 통일된 Image}, {'<sprite_type>_shiny': 색다른 Image}, reference_palette)
+               또는 None (일반 스프라이트가 없거나 전처리 실패)
     """
-    # TODO: 구현 필요
+    normal_data = {sprite_type: data for sprite_type, data in pokemon_sprites_data.items()
+                   if not sprite_type.endswith(SHINY_SUFFIX)}
+    shiny_data = {sprite_type[:-len(SHINY_SUFFIX)]: data for sprite_type, data in pokemon_sprites_data.items()
+                  if sprite_type.endswith(SHINY_SUFFIX)}
+
+    if not normal_data:
+        print("  일반 스프라이트가 없습니다.")
+        return None
+
     # 1. 기준 이미지 선택
-    # 2. 모든 스프라이트 전처리
-    # 3. 팔레트 통일
+    originals = {sprite_type: load_sprite_image(data) for sprite_type, data in normal_data.items()}
+    if len(originals) == 1:
+        reference_type = next(iter(originals))
+    else:
+        image_palettes = {}
+        for sprite_type, image in originals.items():
+            print(f"    빠른 팔레트 분석: {sprite_type}")
+            colors, _ = extract_palette_from_image(image)
+            if colors:
+                image_palettes[sprite_type] = colors
+
+        selected = select_optimal_reference(image_palettes)
+        if not selected:
+            return None
+        reference_type = selected[0]
+        print(f"    ✅ 선택된 기준 이미지: {reference_type} (호환성 점수: {selected[1]:.1f})")
+
+    # 2. 기준 이미지 전처리
+    print(f"  기준 이미지를 포켓몬 포맷으로 전처리 중: {reference_type}")
+    try:
+        reference_image = _preprocess_sprite_data(reference_type, originals[reference_type], is_diamond_pearl)
+        reference_palette, _ = extract_palette_from_processed_image(reference_image)
+    except Exception as e:
+        print(f"    전처리 실패: {e}")
+        return None
+
+    if not reference_palette:
+        print(f"    전처리 실패: 팔레트 추출 불가")
+        return None
+
+    # 3. 나머지 스프라이트를 기준 팔레트에 맞춤
+    images = {reference_type: reference_image}
+    for sprite_type, image in originals.items():
+        if sprite_type == reference_type:
+            continue
+        print(f"      팔레트 매칭: {sprite_type}")
+        try:
+            matched_image = palette_match_processed_to_reference(
+                reference_palette, _preprocess_sprite_data(sprite_type, image, is_diamond_pearl))
+        except Exception as e:
+            print(f"        오류: {e}")
+            continue
+        if matched_image:
+            images[sprite_type] = matched_image
+
     # 4. Shiny 색상 매핑
+    shiny_images = {}
+    for sprite_type, data in shiny_data.items():
+        if sprite_type not in images:
+            print(f"  ⚠️ 대응하는 일반 스프라이트 없음: {sprite_type}{SHINY_SUFFIX}")
+            continue
+
+        try:
+            shiny_processed = _preprocess_sprite_data(sprite_type, data, is_diamond_pearl)
+        except Exception as e:
+            print(f"    전처리 실패 ({sprite_type}{SHINY_SUFFIX}): {e}")
+            continue
+
+        color_mapping = extract_color_mapping_between_processed_images(images[sprite_type], shiny_processed)
+        if color_mapping:
+            shiny_image = apply_color_mapping_to_processed_image(images[sprite_type], color_mapping)
+            if shiny_image:
+                shiny_images[sprite_type + SHINY_SUFFIX] = shiny_image
+
     # 5. 검증
-    pass
+    perform_verification(images, shiny_images, reference_palette)
+
+    return images, shiny_images, reference_palette
+
+
+def process_palette_unification_batch(species_sprites_data, is_diamond_pearl=False):
+    """여러 포켓몬의 스프라이트 팔레트를 한 번에 통일하여 게임 포맷 바이너리로 변환
+
+    모든 종을 메모리에서 통일한 뒤 스프라이트 암호화는 한 번의 배치 인코딩으로 처리합니다.
+    실패한 종은 결과에서 빠집니다.
+
+    Args:
+        species_sprites_data: {species_key: {sprite_type: image_data}} 딕셔너리
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        dict: {species_key: {sprite_type: (sprite_data, palette_data)}}
+              색다른 키는 대응하는 일반 스프라이트 바이너리와 색다른 팔레트를 가집니다.
+    """
+    from pokemon_sprite_converter import PokemonSpriteConverter, encode_sprite_planes
+
+    converter = PokemonSpriteConverter(is_diamond_pearl)
+    unified = {}
+    plane_keys = []
+    planes = []
+
+    for species_key, sprites_data in species_sprites_data.items():
+        result = unify_sprite_images(sprites_data, is_diamond_pearl)
+        if result is None:
+            print(f"  ❌ 팔레트 통일 실패: {species_key}")
+            continue
+
+        images, _, _ = result
+        wrong_size = [sprite_type for sprite_type, image in images.items() if image.size != (160, 80)]
+        if wrong_size:
+            print(f"  ❌ 160x80이 아닌 스프라이트: {species_key} {', '.join(wrong_size)}")
+            continue
+
+        unified[species_key] = result
+        for sprite_type, image in images.items():
+            plane_keys.append((species_key, sprite_type))
+            planes.append(np.asarray(image, dtype=np.uint8) & 0x0F)
+
+    sprite_data = dict(zip(plane_keys, encode_sprite_planes(np.stack(planes), is_diamond_pearl))) if planes else {}
+
+    results = {}
+    for species_key, (images, shiny_images, _) in unified.items():
+        species_result = {}
+        for sprite_type, image in images.items():
+            species_result[sprite_type] = (sprite_data[species_key, sprite_type],
+                                           converter._palette_to_data(image.getpalette()[:48]))
+        for shiny_type, image in shiny_images.items():
+            sprite_type = shiny_type[:-len(SHINY_SUFFIX)]
+            species_result[shiny_type] = (sprite_data[species_key, sprite_type],
+                                          converter._palette_to_data(image.getpalette()[:48]))
+        results[species_key] = species_result
+
+    return results
+
+
+def process_pokemon_palette_unification(pokemon_sprites_data, is_diamond_pearl=False):
+    """포켓몬 하나의 모든 스프라이트 팔레트 통일
+
+    Args:
+        pokemon_sprites_data: {sprite_type: image_data} 딕셔너리
+            (sprite_type은 'male_front' 등, 색다른 버전은 '<sprite_type>_shiny';
+             image_data는 PNG bytes, PIL Image 또는 uint8 배열)
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        dict: {sprite_type: (processed_sprite_data, palette_data)}, 실패하면 빈 dict
+    """
+    return process_palette_unification_batch({0: pokemon_sprites_data}, is_diamond_pearl).get(0, {})
 
 
 def process_single_sprite_type(normal_sprite_data, shiny_sprite_data=None, is_diamond_pearl=False):
     """단일 스프라이트 타입의 팔레트 통일
 
-    TODO: 간단한 Normal-Shiny 쌍 처리용 API
-
     Args:
         normal_sprite_data: 일반 스프라이트 데이터
         shiny_sprite_data: Shiny 스프라이트 데이터 (선택사항)
@@ -599,6 +953,17 @@ def process_single_sprite_type(normal_sprite_data, shiny_sprite_data=None, is_di
 
     Returns:
         tuple: (unified_normal_data, unified_shiny_data, unified_palette)
+               스프라이트 바이너리, Shiny 팔레트 바이너리 (없으면 None), 일반 팔레트 바이너리.
+               실패하면 (None, None, None)
     """
-    # TODO: 구현 필요
-    pass
\ No newline at end of file
+    sprites_data = {'front': normal_sprite_data}
+    if shiny_sprite_data is not None:
+        sprites_data['front' + SHINY_SUFFIX] = shiny_sprite_data
+
+    result = process_pokemon_palette_unification(sprites_data, is_diamond_pearl)
+    if 'front' not in result:
+        return None, None, None
+
+    sprite_data, palette_data = result['front']
+    shiny_palette_data = result.get('front' + SHINY_SUFFIX, (None, None))[1]
+    return sprite_data, shiny_palette_data, palette_data
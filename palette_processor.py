@@ -17,10 +17,11 @@ from palette_engine import (
     preprocess_reference_only,
     extract_color_mapping_between_processed_images,
     apply_color_mapping_to_processed_image,
-    match_others_to_reference,
-    perform_verification
+    iter_match_others_to_reference,
+    VerificationAccumulator
 )
-from indexed_bitmap_handler import preprocess_reference_image_for_pokemon
+from png_chunks import compression_level, save_indexed_png
+from preprocess_cache import preprocess_for_pokemon_cached
 
 
 # =============================================================================
@@ -105,11 +106,13 @@ def group_files_by_number(image_files):
     return groups, shiny_files
 
 
-def save_preprocessed_sprite(image, output_path):
+def save_preprocessed_sprite(image, output_path, compression='default'):
     """전처리 완료된 이미지를 PNG로 저장
 
     KEEP: 이 함수는 검증용으로 계속 필요할 수 있음
     TODO: NARC 직접 출력시에도 중간 결과 저장용으로 사용
+
+    compression: PNG 압축 프로파일 ('fast', 'default', 'max')
     """
     # 최종 검증
     if image.size != (160, 80):
@@ -118,8 +121,8 @@ def save_preprocessed_sprite(image, output_path):
     if image.mode != 'P':
         print(f"    경고: 팔레트 모드가 아님 {image.mode}")
 
-    # PNG 저장
-    image.save(output_path, "PNG", optimize=False)
+    # PNG 저장 (같은 픽셀이 이미 저장된 적 있으면 PLTE만 교체하여 기록)
+    save_indexed_png(image, output_path, optimize=False, compress_level=compression_level(compression))
     print(f"    저장 완료: {os.path.basename(output_path)}")
 
 
@@ -186,7 +189,7 @@ def process_shiny_files_with_preprocessing(shiny_files_for_group, reference_path
 
             # === 2단계: 전처리된 이미지 저장 ===
             print(f"      2단계: 포켓몬 포맷 전처리 및 저장")
-            shiny_processed = preprocess_reference_image_for_pokemon(shiny_file, is_diamond_pearl)
+            shiny_processed = preprocess_for_pokemon_cached(shiny_file, is_diamond_pearl)
 
             if not shiny_processed:
                 print(f"        ❌ 전처리 실패")
@@ -305,7 +308,7 @@ def process_single_shiny_file(shiny_file, matching_normal_image, pokemon_folder,
 
     try:
         # 2단계: 전처리
-        shiny_processed = preprocess_reference_image_for_pokemon(shiny_file, is_diamond_pearl)
+        shiny_processed = preprocess_for_pokemon_cached(shiny_file, is_diamond_pearl)
         preprocessed_filename = generate_pokemon_filename(shiny_filename, "preprocessed")
         preprocessed_output_path = os.path.join(pokemon_folder, preprocessed_filename)
 
@@ -370,7 +373,7 @@ def process_single_file(file_path, shiny_files_for_group, pokemon_folder, is_dia
     output_path = os.path.join(pokemon_folder, new_filename)
 
     # 포켓몬 포맷으로 전처리
-    processed_image = preprocess_reference_image_for_pokemon(file_path, is_diamond_pearl)
+    processed_image = preprocess_for_pokemon_cached(file_path, is_diamond_pearl)
     save_preprocessed_sprite(processed_image, output_path)
 
     print(f"  ✅ 단일 파일 처리 완료: {new_filename}")
@@ -385,6 +388,9 @@ def process_multiple_files(group_number, group_files, shiny_files_for_group, pok
     """멀티 파일 처리
 
     KEEP: 핵심 팔레트 통일 파이프라인
+
+    처리된 스프라이트는 한 장씩 저장하고 검증 요약(팔레트 해시, 사용 색 수)만 남긴 뒤 해제하며,
+    Shiny 매칭에 필요한 일반 이미지만 그룹 끝까지 유지합니다.
     """
     print("  멀티 파일 처리")
 
@@ -419,44 +425,57 @@ def process_multiple_files(group_number, group_files, shiny_files_for_group, pok
     else:
         matching_shiny_files = []
 
-    # 5단계: 다른 일반 이미지들 처리 (palette_engine 함수 호출)
-    processed_others = match_others_to_reference(
+    # Shiny 매칭에 필요한 일반 이미지만 메모리에 유지 (나머지는 저장/검증 후 바로 해제)
+    shiny_targets = set()
+    for shiny_file in matching_shiny_files:
+        shiny_gender, shiny_direction, _ = parse_sprite_info(os.path.basename(shiny_file))
+        shiny_targets.add(f"{shiny_gender}_{shiny_direction}_normal.png")
+
+    verifier = VerificationAccumulator(reference_palette)
+    verifier.add(reference_new_filename, reference_image)
+    retained_images = {}
+    if reference_new_filename in shiny_targets:
+        retained_images[reference_new_filename] = reference_image
+    normal_names = {reference_new_filename}
+
+    # 5단계: 다른 일반 이미지들 처리 (palette_engine 함수 호출) 및 6단계: 저장
+    # 한 장씩 변환 → 저장 → 검증 요약 기록
+    for image_path, matched_image in iter_match_others_to_reference(
         reference_palette, group_files, reference_path, is_diamond_pearl
-    )
-
-    # 6단계: 다른 이미지들 저장
-    processed_images = {reference_new_filename: reference_image}
-
-    for image_path, matched_image in processed_others.items():
+    ):
         filename = os.path.basename(image_path)
         new_filename = generate_pokemon_filename(filename)
         output_path = os.path.join(pokemon_folder, new_filename)
 
         save_preprocessed_sprite(matched_image, output_path)
-        processed_images[new_filename] = matched_image
+        verifier.add(new_filename, matched_image)
+        if new_filename in shiny_targets:
+            retained_images[new_filename] = matched_image
+        normal_names.add(new_filename)
         print(f"  ✅ 저장 완료: {new_filename}")
 
     # 6단계: 필터링된 Shiny 파일들 처리
-    processed_shinies = {}
+    shiny_names = set()
     if matching_shiny_files:
         for shiny_file in matching_shiny_files:
             # 각 Shiny마다 개별적으로 매칭할 일반 이미지 찾기
-            matching_normal, matching_filename = find_matching_normal_for_shiny(shiny_file, processed_images)
+            matching_normal, matching_filename = find_matching_normal_for_shiny(shiny_file, retained_images)
 
             if matching_normal:
                 # 3단계 처리 (원본, 전처리, 매핑)
                 shiny_result = process_single_shiny_file(
                     shiny_file, matching_normal, pokemon_folder, is_diamond_pearl
                 )
-                if shiny_result:
-                    processed_shinies.update(shiny_result)
+                for shiny_filename, shiny_image in shiny_result.items():
+                    verifier.add(shiny_filename, shiny_image)
+                    shiny_names.add(shiny_filename)
 
-    # 7단계: 검증 (palette_engine 함수 호출)
-    verification_result = perform_verification(processed_images, processed_shinies, reference_palette)
+    # 7단계: 검증 (palette_engine 검증기, 저장해 둔 요약만 사용)
+    verification_result = verifier.finish()
 
     print(f"\n  그룹 {group_number} 처리 완료!")
-    print(f"  - 일반 이미지: {len(processed_images)}개")
-    print(f"  - Shiny 이미지: {len(processed_shinies)}개")
+    print(f"  - 일반 이미지: {len(normal_names)}개")
+    print(f"  - Shiny 이미지: {len(shiny_names)}개")
 
     return verification_result
 
@@ -466,12 +485,12 @@ def process_multiple_files(group_number, group_files, shiny_files_for_group, pok
 # TODO: 전체 워크플로우를 README 규격에 맞게 수정 필요
 # =============================================================================
 
-def main():
+def main(argv=None):
     """메인 실행 함수
 
     현재 흐름:
     1. input/ 폴더에서 파일명 기반 그룹화
-    2. 각 그룹별로 팔레트 통일 처리
+    2. 각 그룹별로 팔레트 통일 처리 (--jobs N이면 프로세스 풀에서 병렬 처리)
     3. output/ 폴더에 PNG 파일들 저장
 
     TODO: README 규격 구현
@@ -479,6 +498,18 @@ def main():
     2. 성별별 처리 후 NARC 인덱스 매핑
     3. pokemon_sprite_converter 호출하여 NARC 생성
     """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="포켓몬 팔레트 처리 워크플로우")
+    parser.add_argument("--jobs", type=int, default=1, help="그룹 병렬 처리 프로세스 수 (기본: 1, 직렬)")
+    parser.add_argument("--cache-dir", default=None, help="전처리 캐시 디렉토리 (기본: .preprocess_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="전처리 캐시 사용 안 함")
+    args = parser.parse_args(argv)
+
+    if args.no_cache or args.cache_dir:
+        from preprocess_cache import configure_default_cache
+        configure_default_cache(None if args.no_cache else args.cache_dir)
+
     print("=== 포켓몬 팔레트 처리 워크플로우 (현재 구현) ===")
     print("palette_engine.py의 핵심 기능들을 호출하여 파일 기반 처리 수행\n")
 
@@ -525,20 +556,35 @@ def main():
     successful_groups = 0
     all_groups = set(groups.keys()) | set(shiny_files.keys())
 
-    for group_num in sorted(all_groups):
-        group_files = groups.get(group_num, [])
-        shiny_files_for_group = shiny_files.get(group_num, [])
-
-        try:
-            result = process_group(
-                group_num, group_files, shiny_files_for_group,
-                output_folder, is_diamond_pearl
-            )
-            if result:
+    group_args = [
+        (group_num, groups.get(group_num, []), shiny_files.get(group_num, []), output_folder, is_diamond_pearl)
+        for group_num in sorted(all_groups)
+    ]
+
+    if args.jobs > 1:
+        from group_pool import run_groups_in_pool
+
+        print(f"\n그룹 병렬 처리: 프로세스 {args.jobs}개")
+        for outcome, (_, group_files, shiny_files_for_group, _, _) in zip(
+                run_groups_in_pool(process_group, group_args, args.jobs), group_args):
+            print(outcome.log, end="")
+            if outcome.error is not None:
+                print(f"\n❌ 그룹 {outcome.group_number} 처리 실패: {outcome.error}")
+            elif outcome.result:
                 successful_groups += 1
                 total_processed += len(group_files) + len(shiny_files_for_group)
-        except Exception as e:
-            print(f"\n❌ 그룹 {group_num} 처리 실패: {e}")
+    else:
+        for group_num, group_files, shiny_files_for_group, _, _ in group_args:
+            try:
+                result = process_group(
+                    group_num, group_files, shiny_files_for_group,
+                    output_folder, is_diamond_pearl
+                )
+                if result:
+                    successful_groups += 1
+                    total_processed += len(group_files) + len(shiny_files_for_group)
+            except Exception as e:
+                print(f"\n❌ 그룹 {group_num} 처리 실패: {e}")
 
     # TODO: pokemon_sprite_converter 호출하여 NARC 생성
     # from pokemon_sprite_converter import convert_pngs_to_narc
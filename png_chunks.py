@@ -0,0 +1,202 @@
+"""
+png_chunks.py - 인덱스 컬러 PNG 청크 단위 재작성
+
+노말/색다른 스프라이트처럼 픽셀 데이터는 같고 팔레트만 다른 PNG는
+이미 압축된 IDAT를 그대로 재사용하고 PLTE 청크만 바꿔 쓰면 됩니다.
+zlib 재압축 없이 PLTE 내용과 CRC만 새로 계산하므로 버전 하나를 쓰는 비용이
+전체 deflate 대신 수 마이크로초 수준이 됩니다.
+"""
+
+import io
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 압축 프로파일별 zlib 레벨 (fast: 추출용 임시 출력, max: 배포용)
+COMPRESSION_PROFILES = {
+    'fast': 1,
+    'default': 6,
+    'max': 9,
+}
+
+
+def compression_level(profile: str) -> int:
+    """압축 프로파일 이름을 zlib 레벨로 변환"""
+    if profile not in COMPRESSION_PROFILES:
+        raise ValueError(f"Unknown compression profile: {profile} "
+                         f"(expected one of {', '.join(COMPRESSION_PROFILES)})")
+    return COMPRESSION_PROFILES[profile]
+
+
+def split_png_chunks(png_data: bytes) -> List[Tuple[bytes, bytes]]:
+    """PNG 바이트를 (청크 타입, 청크 데이터) 리스트로 분리
+
+    Args:
+        png_data: PNG 파일 데이터
+
+    Returns:
+        List[Tuple[bytes, bytes]]: 파일 순서대로의 청크들 (CRC 제외)
+    """
+    if png_data[:8] != PNG_SIGNATURE:
+        raise ValueError("Invalid PNG data: wrong signature")
+
+    chunks = []
+    offset = 8
+    while offset < len(png_data):
+        if offset + 8 > len(png_data):
+            raise ValueError("Invalid PNG data: truncated chunk header")
+
+        length, chunk_type = struct.unpack('>I4s', png_data[offset:offset + 8])
+        data_start = offset + 8
+        data_end = data_start + length
+        if data_end + 4 > len(png_data):
+            raise ValueError(f"Invalid PNG data: truncated {chunk_type!r} chunk")
+
+        chunks.append((chunk_type, png_data[data_start:data_end]))
+        offset = data_end + 4
+
+        if chunk_type == b'IEND':
+            break
+
+    return chunks
+
+
+def build_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """길이/타입/데이터/CRC로 구성된 PNG 청크 하나 생성"""
+    return struct.pack('>I', len(data)) + chunk_type + data + \
+        struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF)
+
+
+def encode_indexed_png(raw_rows: bytes, width: int, height: int, bit_depth: int,
+                       palette: List[int], level: int = 6) -> bytes:
+    """이미 필터 바이트가 붙은 스캔라인들로 인덱스 컬러 PNG 생성
+
+    Args:
+        raw_rows: 행마다 필터 바이트(0) + 패킹된 픽셀 데이터
+        width: 이미지 너비
+        height: 이미지 높이
+        bit_depth: 픽셀당 비트 수 (1, 2, 4, 8)
+        palette: 평탄화된 RGB 값 리스트 (2**bit_depth 색까지만 기록)
+        level: zlib 압축 레벨
+
+    Returns:
+        bytes: PNG 파일 데이터
+    """
+    entries = min(len(palette) // 3, 1 << bit_depth)
+    ihdr = struct.pack('>IIBBBBB', width, height, bit_depth, 3, 0, 0, 0)
+
+    return PNG_SIGNATURE + \
+        build_png_chunk(b'IHDR', ihdr) + \
+        build_png_chunk(b'PLTE', bytes(palette[:entries * 3])) + \
+        build_png_chunk(b'IDAT', zlib.compress(raw_rows, level)) + \
+        build_png_chunk(b'IEND', b'')
+
+
+class IndexedPngTemplate:
+    """PLTE만 교체하여 같은 픽셀의 PNG를 여러 팔레트로 만들어 내는 템플릿"""
+
+    def __init__(self, png_data: bytes):
+        """
+        Args:
+            png_data: 팔레트(인덱스 컬러) PNG 파일 데이터
+        """
+        chunks = split_png_chunks(png_data)
+        types = [chunk_type for chunk_type, _ in chunks]
+        if b'PLTE' not in types:
+            raise ValueError("PNG has no PLTE chunk (not an indexed image)")
+
+        plte_index = types.index(b'PLTE')
+        self.palette_entries = len(chunks[plte_index][1]) // 3
+
+        # PLTE 앞/뒤 청크는 미리 직렬화해 두고 팔레트만 끼워 넣음
+        self._head = PNG_SIGNATURE + b''.join(build_png_chunk(t, d) for t, d in chunks[:plte_index])
+        self._tail = b''.join(build_png_chunk(t, d) for t, d in chunks[plte_index + 1:])
+
+    @classmethod
+    def from_image(cls, image, **save_options) -> "IndexedPngTemplate":
+        """PIL 'P' 모드 이미지를 한 번 인코딩하여 템플릿 생성"""
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", **save_options)
+        return cls(buffer.getvalue())
+
+    def render(self, palette: List[int]) -> bytes:
+        """주어진 RGB 팔레트로 PNG 바이트 생성 (재압축 없음)
+
+        Args:
+            palette: 평탄화된 RGB 값 리스트 (PIL getpalette()/_parse_palette() 형식)
+
+        Returns:
+            bytes: PNG 파일 데이터
+        """
+        plte = bytes(palette[:self.palette_entries * 3])
+        plte += b'\x00' * (self.palette_entries * 3 - len(plte))
+        return self._head + build_png_chunk(b'PLTE', plte) + self._tail
+
+    def save(self, palette: List[int], output_path: str) -> None:
+        """주어진 RGB 팔레트로 PNG 파일 저장"""
+        with open(output_path, 'wb') as f:
+            f.write(self.render(palette))
+
+
+class PngTemplateCache:
+    """픽셀 데이터가 같은 이미지들의 템플릿을 재사용하는 작은 LRU 캐시
+
+    인덱스 평면(tobytes())과 크기가 같은 이미지는 팔레트만 달라도 같은 템플릿을 씁니다.
+    """
+
+    def __init__(self, max_items: int = 64):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(image) -> Optional[Tuple]:
+        """템플릿을 공유할 수 있는 이미지면 캐시 키, 아니면 None"""
+        if image.mode != 'P' or 'transparency' in image.info:
+            return None
+        return image.size, image.tobytes()
+
+    def get_or_create(self, image, **save_options) -> Optional[IndexedPngTemplate]:
+        """이미지에 맞는 템플릿 (없으면 새로 인코딩, 공유 불가 이미지면 None)"""
+        key = self._key(image)
+        if key is None:
+            return None
+        key = key + (tuple(sorted(save_options.items())),)
+
+        with self._lock:
+            template = self._items.get(key)
+            if template is not None:
+                self._items.move_to_end(key)
+                return template
+
+        template = IndexedPngTemplate.from_image(image, **save_options)
+
+        with self._lock:
+            self._items[key] = template
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return template
+
+
+_default_cache = PngTemplateCache()
+
+
+def save_indexed_png(image, output_path: str, cache: Optional[PngTemplateCache] = None, **save_options) -> None:
+    """인덱스 컬러 이미지를 PNG로 저장 (같은 픽셀이 이미 인코딩되었으면 PLTE만 교체)
+
+    Args:
+        image: PIL Image ('P' 모드가 아니거나 투명색이 있으면 일반 저장)
+        output_path: 저장할 PNG 파일 경로
+        cache: 템플릿 캐시 (None이면 모듈 기본 캐시)
+        **save_options: PIL PNG 저장 옵션 (예: optimize=False)
+    """
+    template = (cache or _default_cache).get_or_create(image, **save_options)
+    if template is None:
+        image.save(output_path, "PNG", **save_options)
+        return
+
+    template.save(image.getpalette(), output_path)
@@ -1,17 +1,121 @@
 import os
-from PIL import Image, ImageDraw
+from PIL import Image
 import glob
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
+SHEET_SIZE = (256, 64)
+TILE_SIZE = 64
+BORDER = 8
+BACKGROUND_COLOR = (0x90, 0xB0, 0xB0)  # #90B0B0
+SPRITE_SUFFIXES = ['_Front.png', '_Shiny.png', '_Back.png']
 
-def process_images(input_folder, output_folder):
+
+def load_sheet(image_path):
+    """256x64 시트를 RGB 배열로 한 번만 읽기
+
+    Returns:
+        np.ndarray: (64, 256, 3) uint8 배열, 크기가 다르면 None
+    """
+    with Image.open(image_path) as img:
+        if img.size != SHEET_SIZE:
+            print(f"  경고: {os.path.basename(image_path)}의 크기가 256x64가 아닙니다. "
+                  f"({img.width}x{img.height}) 건너뜁니다.")
+            return None
+        return np.asarray(img.convert('RGB'))
+
+
+def split_sheet(sheet):
+    """시트 배열을 앞모습/색다른/뒷모습 160x80 스프라이트로 분할
+
+    64x64 타일마다 #90B0B0 8픽셀 여백을 둔 80x80 칸을 만들고,
+    같은 칸 2개를 나란히 붙여 160x80으로 만듭니다 (배열 슬라이싱만 사용).
+
+    Args:
+        sheet: (64, 256, 3) RGB 배열
+
+    Returns:
+        np.ndarray: (3, 80, 160, 3) RGB 배열 (SPRITE_SUFFIXES 순서)
+    """
+    count = len(SPRITE_SUFFIXES)
+    tiles = sheet[:, :count * TILE_SIZE].reshape(TILE_SIZE, count, TILE_SIZE, 3).transpose(1, 0, 2, 3)
+
+    cell = TILE_SIZE + BORDER * 2
+    sprites = np.empty((count, cell, cell * 2, 3), dtype=np.uint8)
+    sprites[:] = BACKGROUND_COLOR
+    sprites[:, BORDER:BORDER + TILE_SIZE, BORDER:BORDER + TILE_SIZE] = tiles
+    sprites[:, BORDER:BORDER + TILE_SIZE, cell + BORDER:cell + BORDER + TILE_SIZE] = tiles
+    return sprites
+
+
+def index_sprite(sprite):
+    """RGB 스프라이트 배열을 손실 없는 8bpp 인덱스 이미지로 변환
+
+    팔레트 순서는 처음 등장한 색 순서이므로 IndexedBitmapHandler의
+    C# 스타일 변환과 같은 인덱스가 됩니다 (16색 이하일 때).
+
+    Args:
+        sprite: (80, 160, 3) RGB 배열
+
+    Returns:
+        Image.Image: 'P' 모드 160x80 이미지
+    """
+    height, width, _ = sprite.shape
+    packed = (sprite[..., 0].astype(np.uint32) << 16) | (sprite[..., 1].astype(np.uint32) << 8) | sprite[..., 2]
+    colors, first_positions, inverse = np.unique(packed.reshape(-1), return_index=True, return_inverse=True)
+    if len(colors) > 256:
+        raise ValueError(f"색상 수 초과: {len(colors)}색")
+
+    order = np.argsort(first_positions)
+    rank = np.empty(len(colors), dtype=np.uint8)
+    rank[order] = np.arange(len(colors), dtype=np.uint8)
+
+    image = Image.frombytes('P', (width, height), rank[inverse].tobytes())
+    palette = np.stack([(colors[order] >> 16) & 0xFF, (colors[order] >> 8) & 0xFF, colors[order] & 0xFF], axis=1)
+    image.putpalette(palette.astype(np.uint8).tobytes() + b'\x00' * (768 - palette.size))
+    return image
+
+
+def split_sheet_indexed(image_path):
+    """시트 하나를 팔레트 파이프라인에 바로 넘길 인덱스 이미지들로 분할
+
+    pokegra_pipeline.unify_species가 input/<M|F>/<도감번호>/의 시트를
+    RGB PNG로 저장했다 다시 읽지 않고 이 결과를 바로 사용합니다.
+
+    Returns:
+        dict: {'_Front.png': Image, '_Shiny.png': Image, '_Back.png': Image}, 크기가 다르면 빈 dict
+    """
+    sheet = load_sheet(image_path)
+    if sheet is None:
+        return {}
+    return {suffix: index_sprite(sprite) for suffix, sprite in zip(SPRITE_SUFFIXES, split_sheet(sheet))}
+
+
+def _convert_sheet(image_path, output_folder):
+    """시트 하나를 분할하여 RGB PNG 3개로 저장 (스레드 워커)"""
+    base_name = os.path.splitext(os.path.basename(image_path))[0]
+
+    sheet = load_sheet(image_path)
+    if sheet is None:
+        return False
+
+    for suffix, sprite in zip(SPRITE_SUFFIXES, split_sheet(sheet)):
+        Image.fromarray(sprite, 'RGB').save(os.path.join(output_folder, f"{base_name}{suffix}"))
+    return True
+
+
+def process_images(input_folder, output_folder, jobs=1):
     """
     256x64 이미지를 처리하여 64x64 이미지들로 분할하고 변환하는 함수
+
+    시트마다 한 번만 읽고 NumPy 슬라이싱으로 160x80 스프라이트 3개를 만들며,
+    jobs > 1이면 시트 읽기/PNG 저장을 스레드 풀에서 병렬로 처리합니다.
     """
     # output 폴더가 없으면 생성
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    # 입력 폴더에서 이미지 파일들 찾기 (png, jpg, jpeg 지원)
+    # 입력 폴더에서 이미지 파일 찾기 (png, jpg, jpeg 지원)
     image_extensions = ['*.png', '*.jpg', '*.jpeg', '*.PNG', '*.JPG', '*.JPEG']
     image_files = []
     for extension in image_extensions:
@@ -23,72 +127,43 @@ def process_images(input_folder, output_folder):
 
     print(f"총 {len(image_files)}개의 이미지를 처리합니다.")
 
-    for idx, image_path in enumerate(image_files):
+    def convert(indexed_path):
+        idx, image_path = indexed_path
+        base_name = os.path.splitext(os.path.basename(image_path))[0]
         try:
-            # 파일명에서 확장자 제거
-            base_name = os.path.splitext(os.path.basename(image_path))[0]
-
-            print(f"[{idx + 1}/{len(image_files)}] 처리 중: {base_name}")
-
-            # 이미지 열기
-            img = Image.open(image_path)
-
-            # 이미지 크기 확인
-            if img.size != (256, 64):
-                print(f"  경고: {base_name}의 크기가 256x64가 아닙니다. ({img.width}x{img.height}) 건너뜁니다.")
-                continue
-
-            # 256x64 이미지를 64x64 4개로 분할
-            sprites = []
-            for i in range(4):
-                left = i * 64
-                sprite = img.crop((left, 0, left + 64, 64))
-                sprites.append(sprite)
-
-            # 앞의 3개 스프라이트 처리
-            suffixes = ['_Front.png', '_Shiny.png', '_Back.png']
-
-            for i in range(3):
-                print(f"  처리 중: {base_name}{suffixes[i]}")
-
-                # 80x80 캔버스 생성 (배경색 #90B0B0)
-                expanded_img = Image.new('RGB', (80, 80), color='#90B0B0')
-
-                # 64x64 이미지를 중앙에 배치 (8픽셀 여백)
-                expanded_img.paste(sprites[i], (8, 8))
-
-                # 160x80 이미지 생성 (80x80 이미지를 2개 나란히)
-                final_img = Image.new('RGB', (160, 80), color='#90B0B0')
-                final_img.paste(expanded_img, (0, 0))  # 왼쪽에 첫 번째
-                final_img.paste(expanded_img, (80, 0))  # 오른쪽에 두 번째 (동일한 이미지)
-
-                # 파일 저장
-                output_path = os.path.join(output_folder, f"{base_name}{suffixes[i]}")
-                final_img.save(output_path)
-
-            print(f"  완료: {base_name}")
-
+            if _convert_sheet(image_path, output_folder):
+                return f"[{idx + 1}/{len(image_files)}] 완료: {base_name}"
+            return None
         except Exception as e:
-            print(f"  오류 발생 ({base_name}): {str(e)}")
-            continue
+            return f"  오류 발생 ({base_name}): {str(e)}"
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for message in executor.map(convert, enumerate(image_files)):
+            if message:
+                print(message)
 
     print("모든 이미지 처리가 완료되었습니다.")
 
 
-def main():
+def main(argv=None):
+    import argparse
+
     # 폴더 경로 설정
-    input_folder = r"C:\game\pokemon\spriteEditor\gen3sprite"  # 입력 폴더
-    output_folder = r"C:\game\pokemon\spriteEditor\gen4sprite"  # 출력 폴더
+    parser = argparse.ArgumentParser(description="256x64 시트 → 160x80 스프라이트 변환")
+    parser.add_argument("input_folder", nargs="?", default=r"C:\game\pokemon\spriteEditor\gen3sprite")  # 입력 폴더
+    parser.add_argument("output_folder", nargs="?", default=r"C:\game\pokemon\spriteEditor\gen4sprite")  # 출력 폴더
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="병렬 처리 스레드 수")
+    args = parser.parse_args(argv)
 
     # 입력 폴더 존재 확인
-    if not os.path.exists(input_folder):
-        print(f"입력 폴더 '{input_folder}'가 존재하지 않습니다.")
+    if not os.path.exists(args.input_folder):
+        print(f"입력 폴더 '{args.input_folder}'가 존재하지 않습니다.")
         print("현재 디렉토리에 'input' 폴더를 만들고 256x64 이미지들을 넣어주세요.")
         return
 
     # 이미지 처리 실행
-    process_images(input_folder, output_folder)
+    process_images(args.input_folder, args.output_folder, args.jobs)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
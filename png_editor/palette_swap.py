@@ -4,6 +4,7 @@ from PIL import Image
 import numpy as np
 from collections import Counter, defaultdict
 from indexed_bitmap_handler import IndexedBitmapHandler, preprocess_reference_image_for_pokemon
+from png_chunks import compression_level, save_indexed_png
 
 
 # =============================================================================
@@ -93,24 +94,25 @@ def group_files_by_number(image_files):
     return groups, shiny_files
 
 
-# TODO: 새로운 폴더 구조 스캔 함수 추가 필요
 def scan_gender_dex_folders(input_dir):
     """README 규격의 폴더 구조 스캔
 
-    예상 입력: input/M/001/, input/F/001/
-    예상 출력: {1: {'M': [파일들], 'F': [파일들]}}
+    입력: input/M/001/, input/F/001/
+    출력: {1: {'M': [파일들], 'F': [파일들]}}
 
-    이 함수로 group_files_by_number() 대체 예정
+    구현은 pokegra_pipeline.scan_gender_dex_folders()를 사용
     """
-    # TODO: 구현 필요
-    pass
+    from pokegra_pipeline import scan_gender_dex_folders as scan_folders
+    return scan_folders(input_dir)
 
 
-def save_preprocessed_sprite(image, output_path):
+def save_preprocessed_sprite(image, output_path, compression='default'):
     """전처리 완료된 이미지를 PNG로 저장
 
     KEEP: 이 함수는 검증용으로 계속 필요할 수 있음
     TODO: NARC 직접 출력시에도 중간 결과 저장용으로 사용
+
+    compression: PNG 압축 프로파일 ('fast', 'default', 'max')
     """
     # 최종 검증
     if image.size != (160, 80):
@@ -119,8 +121,8 @@ def save_preprocessed_sprite(image, output_path):
     if image.mode != 'P':
         print(f"    경고: 팔레트 모드가 아님 {image.mode}")
 
-    # PNG 저장
-    image.save(output_path, "PNG", optimize=False)
+    # PNG 저장 (같은 픽셀이 이미 저장된 적 있으면 PLTE만 교체하여 기록)
+    save_indexed_png(image, output_path, optimize=False, compress_level=compression_level(compression))
     print(f"    저장 완료: {os.path.basename(output_path)}")
 
 
@@ -928,12 +930,12 @@ def perform_verification(group_number, processed_images, processed_shinies, refe
 # TODO: 전체 워크플로우를 README 규격에 맞게 수정 필요
 # =============================================================================
 
-def main():
+def main(argv=None):
     """메인 실행 함수
 
     현재 흐름:
     1. input/ 폴더에서 파일명 기반 그룹화
-    2. 각 그룹별로 팔레트 통일 처리
+    2. 각 그룹별로 팔레트 통일 처리 (--jobs N이면 프로세스 풀에서 병렬 처리)
     3. output/ 폴더에 PNG 파일들 저장
 
     TODO: README 규격 구현
@@ -941,6 +943,12 @@ def main():
     2. 성별별 처리 후 NARC 인덱스 매핑
     3. pokemon_sprite_converter 호출하여 NARC 생성
     """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="포켓몬 포맷 전처리 + 팔레트 구조 통일 도구")
+    parser.add_argument("--jobs", type=int, default=1, help="그룹 병렬 처리 프로세스 수 (기본: 1, 직렬)")
+    args = parser.parse_args(argv)
+
     print("=== 개선된 포켓몬 포맷 전처리 + 팔레트 구조 통일 도구 ===")
     print("Shiny 이미지도 완전 전처리 + 기준 선택 → 전처리 → 매핑 → 통일\n")
 
@@ -957,14 +965,9 @@ def main():
     print(f"출력 폴더: {output_folder}")
     print(f"포맷: {'Diamond/Pearl' if is_diamond_pearl else 'Platinum'}")
 
-    # 이미지 파일 찾기
-    # TODO: 폴더 구조 스캔으로 변경
-    image_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.gif']
-    image_files = []
-
-    for file in os.listdir(input_folder):
-        if any(file.lower().endswith(ext) for ext in image_extensions):
-            image_files.append(os.path.join(input_folder, file))
+    # 이미지 파일 찾기 (README 폴더 구조는 main_readme_spec 사용)
+    from input_scanner import list_image_files
+    image_files = list_image_files(input_folder)
 
     if not image_files:
         print("이미지 파일을 찾을 수 없습니다.")
@@ -988,19 +991,34 @@ def main():
     successful_groups = 0
     all_groups = set(groups.keys()) | set(shiny_files.keys())
 
-    for group_num in sorted(all_groups):
-        group_files = groups.get(group_num, [])
-        shiny_files_for_group = shiny_files.get(group_num, [])
+    group_args = [
+        (group_num, groups.get(group_num, []), shiny_files.get(group_num, []), output_folder, is_diamond_pearl)
+        for group_num in sorted(all_groups)
+    ]
 
-        try:
-            process_group(
-                group_num, group_files, shiny_files_for_group,
-                output_folder, is_diamond_pearl
-            )
-            successful_groups += 1
-            total_processed += len(group_files) + len(shiny_files_for_group)
-        except Exception as e:
-            print(f"\n❌ 그룹 {group_num} 처리 실패: {e}")
+    if args.jobs > 1:
+        from group_pool import run_groups_in_pool
+
+        print(f"\n그룹 병렬 처리: 프로세스 {args.jobs}개")
+        for outcome, (_, group_files, shiny_files_for_group, _, _) in zip(
+                run_groups_in_pool(process_group, group_args, args.jobs), group_args):
+            print(outcome.log, end="")
+            if outcome.error is not None:
+                print(f"\n❌ 그룹 {outcome.group_number} 처리 실패: {outcome.error}")
+            else:
+                successful_groups += 1
+                total_processed += len(group_files) + len(shiny_files_for_group)
+    else:
+        for group_num, group_files, shiny_files_for_group, _, _ in group_args:
+            try:
+                process_group(
+                    group_num, group_files, shiny_files_for_group,
+                    output_folder, is_diamond_pearl
+                )
+                successful_groups += 1
+                total_processed += len(group_files) + len(shiny_files_for_group)
+            except Exception as e:
+                print(f"\n❌ 그룹 {group_num} 처리 실패: {e}")
 
     # TODO: pokemon_sprite_converter 호출하여 NARC 생성
     # convert_pngs_to_narc(output_folder, "new_pl_pokegra.narc", "pl_pokegra.narc")
@@ -1038,20 +1056,30 @@ def main():
     print("현재는 PNG 파일 형태이며, 추후 NARC 변환이 필요합니다.")
 
 
-# TODO: 새로운 README 규격 메인 함수 구현
-def main_readme_spec():
-    """README 규격에 맞는 새로운 메인 함수 (미구현)
+def main_readme_spec(input_folder="./input", output_narc="new_pl_pokegra.narc",
+                     original_narc="pl_pokegra.narc", is_diamond_pearl=False, debug_folder=None):
+    """README 규격 메인 함수
 
-    계획된 흐름:
+    흐름 (pokegra_pipeline.run_pipeline):
     1. input/M/, input/F/ 폴더 구조 스캔
     2. 도감번호별로 성별 데이터 수집
-    3. 팔레트 통일 처리 (현재 로직 활용)
+    3. 팔레트 통일 처리 (palette_engine 로직, 메모리에서 처리)
     4. NARC 인덱스로 매핑
-    5. pokemon_sprite_converter 호출
-    6. 원본 pl_pokegra.narc 수정
+    5. 통일된 인덱스 평면에서 바로 RGCN/NCLR 인코딩
+    6. 원본 pl_pokegra.narc 기준으로 새 NARC 기록 (중간 PNG는 debug_folder 지정시만)
     """
-    # TODO: 구현 필요
-    pass
+    from pokegra_pipeline import run_pipeline
+
+    print("=== README 규격 포켓몬 스프라이트 → NARC 파이프라인 ===")
+    if not os.path.exists(original_narc):
+        print(f"원본 NARC 없음, 구조 참조 없이 생성: {original_narc}")
+        original_narc = None
+
+    result = run_pipeline(input_folder, output_narc, original_narc, is_diamond_pearl, debug_folder)
+
+    print(f"\n처리된 종 수: {result['succeeded']}/{result['species']}개")
+    print(f"결과 NARC: {output_narc}")
+    return result
 
 
 if __name__ == "__main__":
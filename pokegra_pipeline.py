@@ -0,0 +1,482 @@
+"""
+pokegra_pipeline.py - input/<M|F>/<도감번호>/ PNG에서 pl_pokegra.narc까지 한 번에 변환
+
+기존 흐름은 palette_processor가 ./output에 통일된 PNG를 쓰고, convert_pngs_to_narc가
+그 PNG들을 다시 읽어 디코딩한 뒤 임시 .bin 파일로 pack_narc를 호출했습니다.
+이 모듈은 같은 palette_engine 로직으로 팔레트를 메모리에서 통일하고,
+통일된 인덱스 평면에서 바로 RGCN/NCLR 엔트리를 만들어 NARC를 한 번만 기록합니다.
+중간 PNG는 디버그용으로만 선택적으로 저장합니다.
+
+입력 폴더 구조 (README 규격):
+    input/M/001/front.png, back.png, front_shiny.png, back_shiny.png
+    input/F/001/...   (암컷 전용 스프라이트가 있는 종만)
+    input/M/004/004.png   (256x64 시트: 앞모습/색다른 앞모습/뒷모습 순서의 64x64 타일)
+
+시트는 gen4_sprite_convert.split_sheet_indexed로 메모리에서 160x80 스프라이트로 분할하며,
+같은 슬롯에 160x80 추출본이 함께 있으면 추출본을 사용합니다.
+
+파일명에 'back'이 있으면 뒷모습, 없으면 앞모습이며 'shiny'가 있으면 색다른 버전입니다.
+(001MFront.png, 001MBackShiny.png 같은 기존 파일명도 그대로 인식합니다)
+
+사용법:
+    python pokegra_pipeline.py <input 디렉토리> <결과.narc> [--original pl_pokegra.narc]
+                               [--dp] [--debug-dir DIR] [--patch PATCH] [--jobs N]
+"""
+
+import os
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+SPRITE_SLOT_NAMES = ["female_back", "male_back", "female_front", "male_front"]
+
+# gen4_sprite_convert.SPRITE_SUFFIXES → (방향, 색다른 여부)
+SHEET_SPRITE_SLOTS = {'_Front.png': ('front', False), '_Shiny.png': ('front', True), '_Back.png': ('back', False)}
+
+
+class SpeciesSprites(NamedTuple):
+    """팔레트 통일이 끝난 한 종의 스프라이트"""
+    dex_number: int
+    planes: Dict[str, np.ndarray]   # 슬롯 이름 → (80, 160) 인덱스 평면
+    normal_palette: List[int]       # 16색 RGB (48개 값)
+    shiny_palette: Optional[List[int]]
+    verification: dict
+
+
+class SheetSprite(NamedTuple):
+    """256x64 시트에서 메모리로 분할한 스프라이트 하나"""
+    name: str                       # 표시용 이름 (001_Front.png 등)
+    image: object                   # 'P' 모드 160x80 PIL 이미지
+
+
+def scan_gender_dex_folders(input_dir: str) -> Dict[int, Dict[str, List[str]]]:
+    """README 규격의 폴더 구조 스캔 (input_scanner.scan_input_tree 사용)
+
+    Args:
+        input_dir: M/, F/ 폴더가 있는 입력 디렉토리
+
+    Returns:
+        Dict[int, Dict[str, List[str]]]: {1: {'M': [파일들], 'F': [파일들]}}
+    """
+    from input_scanner import scan_input_tree
+
+    return {dex_number: plan.gender_files() for dex_number, plan in scan_input_tree(input_dir).items()}
+
+
+def _collect_slot_files(gender_files: Dict[str, List[str]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """성별별 파일 목록 → 슬롯별 일반/색다른 파일 경로"""
+    from input_scanner import classify_sprite_name
+
+    normal_files = {}
+    shiny_files = {}
+
+    for gender, files in gender_files.items():
+        for file_path in files:
+            slot_name, is_shiny = classify_sprite_name(os.path.basename(file_path), gender)
+            target = shiny_files if is_shiny else normal_files
+            if slot_name in target:
+                print(f"  경고: {slot_name} 슬롯 파일 중복, 무시: {os.path.basename(file_path)}")
+                continue
+            target[slot_name] = file_path
+
+    return normal_files, shiny_files
+
+
+def _collect_sheet_sprites(sheet_files: Dict[str, List[str]], normal_files: Dict[str, object],
+                           shiny_files: Dict[str, object]) -> None:
+    """256x64 시트를 메모리에서 분할하여 비어 있는 슬롯에 인덱스 이미지로 추가
+
+    시트 한 장은 앞모습/색다른 앞모습/뒷모습 스프라이트가 되며 (gen4_sprite_convert 규칙),
+    같은 슬롯에 160x80 추출본이 이미 있으면 추출본을 사용합니다.
+    슬롯 값은 파일 경로(str) 또는 SheetSprite입니다.
+    """
+    from input_scanner import GENDER_FOLDERS
+    from png_editor.gen4_sprite_convert import split_sheet_indexed
+
+    for gender, files in sheet_files.items():
+        for sheet_path in files:
+            base_name = os.path.splitext(os.path.basename(sheet_path))[0]
+            for suffix, image in split_sheet_indexed(sheet_path).items():
+                direction, is_shiny = SHEET_SPRITE_SLOTS[suffix]
+                slot_name = f"{GENDER_FOLDERS[gender]}_{direction}"
+
+                target = shiny_files if is_shiny else normal_files
+                if slot_name in target:
+                    print(f"  경고: {slot_name} 슬롯 파일 중복, 시트 스프라이트 무시: {base_name}{suffix}")
+                    continue
+                target[slot_name] = SheetSprite(f"{base_name}{suffix}", image)
+
+
+def _source_name(source) -> str:
+    """파일 경로 또는 시트에서 분할한 이미지의 표시용 이름"""
+    return os.path.basename(source) if isinstance(source, str) else source.name
+
+
+def _preprocess_source(slot_name: str, source, is_diamond_pearl: bool = False):
+    """파일 경로는 캐시된 전처리, 시트에서 분할한 이미지는 메모리 전처리"""
+    if isinstance(source, str):
+        from preprocess_cache import preprocess_for_pokemon_cached
+        return preprocess_for_pokemon_cached(source, is_diamond_pearl)
+
+    from indexed_bitmap_handler import IndexedBitmapHandler, sprite_number_from_filename
+    return IndexedBitmapHandler().preprocess_image_for_pokemon_format(
+        source.image, source.name, sprite_number=sprite_number_from_filename(slot_name),
+        is_diamond_pearl=is_diamond_pearl)
+
+
+def _select_reference_slot(normal_files: Dict[str, object]) -> Optional[str]:
+    """빠른 팔레트 분석으로 기준 슬롯 선택 (find_optimal_reference와 같은 점수)"""
+    from palette_engine import extract_palette_from_image, extract_palette_from_original_image, select_optimal_reference
+
+    if len(normal_files) == 1:
+        return next(iter(normal_files))
+
+    print("  원본 이미지들의 빠른 팔레트 분석으로 기준 이미지 선택 중...")
+
+    image_palettes = {}
+    for slot_name, source in normal_files.items():
+        if isinstance(source, str):
+            palette_colors, _ = extract_palette_from_original_image(source)
+        else:
+            print(f"    빠른 팔레트 분석: {source.name}")
+            palette_colors, _ = extract_palette_from_image(source.image)
+
+        if palette_colors:
+            image_palettes[slot_name] = palette_colors
+        else:
+            print(f"      팔레트 추출 실패: {_source_name(source)}")
+
+    selected = select_optimal_reference(image_palettes)
+    if selected is None:
+        return None
+
+    slot_name, score = selected
+    print(f"    ✅ 선택된 기준 이미지: {_source_name(normal_files[slot_name])} (호환성 점수: {score:.1f})")
+    return slot_name
+
+
+def _flat_palette(image) -> List[int]:
+    """팔레트 이미지의 앞 16색 (48개 값, 부족하면 0으로 채움)"""
+    palette = (image.getpalette() or [])[:48]
+    return palette + [0] * (48 - len(palette))
+
+
+def unify_species(dex_number: int, gender_files: Dict[str, List[str]],
+                  is_diamond_pearl: bool = False,
+                  sheet_files: Optional[Dict[str, List[str]]] = None) -> Optional[SpeciesSprites]:
+    """한 종의 모든 스프라이트를 하나의 노말/색다른 팔레트로 통일 (메모리에서만 처리)
+
+    pl_pokegra는 종마다 노말/색다른 팔레트가 하나씩이므로, 암수 구분 없이
+    모든 일반 스프라이트를 기준 이미지 팔레트에 맞추고, 색다른 팔레트는
+    대응하는 일반 스프라이트와의 색상 매핑으로 만듭니다.
+
+    Args:
+        dex_number: 도감번호
+        gender_files: {'M': [파일들], 'F': [파일들]} (160x80 추출본 등 개별 스프라이트)
+        is_diamond_pearl: DP 포맷 여부
+        sheet_files: {'M': [256x64 시트들], 'F': [...]} (메모리에서 분할하여 사용)
+
+    Returns:
+        SpeciesSprites 또는 None (일반 스프라이트가 없거나 전처리 실패)
+    """
+    from palette_engine import (
+        apply_color_mapping_to_processed_image,
+        extract_color_mapping_between_processed_images,
+        extract_palette_from_processed_image,
+        palette_match_processed_to_reference,
+        verify_sprite_stack,
+    )
+
+    sheet_files = sheet_files or {}
+
+    print(f"\n{'=' * 70}")
+    print(f"도감번호 {dex_number:03d} 처리 중 ({', '.join(sorted(set(gender_files) | set(sheet_files)))})")
+    print(f"{'=' * 70}")
+
+    # 슬롯별 입력: 파일 경로 또는 시트에서 분할한 인덱스 이미지
+    normal_files, shiny_files = _collect_slot_files(gender_files)
+    _collect_sheet_sprites(sheet_files, normal_files, shiny_files)
+    if not normal_files:
+        print("  일반 스프라이트가 없습니다.")
+        return None
+
+    # 1단계: 기준 이미지 선택
+    reference_slot = _select_reference_slot(normal_files)
+    if not reference_slot:
+        print("  기준 이미지를 선택할 수 없습니다.")
+        return None
+
+    # 2단계: 기준 이미지 전처리
+    print(f"  기준 이미지를 포켓몬 포맷으로 전처리 중: {_source_name(normal_files[reference_slot])}")
+    try:
+        reference_image = _preprocess_source(reference_slot, normal_files[reference_slot], is_diamond_pearl)
+        reference_palette, _ = extract_palette_from_processed_image(reference_image)
+    except Exception as e:
+        print(f"    전처리 실패: {e}")
+        reference_palette = None
+
+    if not reference_palette:
+        print("  기준 이미지 전처리에 실패했습니다.")
+        return None
+    print(f"    ✅ 기준 이미지 전처리 완료: {len(reference_palette)}색")
+
+    # 3단계: 나머지 일반 스프라이트를 기준 팔레트에 맞춤
+    print(f"  다른 이미지들을 기준 팔레트에 맞춰 변환 중...")
+    images = {reference_slot: reference_image}
+    for slot_name, source in normal_files.items():
+        if slot_name == reference_slot:
+            continue
+
+        print(f"    변환 중: {_source_name(source)}")
+        try:
+            matched_image = palette_match_processed_to_reference(
+                reference_palette, _preprocess_source(slot_name, source, is_diamond_pearl))
+        except Exception as e:
+            print(f"      변환 실패: {e}")
+            continue
+
+        if matched_image:
+            print(f"      ✅ 변환 완료")
+            images[slot_name] = matched_image
+        else:
+            print(f"      ❌ 변환 실패")
+
+    # 4단계: 색다른 팔레트 (대응하는 일반 스프라이트와의 색상 매핑, 첫 성공 사용)
+    shiny_images = {}
+    for slot_name, shiny_source in sorted(shiny_files.items()):
+        if slot_name not in images:
+            print(f"  ⚠️ 대응하는 일반 스프라이트 없음: {_source_name(shiny_source)}")
+            continue
+
+        shiny_processed = _preprocess_source(slot_name, shiny_source, is_diamond_pearl)
+        if not shiny_processed:
+            continue
+
+        color_mapping = extract_color_mapping_between_processed_images(images[slot_name], shiny_processed)
+        if color_mapping:
+            shiny_image = apply_color_mapping_to_processed_image(images[slot_name], color_mapping)
+            if shiny_image:
+                shiny_images[f"{slot_name}_shiny"] = shiny_image
+                break
+
+    # 5단계: 검증 (모두 160x80 팔레트 이미지여야 pl_pokegra에 넣을 수 있음)
+    all_images = {**{f"{slot_name}_normal": image for slot_name, image in images.items()}, **shiny_images}
+    wrong_format = [name for name, image in all_images.items() if image.mode != 'P' or image.size != (160, 80)]
+    if wrong_format:
+        raise ValueError(f"160x80 팔레트 이미지가 아닙니다: {', '.join(wrong_format)}")
+
+    verification = verify_sprite_stack(
+        np.stack([np.asarray(image, dtype=np.uint8) for image in all_images.values()]),
+        np.array([_flat_palette(image) for image in all_images.values()], dtype=np.uint8).reshape(-1, 16, 3),
+        reference_palette, list(all_images))
+
+    planes = {slot_name: np.asarray(image, dtype=np.uint8) & 0x0F for slot_name, image in images.items()}
+    shiny_palette = _flat_palette(next(iter(shiny_images.values()))) if shiny_images else None
+
+    return SpeciesSprites(dex_number, planes, _flat_palette(reference_image), shiny_palette, verification)
+
+
+def save_debug_pngs(species: SpeciesSprites, debug_dir: str) -> None:
+    """통일된 스프라이트를 convert_pngs_to_narc 입력과 같은 구조의 PNG로 저장 (디버그용)
+
+    debug_dir/pokemon_XXX/{슬롯}_normal.png, {슬롯}_shiny.png
+    """
+    from PIL import Image
+    from png_chunks import PngTemplateCache, save_indexed_png
+
+    pokemon_folder = os.path.join(debug_dir, f"pokemon_{species.dex_number:03d}")
+    os.makedirs(pokemon_folder, exist_ok=True)
+
+    cache = PngTemplateCache()
+    variants = [('normal', species.normal_palette)]
+    if species.shiny_palette:
+        variants.append(('shiny', species.shiny_palette))
+
+    for slot_name, plane in species.planes.items():
+        image = Image.frombytes('P', (160, 80), plane.tobytes())
+        for variant, palette in variants:
+            image.putpalette(palette + [0] * (768 - len(palette)))
+            save_indexed_png(image, os.path.join(pokemon_folder, f"{slot_name}_{variant}.png"), cache)
+
+
+def build_pokegra_entries(species_list: List[SpeciesSprites], original_narc: Optional[str] = None,
+                          is_diamond_pearl: bool = False) -> List[bytes]:
+    """통일된 종 데이터로 pl_pokegra.narc 엔트리 리스트 생성
+
+    원본 NARC가 있으면 입력에 없는 종의 엔트리는 그대로 복사하고,
+    원본에서 비어 있던 슬롯/팔레트는 원본 구조를 유지합니다 (convert_pngs_to_narc와 동일).
+    모든 스프라이트는 마지막에 한 번의 배치 인코딩으로 암호화합니다.
+
+    Args:
+        species_list: unify_species 결과들
+        original_narc: 원본 pl_pokegra.narc 경로 (선택사항)
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        List[bytes]: 파일 번호 순서의 엔트리 데이터
+    """
+    from pokemon_sprite_converter import PokemonSpriteConverter, analyze_pokegra_structure, encode_sprite_planes
+
+    converter = PokemonSpriteConverter(is_diamond_pearl)
+
+    reader = None
+    original_structure = {}
+    if original_narc:
+        from narc_reader import NarcReader
+
+        reader = NarcReader(original_narc)
+        original_structure = analyze_pokegra_structure(reader)
+
+    entries_count = max([len(reader) if reader else 0] +
+                        [(species.dex_number + 1) * 6 for species in species_list])
+    entries: List[Optional[bytes]] = [None] * entries_count
+    if reader:
+        for file_id in range(len(reader)):
+            entries[file_id] = reader.extract_file(file_id)
+
+    sprite_ids = []
+    sprite_planes = []
+    for species in species_list:
+        base_index = species.dex_number * 6
+        structure_info = original_structure.get(species.dex_number)
+
+        for slot_index, slot_name in enumerate(SPRITE_SLOT_NAMES):
+            if structure_info and not structure_info['sprite_slots'][slot_index]:
+                if slot_name in species.planes:
+                    print(f"포켓몬 #{species.dex_number:03d}: {slot_name} 슬롯은 원본에 없음 (빈 데이터 유지)")
+                entries[base_index + slot_index] = b'\x00' * 48
+            elif slot_name in species.planes:
+                sprite_ids.append(base_index + slot_index)
+                sprite_planes.append(species.planes[slot_name])
+            else:
+                entries[base_index + slot_index] = b'\x00' * (6448 if structure_info else 48)
+
+        normal_data = converter._palette_to_data(species.normal_palette)
+        if species.shiny_palette:
+            shiny_data = converter._palette_to_data(species.shiny_palette)
+        else:
+            print(f"포켓몬 #{species.dex_number:03d}: 색다른 팔레트 (노말 팔레트 복사)")
+            shiny_data = normal_data
+
+        keep_normal = not structure_info or structure_info['has_normal_palette']
+        keep_shiny = not structure_info or structure_info['has_shiny_palette']
+        entries[base_index + 4] = normal_data if keep_normal else b'\x00' * 40
+        entries[base_index + 5] = shiny_data if keep_shiny else b'\x00' * 40
+
+    if sprite_planes:
+        for file_id, sprite_data in zip(sprite_ids, encode_sprite_planes(np.stack(sprite_planes), is_diamond_pearl)):
+            entries[file_id] = sprite_data
+
+    # 원본도 입력도 없는 종 (도감번호 공백)
+    return [entry if entry is not None else b'\x00' * (48 if file_id % 6 < 4 else 72)
+            for file_id, entry in enumerate(entries)]
+
+
+def run_pipeline(input_dir: str, output_narc: str, original_narc: Optional[str] = None,
+                 is_diamond_pearl: bool = False, debug_dir: Optional[str] = None,
+                 patch_output: Optional[str] = None, jobs: int = 1) -> dict:
+    """input/<M|F>/<도감번호>/ → pl_pokegra.narc 전체 파이프라인
+
+    Args:
+        input_dir: README 규격 입력 디렉토리
+        output_narc: 생성할 NARC 경로 (patch_output을 지정하면 사용하지 않음)
+        original_narc: 원본 pl_pokegra.narc (구조 참조 및 입력에 없는 종 복사)
+        is_diamond_pearl: DP 포맷 여부
+        debug_dir: 지정하면 통일된 스프라이트 PNG를 저장
+        patch_output: 지정하면 전체 NARC 대신 원본 대비 패치 생성 (original_narc 필요)
+        jobs: 종별 병렬 처리 프로세스 수
+
+    Returns:
+        dict: {'species': 입력 종 수, 'succeeded': 성공 수, 'failed': [도감번호], 'verification': {도감번호: 결과}}
+    """
+    from narc_reader import write_narc
+
+    if patch_output and not original_narc:
+        raise ValueError("patch_output requires original_narc")
+    if original_narc and not os.path.exists(original_narc):
+        raise FileNotFoundError(f"NARC file not found: {original_narc}")
+
+    from input_scanner import scan_input_tree
+
+    plans = scan_input_tree(input_dir)
+    print(f"입력 스캔 완료: {len(plans)}종 ({input_dir})")
+
+    group_args = [(dex_number, plan.gender_files(), is_diamond_pearl, plan.gender_files(kinds=('sheet',)))
+                  for dex_number, plan in plans.items()]
+
+    species_list = []
+    failed = []
+
+    def record(dex_number, species, error):
+        if error is not None:
+            print(f"\n❌ 도감번호 {dex_number:03d} 처리 실패: {error}")
+            failed.append(dex_number)
+        elif species is None:
+            failed.append(dex_number)
+        else:
+            species_list.append(species)
+            if debug_dir:
+                save_debug_pngs(species, debug_dir)
+
+    if jobs > 1:
+        from group_pool import run_groups_in_pool
+
+        for outcome in run_groups_in_pool(unify_species, group_args, jobs):
+            print(outcome.log, end="")
+            record(outcome.group_number, outcome.result, outcome.error)
+    else:
+        for args in group_args:
+            try:
+                record(args[0], unify_species(*args), None)
+            except Exception as e:
+                record(args[0], None, str(e))
+
+    entries = build_pokegra_entries(species_list, original_narc, is_diamond_pearl)
+
+    if patch_output:
+        from narc_patch import create_narc_patch
+        create_narc_patch(original_narc, entries, patch_output)
+    else:
+        write_narc(entries, output_narc)
+        print(f"NARC 파일 생성 완료: {output_narc}")
+
+    return {
+        'species': len(plans),
+        'succeeded': len(species_list),
+        'failed': failed,
+        'verification': {species.dex_number: species.verification for species in species_list},
+    }
+
+
+def main(argv=None):
+    """명령줄 실행: python pokegra_pipeline.py <input> <결과.narc> [--original pl_pokegra.narc]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="input/<M|F>/<도감번호>/ PNG → pl_pokegra.narc")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_narc")
+    parser.add_argument("--original", help="원본 pl_pokegra.narc (구조 참조 및 입력에 없는 종 복사)")
+    parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    parser.add_argument("--debug-dir", help="통일된 스프라이트 PNG 저장 디렉토리")
+    parser.add_argument("--patch", help="전체 NARC 대신 원본 대비 패치 파일 생성 (--original 필요)")
+    parser.add_argument("--jobs", type=int, default=1, help="종별 병렬 처리 프로세스 수")
+    parser.add_argument("--cache-dir", default=None, help="전처리 캐시 디렉토리 (기본: .preprocess_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="전처리 캐시 사용 안 함")
+    args = parser.parse_args(argv)
+
+    if args.no_cache or args.cache_dir:
+        from preprocess_cache import configure_default_cache
+        configure_default_cache(None if args.no_cache else args.cache_dir)
+
+    result = run_pipeline(args.input_dir, args.output_narc, args.original, args.dp,
+                          args.debug_dir, args.patch, args.jobs)
+
+    print(f"\n처리된 종: {result['succeeded']}/{result['species']}")
+    if result['failed']:
+        print(f"실패한 도감번호: {', '.join(f'{dex:03d}' for dex in result['failed'])}")
+    return 0 if not result['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
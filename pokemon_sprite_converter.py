@@ -1,3 +1,4 @@
+import io
 import struct
 import os
 from PIL import Image, ImagePalette
@@ -6,15 +7,36 @@ from typing import List, Tuple, Optional
 from pathlib import Path
 
 
+# RGCN 스프라이트 헤더 (48 bytes, 160x80 4bpp)
+SPRITE_HEADER = bytes([
+    82, 71, 67, 78, 255, 254, 0, 1, 48, 25, 0, 0, 16, 0, 1, 0,
+    82, 65, 72, 67, 32, 25, 0, 0, 10, 0, 20, 0, 3, 0, 0, 0,
+    0, 0, 0, 0, 1, 0, 0, 0, 0, 25, 0, 0, 24, 0, 0, 0
+])
+
+# 바이트의 상/하위 니블 교환표 (RGCN은 하위 니블이 왼쪽 픽셀, PNG 4bpp는 상위 니블이 왼쪽 픽셀)
+NIBBLE_SWAP = bytes(((value & 0x0F) << 4) | (value >> 4) for value in range(256))
+
+
 class PokemonSpriteConverter:
     """포켓몬 4세대 스프라이트 ↔ PNG 변환기"""
 
-    def __init__(self, is_diamond_pearl: bool = False):
+    def __init__(self, is_diamond_pearl: bool = False, png_bits: int = 8, compression: str = 'default'):
         """
         Args:
             is_diamond_pearl: True면 DP 포맷, False면 Platinum 포맷
+            png_bits: 출력 PNG의 픽셀당 비트 수 (8: 256색 팔레트, 4: 16색 팔레트 + 니블 패킹)
+            compression: PNG 압축 프로파일 ('fast', 'default', 'max')
         """
+        from png_chunks import compression_level
+
+        if png_bits not in (4, 8):
+            raise ValueError(f"Unsupported PNG bit depth: {png_bits} (expected 4 or 8)")
+
         self.is_diamond_pearl = is_diamond_pearl
+        self.png_bits = png_bits
+        self.compression = compression
+        self.compression_level = compression_level(compression)
 
     def pokemon_to_png(self, sprite_data: bytes, palette_data: bytes, output_path: str) -> None:
         """포켓몬 스프라이트 데이터를 PNG로 변환
@@ -27,16 +49,80 @@ class PokemonSpriteConverter:
         # 팔레트 파싱
         palette = self._parse_palette(palette_data)
 
-        # 스프라이트 이미지 생성
-        image = self._parse_sprite(sprite_data)
+        self.sprite_to_png(sprite_data, palette, output_path)
 
-        # 팔레트 적용
-        image.putpalette(palette)
+    def sprite_to_png(self, sprite_data: bytes, palette: List[int], output_path: str) -> None:
+        """이미 파싱된 RGB 팔레트로 포켓몬 스프라이트 데이터를 PNG로 변환
 
+        Args:
+            sprite_data: 포켓몬 스프라이트 바이너리 데이터 (6448 bytes)
+            palette: _parse_palette() 결과 (768개 RGB 값)
+            output_path: 저장할 PNG 파일 경로
+        """
         # PNG로 저장
-        image.save(output_path, "PNG")
+        with open(output_path, 'wb') as f:
+            f.write(self._encode_png(sprite_data, palette))
         print(f"PNG 저장 완료: {output_path}")
 
+    def sprite_to_pngs(self, sprite_data: bytes, outputs: List[Tuple[List[int], str]]) -> None:
+        """스프라이트를 한 번만 복호화하여 여러 팔레트 버전의 PNG로 저장
+
+        노말/색다른 버전은 픽셀 데이터가 같고 팔레트만 다르므로,
+        인덱스 평면은 한 번만 만들어 한 번만 압축하고, 나머지 버전은
+        압축된 IDAT를 재사용하여 PLTE 청크만 바꿔 씁니다.
+
+        Args:
+            sprite_data: 포켓몬 스프라이트 바이너리 데이터 (6448 bytes)
+            outputs: [(_parse_palette() 결과, 저장할 PNG 파일 경로), ...]
+        """
+        if not outputs:
+            return
+
+        from png_chunks import IndexedPngTemplate
+
+        template = IndexedPngTemplate(self._encode_png(sprite_data, outputs[0][0]))
+
+        for palette, output_path in outputs:
+            template.save(palette, output_path)
+            print(f"PNG 저장 완료: {output_path}")
+
+    def pokemon_to_png_bytes(self, sprite_data: bytes, palette_data: bytes) -> bytes:
+        """포켓몬 스프라이트 데이터를 PNG 바이트로 변환 (디스크에 저장하지 않음)
+
+        Args:
+            sprite_data: 포켓몬 스프라이트 바이너리 데이터 (6448 bytes)
+            palette_data: 팔레트 바이너리 데이터 (72 bytes)
+
+        Returns:
+            bytes: PNG 파일 데이터
+        """
+        return self._encode_png(sprite_data, self._parse_palette(palette_data))
+
+    def _encode_png(self, sprite_data: bytes, palette: List[int]) -> bytes:
+        """스프라이트와 파싱된 팔레트로 PNG 바이트 생성 (png_bits 모드에 따라)"""
+        if self.png_bits == 4:
+            from png_chunks import encode_indexed_png
+            return encode_indexed_png(self._sprite_rows_4bpp(sprite_data), 160, 80, 4, palette,
+                                      self.compression_level)
+
+        image = self._parse_sprite(sprite_data)
+        image.putpalette(palette)
+
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", compress_level=self.compression_level)
+        return buffer.getvalue()
+
+    def _sprite_rows_4bpp(self, sprite_data: bytes) -> bytes:
+        """복호화된 워드를 니블 확장 없이 PNG 4bpp 스캔라인으로 변환
+
+        워드 하나(리틀 엔디언 2바이트)에 픽셀 4개가 p0 | p1<<4 | p2<<8 | p3<<12로
+        들어 있으므로, 바이트별로 니블만 교환하면 PNG 4bpp 바이트 순서가 됩니다.
+        """
+        packed = self._decrypt_sprite(sprite_data).astype('<u2').tobytes().translate(NIBBLE_SWAP)
+
+        # 160픽셀 = 80바이트 행마다 필터 타입 0 바이트 추가
+        return b''.join(b'\x00' + packed[row:row + 80] for row in range(0, 6400, 80))
+
     def png_to_pokemon(self, png_path: str) -> Tuple[bytes, bytes]:
         """PNG를 포켓몬 스프라이트 데이터로 변환
 
@@ -57,47 +143,22 @@ class PokemonSpriteConverter:
 
         return sprite_data, palette_data
 
+    def _decrypt_sprite(self, sprite_data: bytes) -> np.ndarray:
+        """포켓몬 스프라이트 바이너리를 복호화하여 16비트 워드 3200개로 변환"""
+        if len(sprite_data) != 6448:
+            raise ValueError(f"Invalid sprite data size: {len(sprite_data)} (expected 6448)")
+
+        return decrypt_sprite_words([sprite_data], self.is_diamond_pearl)[0]
+
     def _parse_sprite(self, sprite_data: bytes) -> Image.Image:
         """포켓몬 스프라이트 바이너리를 Image로 변환"""
         if len(sprite_data) != 6448:
             raise ValueError(f"Invalid sprite data size: {len(sprite_data)} (expected 6448)")
 
-        # 48바이트 헤더 건너뛰기
-        pixel_data = sprite_data[48:]
-
-        # 16비트 값들을 읽기 (3200개 = 6400바이트)
-        pixel_array = []
-        for i in range(0, 6400, 2):
-            value = struct.unpack('<H', pixel_data[i:i + 2])[0]
-            pixel_array.append(value)
-
-        # 암호화 해제
-        seed = pixel_array[0]
-        if not self.is_diamond_pearl:
-            # Platinum 복호화
-            for j in range(3200):
-                pixel_array[j] ^= (seed & 0xFFFF)
-                seed = (seed * 1103515245 + 24691) & 0xFFFFFFFF
-        else:
-            # Diamond/Pearl 복호화
-            seed = pixel_array[3199]
-            for j in range(3199, -1, -1):
-                pixel_array[j] ^= (seed & 0xFFFF)
-                seed = (seed * 1103515245 + 24691) & 0xFFFFFFFF
-
         # 4비트 픽셀로 변환 (160x80 = 12800 픽셀)
-        pixels = []
-        for value in pixel_array:
-            pixels.append(value & 0xF)
-            pixels.append((value >> 4) & 0xF)
-            pixels.append((value >> 8) & 0xF)
-            pixels.append((value >> 12) & 0xF)
-
-        # 이미지 생성
-        image = Image.new('P', (160, 80))
-        image.putdata(pixels)
+        plane = decode_sprite_planes([sprite_data], self.is_diamond_pearl)[0]
 
-        return image
+        return Image.frombytes('P', (160, 80), plane.tobytes())
 
     def _parse_palette(self, palette_data: bytes) -> List[int]:
         """팔레트 바이너리를 RGB 팔레트로 변환"""
@@ -175,46 +236,10 @@ class PokemonSpriteConverter:
     def _create_sprite_data(self, image: Image.Image) -> bytes:
         """Image를 포켓몬 스프라이트 바이너리로 변환"""
         # 픽셀 데이터 추출
-        pixels = list(image.getdata())
-
-        # 4픽셀을 하나의 16비트 값으로 패킹
-        pixel_array = []
-        for i in range(0, len(pixels), 4):
-            value = (pixels[i] & 0xF) | \
-                    ((pixels[i + 1] & 0xF) << 4) | \
-                    ((pixels[i + 2] & 0xF) << 8) | \
-                    ((pixels[i + 3] & 0xF) << 12)
-            pixel_array.append(value)
-
-        # 암호화
-        seed = 0
-        if not self.is_diamond_pearl:
-            # Platinum 암호화
-            for j in range(3200):
-                pixel_array[j] ^= (seed & 0xFFFF)
-                seed = (seed * 1103515245 + 24691) & 0xFFFFFFFF
-        else:
-            # Diamond/Pearl 암호화
-            seed = 31315
-            for value in pixel_array:
-                seed += value
-            seed &= 0xFFFFFFFF
+        pixels = np.asarray(image, dtype=np.uint8).reshape(1, 80, 160)
 
-            for j in range(3199, -1, -1):
-                pixel_array[j] ^= (seed & 0xFFFF)
-                seed = (seed * 1103515245 + 24691) & 0xFFFFFFFF
-
-        # 헤더 생성
-        header = bytes([
-            82, 71, 67, 78, 255, 254, 0, 1, 48, 25, 0, 0, 16, 0, 1, 0,
-            82, 65, 72, 67, 32, 25, 0, 0, 10, 0, 20, 0, 3, 0, 0, 0,
-            0, 0, 0, 0, 1, 0, 0, 0, 0, 25, 0, 0, 24, 0, 0, 0
-        ])
-
-        # 픽셀 데이터를 바이너리로 변환
-        pixel_bytes = b''.join(struct.pack('<H', value) for value in pixel_array)
-
-        return header + pixel_bytes
+        # 4픽셀을 하나의 16비트 값으로 패킹하고 암호화
+        return encode_sprite_planes(pixels, self.is_diamond_pearl)[0]
 
     def _create_palette_data(self, image: Image.Image) -> bytes:
         """Image 팔레트를 포켓몬 팔레트 바이너리로 변환"""
@@ -226,6 +251,10 @@ class PokemonSpriteConverter:
                 gray = i * 17  # 0-255 범위로 확장
                 palette.extend([gray, gray, gray])
 
+        return self._palette_to_data(palette)
+
+    def _palette_to_data(self, palette: List[int]) -> bytes:
+        """평탄화된 RGB 팔레트를 포켓몬 팔레트 바이너리로 변환 (앞 16색만 사용)"""
         # 헤더 생성
         header = bytes([
             82, 76, 67, 78, 255, 254, 0, 1, 72, 0, 0, 0, 16, 0, 1, 0,
@@ -273,18 +302,264 @@ class PokemonSpriteConverter:
         return new_image
 
 
-def convert_narc_to_pngs(narc_file: str, output_dir: str, is_diamond_pearl: bool = False) -> None:
+class SpeciesPalettes:
+    """종 단위 팔레트 디코딩 컨텍스트
+
+    노말/색다른 팔레트를 한 번만 읽고 파싱하여 같은 종(또는 팔레트를 공유하는 폼)의
+    모든 스프라이트에 재사용합니다.
+    """
+
+    def __init__(self, converter: PokemonSpriteConverter, normal_data: Optional[bytes] = None,
+                 shiny_data: Optional[bytes] = None):
+        """
+        Args:
+            converter: 팔레트 파싱에 사용할 변환기
+            normal_data: 노말 팔레트 바이너리 (72 bytes, 없으면 None)
+            shiny_data: 색다른 팔레트 바이너리 (72 bytes, 없으면 None)
+        """
+        self.normal_data = normal_data
+        self.shiny_data = shiny_data
+        self.normal = converter._parse_palette(normal_data) if normal_data else None
+        self.shiny = converter._parse_palette(shiny_data) if shiny_data else None
+
+    @classmethod
+    def from_reader(cls, converter: PokemonSpriteConverter, reader, normal_id: int,
+                    shiny_id: Optional[int] = None) -> "SpeciesPalettes":
+        """NARC에서 팔레트 엔트리를 읽어 컨텍스트 생성 (범위 밖이거나 72바이트가 아니면 없음으로 처리)"""
+
+        def read_palette(file_id):
+            if file_id is None or file_id >= len(reader.file_entries):
+                return None
+            if reader.file_entries[file_id].size != 72:
+                return None
+            return reader.extract_file(file_id)
+
+        return cls(converter, read_palette(normal_id), read_palette(shiny_id))
+
+    def variants(self) -> List[Tuple[str, List[int]]]:
+        """존재하는 팔레트들을 [('normal', palette), ('shiny', palette)] 형태로 반환"""
+        result = []
+        if self.normal is not None:
+            result.append(('normal', self.normal))
+        if self.shiny is not None:
+            result.append(('shiny', self.shiny))
+        return result
+
+
+# 스프라이트 암호화 LCG (state' = state * a + c mod 2^32, 키 = state 하위 16비트)
+LCG_MULTIPLIER = 1103515245
+LCG_INCREMENT = 24691
+
+_lcg_tables = {}
+
+
+def lcg_jump_tables(length: int = 3200) -> Tuple[np.ndarray, np.ndarray]:
+    """j단계 뒤 상태를 state_j = A[j] * seed + C[j] (mod 2^32)로 구하는 계수표
+
+    state_{j+b} = A_b * state_j + C_b 이므로, 길이 b인 표로부터 길이 2b인 표를
+    한 번의 배열 연산으로 만들 수 있어 O(log n)번의 벡터 연산으로 완성됩니다.
+
+    Returns:
+        (A, C): 각각 (length,) uint32 배열
+    """
+    tables = _lcg_tables.get(length)
+    if tables is not None:
+        return tables
+
+    multipliers = np.ones(1, dtype=np.uint32)
+    increments = np.zeros(1, dtype=np.uint32)
+    while len(multipliers) < length:
+        # b단계 점프 계수: state_b = a * state_{b-1} + c
+        jump_multiplier = np.uint32(int(multipliers[-1]) * LCG_MULTIPLIER & 0xFFFFFFFF)
+        jump_increment = np.uint32((int(increments[-1]) * LCG_MULTIPLIER + LCG_INCREMENT) & 0xFFFFFFFF)
+
+        multipliers = np.concatenate([multipliers, multipliers * jump_multiplier])
+        increments = np.concatenate([increments, increments * jump_multiplier + jump_increment])
+
+    tables = (multipliers[:length].copy(), increments[:length].copy())
+    _lcg_tables[length] = tables
+    return tables
+
+
+def lcg_keystreams(seeds: np.ndarray, length: int = 3200) -> np.ndarray:
+    """시드마다 length개의 키(상태 하위 16비트)를 한 번에 생성
+
+    Args:
+        seeds: (N,) 시드 배열
+        length: 키 스트림 길이
+
+    Returns:
+        np.ndarray: (N, length) uint32 키 스트림 (keystream[:, j]는 j단계 상태의 하위 16비트)
+    """
+    multipliers, increments = lcg_jump_tables(length)
+    seeds = np.asarray(seeds, dtype=np.uint32).reshape(-1, 1)
+    return (seeds * multipliers + increments) & np.uint32(0xFFFF)
+
+
+def decrypt_sprite_words(sprite_blobs: List[bytes], is_diamond_pearl: bool = False) -> np.ndarray:
+    """여러 스프라이트를 한 번에 복호화하여 16비트 워드 배열로 변환
+
+    키 스트림은 점프 계수표(lcg_jump_tables)로 시드마다 한 번의 배열 연산으로 만들므로,
+    시드가 스프라이트마다 다른 DP도 Platinum과 같은 비용으로 처리됩니다.
+
+    Args:
+        sprite_blobs: 스프라이트 바이너리 리스트 (각 6448 bytes)
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        np.ndarray: (N, 3200) uint32 복호화된 워드 (하위 16비트만 사용, 워드당 픽셀 4개)
+    """
+    for i, sprite_data in enumerate(sprite_blobs):
+        if len(sprite_data) != 6448:
+            raise ValueError(f"Invalid sprite data size at {i}: {len(sprite_data)} (expected 6448)")
+
+    count = len(sprite_blobs)
+    if count == 0:
+        return np.zeros((0, 3200), dtype=np.uint32)
+
+    words = np.frombuffer(b''.join(bytes(sprite_data[48:]) for sprite_data in sprite_blobs),
+                          dtype='<u2').reshape(count, 3200).astype(np.uint32)
+
+    if not is_diamond_pearl:
+        # Platinum 복호화 (첫 워드가 시드, 앞에서부터)
+        words ^= lcg_keystreams(words[:, 0])
+    else:
+        # Diamond/Pearl 복호화 (마지막 워드가 시드, 뒤에서부터)
+        words ^= lcg_keystreams(words[:, 3199])[:, ::-1]
+
+    return words
+
+
+def decode_sprite_planes(sprite_blobs: List[bytes], is_diamond_pearl: bool = False,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+    """여러 스프라이트를 한 번에 복호화하여 인덱스 평면 배열로 변환
+
+    Args:
+        sprite_blobs: 스프라이트 바이너리 리스트 (각 6448 bytes)
+        is_diamond_pearl: DP 포맷 여부
+        out: 결과를 직접 기록할 (N, 80, 160) uint8 배열 (공유 메모리 등, None이면 새로 할당)
+
+    Returns:
+        np.ndarray: (N, 80, 160) uint8 인덱스 평면 (값 0-15)
+    """
+    words = decrypt_sprite_words(sprite_blobs, is_diamond_pearl)
+    count = words.shape[0]
+
+    if out is None:
+        out = np.empty((count, 80, 160), dtype=np.uint8)
+    elif out.shape != (count, 80, 160) or out.dtype != np.uint8 or not out.flags.c_contiguous:
+        raise ValueError(f"Invalid output array: {out.shape} {out.dtype} (expected ({count}, 80, 160) uint8)")
+
+    # 워드 하나에 픽셀 4개 (하위 니블부터)
+    pixels = out.reshape(count, 3200, 4)
+    for k in range(4):
+        pixels[:, :, k] = (words >> (4 * k)) & 0xF
+
+    return out
+
+
+def encode_sprite_planes(planes: np.ndarray, is_diamond_pearl: bool = False) -> List[bytes]:
+    """여러 인덱스 평면을 한 번에 암호화하여 스프라이트 바이너리로 변환
+
+    _create_sprite_data()와 같은 결과를 내며, 픽셀 값은 하위 4비트만 사용합니다.
+
+    Args:
+        planes: (N, 80, 160) 인덱스 평면 배열
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        List[bytes]: 스프라이트 바이너리 리스트 (각 6448 bytes)
+    """
+    planes = np.asarray(planes)
+    if planes.ndim != 3 or planes.shape[1:] != (80, 160):
+        raise ValueError(f"Invalid sprite planes shape: {planes.shape} (expected (N, 80, 160))")
+
+    count = planes.shape[0]
+    if count == 0:
+        return []
+
+    # 픽셀 4개를 하나의 16비트 값으로 패킹
+    pixels = (planes.reshape(count, 3200, 4) & 0xF).astype(np.uint32)
+    words = pixels[:, :, 0] | (pixels[:, :, 1] << 4) | (pixels[:, :, 2] << 8) | (pixels[:, :, 3] << 12)
+
+    return encrypt_sprite_words(words, is_diamond_pearl)
+
+
+def encrypt_sprite_words(words: np.ndarray, is_diamond_pearl: bool = False) -> List[bytes]:
+    """복호화된 16비트 워드 배열을 암호화하여 스프라이트 바이너리로 변환
+
+    Args:
+        words: (N, 3200) 워드 배열 (워드당 픽셀 4개)
+        is_diamond_pearl: DP 포맷 여부
+
+    Returns:
+        List[bytes]: 스프라이트 바이너리 리스트 (각 6448 bytes)
+    """
+    words = np.array(words, dtype=np.uint32).reshape(-1, 3200)
+    count = words.shape[0]
+
+    if not is_diamond_pearl:
+        # Platinum 암호화 (시드 0 고정이므로 키 스트림은 모든 스프라이트에 공통)
+        words ^= lcg_keystreams(np.zeros(1, dtype=np.uint32))
+    else:
+        # Diamond/Pearl 암호화 (시드 = 31315 + 워드 합, 뒤에서부터)
+        seeds = (words.sum(axis=1, dtype=np.uint64) + 31315) & 0xFFFFFFFF
+        words ^= lcg_keystreams(seeds)[:, ::-1]
+
+    pixel_bytes = words.astype('<u2').tobytes()
+    return [SPRITE_HEADER + pixel_bytes[i * 6400:(i + 1) * 6400] for i in range(count)]
+
+
+def analyze_pokegra_structure(reader) -> dict:
+    """pl_pokegra.narc의 종별 구조 분석 (유효한 스프라이트 슬롯, 팔레트 유무)
+
+    Args:
+        reader: 원본 NarcReader
+
+    Returns:
+        dict: {pokemon_id: {'sprite_slots': [bool x4], 'has_normal_palette': bool, 'has_shiny_palette': bool}}
+    """
+    original_structure = {}
+
+    pokemon_count = len(reader) // 6
+    for pokemon_id in range(pokemon_count):
+        base_index = pokemon_id * 6
+        sprite_slots = []
+
+        # 4개 스프라이트 슬롯의 유효성 확인
+        for i in range(4):
+            if base_index + i < len(reader.file_entries):
+                entry = reader.file_entries[base_index + i]
+                sprite_slots.append(entry.size > 0 and entry.size == 6448)
+            else:
+                sprite_slots.append(False)
+
+        original_structure[pokemon_id] = {
+            'sprite_slots': sprite_slots,  # [female_back, male_back, female_front, male_front]
+            'has_normal_palette': base_index + 4 < len(reader.file_entries) and
+                                  reader.file_entries[base_index + 4].size == 72,
+            'has_shiny_palette': base_index + 5 < len(reader.file_entries) and
+                                 reader.file_entries[base_index + 5].size == 72
+        }
+
+    return original_structure
+
+
+def convert_narc_to_pngs(narc_file: str, output_dir: str, is_diamond_pearl: bool = False,
+                         png_bits: int = 8, compression: str = 'default') -> None:
     """NARC 파일에서 모든 포켓몬 스프라이트를 PNG로 변환
 
     Args:
         narc_file: 포켓몬 스프라이트 NARC 파일
         output_dir: PNG 파일들을 저장할 디렉토리
         is_diamond_pearl: DP 포맷 여부
+        png_bits: 출력 PNG 비트 수 (8 또는 4)
+        compression: PNG 압축 프로파일 ('fast', 'default', 'max')
     """
     from narc_reader import NarcReader
 
     reader = NarcReader(narc_file)
-    converter = PokemonSpriteConverter(is_diamond_pearl)
+    converter = PokemonSpriteConverter(is_diamond_pearl, png_bits, compression)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
@@ -300,26 +575,19 @@ def convert_narc_to_pngs(narc_file: str, output_dir: str, is_diamond_pearl: bool
             # 4개 스프라이트 (암컷 뒷모습, 수컷 뒷모습, 암컷 앞모습, 수컷 앞모습)
             sprite_names = ["female_back", "male_back", "female_front", "male_front"]
 
+            # 노말/색다른 팔레트는 종마다 한 번만 읽고 파싱
+            palettes = SpeciesPalettes.from_reader(converter, reader, base_index + 4, base_index + 5)
+
             for i, sprite_name in enumerate(sprite_names):
                 sprite_entry = reader.file_entries[base_index + i]
                 if sprite_entry.size == 6448:  # 스프라이트 데이터
                     sprite_data = reader.extract_file(base_index + i)
 
-                    # 노말 팔레트
-                    if base_index + 4 < len(reader.file_entries):
-                        normal_palette_entry = reader.file_entries[base_index + 4]
-                        if normal_palette_entry.size == 72:
-                            normal_palette = reader.extract_file(base_index + 4)
-                            output_file = pokemon_dir / f"{sprite_name}_normal.png"
-                            converter.pokemon_to_png(sprite_data, normal_palette, str(output_file))
-
-                    # 색다른 팔레트
-                    if base_index + 5 < len(reader.file_entries):
-                        shiny_palette_entry = reader.file_entries[base_index + 5]
-                        if shiny_palette_entry.size == 72:
-                            shiny_palette = reader.extract_file(base_index + 5)
-                            output_file = pokemon_dir / f"{sprite_name}_shiny.png"
-                            converter.pokemon_to_png(sprite_data, shiny_palette, str(output_file))
+                    # 한 번 복호화하여 노말/색다른 버전을 모두 저장
+                    converter.sprite_to_pngs(sprite_data, [
+                        (palette, str(pokemon_dir / f"{sprite_name}_{variant}.png"))
+                        for variant, palette in palettes.variants()
+                    ])
 
             print(f"포켓몬 #{pokemon_id:03d} 변환 완료")
 
@@ -330,7 +598,8 @@ def convert_narc_to_pngs(narc_file: str, output_dir: str, is_diamond_pearl: bool
 
 
 def convert_pngs_to_narc(input_dir: str, output_narc: str, original_narc: str = None,
-                         is_diamond_pearl: bool = False) -> None:
+                         is_diamond_pearl: bool = False, patch_output: str = None,
+                         use_index: bool = False) -> None:
     """PNG 파일들을 포켓몬 스프라이트 NARC 파일로 변환
 
     Args:
@@ -338,8 +607,13 @@ def convert_pngs_to_narc(input_dir: str, output_narc: str, original_narc: str =
         output_narc: 생성할 NARC 파일
         original_narc: 원본 NARC 파일 (구조 참조용, 선택사항)
         is_diamond_pearl: DP 포맷 여부
+        patch_output: 지정하면 전체 NARC 대신 원본 대비 패치 파일을 생성 (original_narc 필요)
+        use_index: True면 원본 NARC의 사이드카 인덱스(.idx)에서 구조 정보를 읽음
     """
-    from narc_reader import pack_narc, NarcReader
+    from narc_reader import pack_narc, NarcReader, load_bin_files
+
+    if patch_output and not original_narc:
+        raise ValueError("patch_output requires original_narc")
 
     input_path = Path(input_dir)
     converter = PokemonSpriteConverter(is_diamond_pearl)
@@ -350,31 +624,13 @@ def convert_pngs_to_narc(input_dir: str, output_narc: str, original_narc: str =
     original_structure = None
     if original_narc and os.path.exists(original_narc):
         print(f"원본 NARC 구조 분석 중: {original_narc}")
-        original_reader = NarcReader(original_narc)
-        original_structure = {}
-
-        pokemon_count = len(original_reader) // 6
-        for pokemon_id in range(pokemon_count):
-            base_index = pokemon_id * 6
-            sprite_slots = []
-
-            # 4개 스프라이트 슬롯의 유효성 확인
-            for i in range(4):
-                if base_index + i < len(original_reader.file_entries):
-                    entry = original_reader.file_entries[base_index + i]
-                    sprite_slots.append(entry.size > 0 and entry.size == 6448)
-                else:
-                    sprite_slots.append(False)
-
-            original_structure[pokemon_id] = {
-                'sprite_slots': sprite_slots,  # [female_back, male_back, female_front, male_front]
-                'has_normal_palette': base_index + 4 < len(original_reader.file_entries) and
-                                      original_reader.file_entries[base_index + 4].size == 72,
-                'has_shiny_palette': base_index + 5 < len(original_reader.file_entries) and
-                                     original_reader.file_entries[base_index + 5].size == 72
-            }
+        if use_index:
+            from narc_index import load_or_build_narc_index
+            original_structure = load_or_build_narc_index(original_narc)['structure']
+        else:
+            original_structure = analyze_pokegra_structure(NarcReader(original_narc))
 
-        print(f"원본 구조 분석 완료: {pokemon_count}마리 포켓몬")
+        print(f"원본 구조 분석 완료: {len(original_structure)}마리 포켓몬")
 
     try:
         file_index = 0
@@ -479,9 +735,14 @@ def convert_pngs_to_narc(input_dir: str, output_narc: str, original_narc: str =
                 print(f"포켓몬 #{pokemon_id:03d}: 색다른 팔레트 원본 구조 유지")
             file_index += 1
 
-        # NARC 파일 생성
-        pack_narc(str(temp_dir), output_narc)
-        print(f"NARC 파일 생성 완료: {output_narc}")
+        if patch_output:
+            # 원본 대비 변경된 엔트리만 패치로 기록
+            from narc_patch import create_narc_patch
+            create_narc_patch(original_narc, load_bin_files(str(temp_dir)), patch_output)
+        else:
+            # NARC 파일 생성
+            pack_narc(str(temp_dir), output_narc)
+            print(f"NARC 파일 생성 완료: {output_narc}")
 
         if original_structure:
             print("원본 NARC 구조를 참조하여 성별별 스프라이트 슬롯을 정확히 보존했습니다.")
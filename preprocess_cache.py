@@ -0,0 +1,230 @@
+"""
+preprocess_cache.py - 전처리된 스프라이트의 실행 간 디스크 캐시
+
+preprocess_reference_image_for_pokemon(8bpp 변환 → 색상 표준화 → 팔레트 압축 → 크기 조정)은
+같은 원본 PNG에 대해 매 실행마다 같은 결과를 냅니다. 결과 인덱스 평면과 팔레트를
+원본 내용 해시 + DP 여부 + 스프라이트 번호 + 파이프라인 버전을 키로 디스크에 보관하여,
+한 종만 수정한 뒤 다시 실행하면 나머지 종의 전처리는 건너뜁니다.
+
+- 엔트리: 'PPC1' + 너비/높이/팔레트 길이/패킹 여부 + 팔레트 + 인덱스 평면
+  (모든 인덱스가 16 미만이면 4bpp로 패킹하여 160x80 평면이 6400 bytes)
+- 용량 상한을 넘으면 가장 오래 사용하지 않은 엔트리부터 삭제 (mtime 기준)
+- 환경 변수 POKEGRA_PREPROCESS_CACHE로 캐시 디렉토리를 지정하며, 빈 문자열이면 사용하지 않음
+  (환경 변수이므로 프로세스 풀 워커에도 그대로 적용됨)
+
+전처리 로직이 바뀌면 PIPELINE_VERSION을 올려 기존 엔트리를 무효화해야 합니다.
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+PIPELINE_VERSION = 1
+CACHE_MAGIC = b'PPC1'
+CACHE_ENV = "POKEGRA_PREPROCESS_CACHE"
+DEFAULT_CACHE_DIR = ".preprocess_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".ppc"
+
+_HEADER = struct.Struct('<4sHHHB')
+
+
+def cache_key(source_data: bytes, is_diamond_pearl: bool, sprite_number: int) -> str:
+    """원본 내용 + 전처리 조건으로 캐시 키 생성"""
+    digest = hashlib.sha256(source_data)
+    digest.update(f":{PIPELINE_VERSION}:{int(bool(is_diamond_pearl))}:{sprite_number}".encode())
+    return digest.hexdigest()
+
+
+def encode_entry(image: Image.Image) -> bytes:
+    """'P' 이미지 → 캐시 엔트리 바이트"""
+    width, height = image.size
+    palette = bytes(image.getpalette() or [])
+    plane = np.asarray(image, dtype=np.uint8).reshape(-1)
+
+    packed = width % 2 == 0 and (plane.size == 0 or int(plane.max()) < 16)
+    if packed:
+        plane_data = ((plane[0::2] << 4) | plane[1::2]).tobytes()
+    else:
+        plane_data = plane.tobytes()
+
+    return _HEADER.pack(CACHE_MAGIC, width, height, len(palette), packed) + palette + plane_data
+
+
+def decode_entry(data: bytes) -> Image.Image:
+    """캐시 엔트리 바이트 → 'P' 이미지"""
+    magic, width, height, palette_length, packed = _HEADER.unpack_from(data)
+    if magic != CACHE_MAGIC:
+        raise ValueError("Invalid preprocess cache entry")
+
+    offset = _HEADER.size
+    palette = data[offset:offset + palette_length]
+    plane_data = np.frombuffer(data, dtype=np.uint8, offset=offset + palette_length)
+
+    if packed:
+        plane = np.empty(plane_data.size * 2, dtype=np.uint8)
+        plane[0::2] = plane_data >> 4
+        plane[1::2] = plane_data & 0x0F
+    else:
+        plane = plane_data
+
+    if plane.size != width * height:
+        raise ValueError("Truncated preprocess cache entry")
+
+    image = Image.frombytes('P', (width, height), plane.tobytes())
+    if palette:
+        image.putpalette(palette)
+    return image
+
+
+class PreprocessCache:
+    """전처리 결과 디스크 캐시 (용량 상한, LRU 삭제)"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        """캐시된 이미지 (없거나 손상되었으면 None)"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                image = decode_entry(f.read())
+            os.utime(path)  # 최근 사용 표시
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return image
+
+    def put(self, key: str, image: Image.Image) -> None:
+        """이미지를 캐시에 기록 (임시 파일 후 교체이므로 여러 프로세스가 동시에 써도 안전)"""
+        data = encode_entry(image)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._entry_path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """오래 사용하지 않은 엔트리부터 삭제하여 상한의 90% 이하로 줄임"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        """모든 엔트리 삭제"""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+        self._total_bytes = 0
+
+
+_default_cache = None
+
+
+def get_default_cache() -> Optional[PreprocessCache]:
+    """환경 변수 설정에 따른 기본 캐시 (비활성화되어 있으면 None)"""
+    global _default_cache
+
+    cache_dir = os.environ.get(CACHE_ENV, DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return None
+    if _default_cache is None or _default_cache.cache_dir != cache_dir:
+        _default_cache = PreprocessCache(cache_dir)
+    return _default_cache
+
+
+def configure_default_cache(cache_dir: Optional[str]) -> None:
+    """기본 캐시 디렉토리 설정 (None 또는 빈 문자열이면 캐시 사용 안 함)
+
+    환경 변수로 기록하므로 이후 생성되는 워커 프로세스에도 적용됩니다.
+    """
+    os.environ[CACHE_ENV] = cache_dir or ""
+
+
+def preprocess_for_pokemon_cached(image_path: str, is_diamond_pearl: bool = False,
+                                  cache: Optional[PreprocessCache] = None) -> Image.Image:
+    """preprocess_reference_image_for_pokemon의 캐시 버전
+
+    Args:
+        image_path: 원본 이미지 경로
+        is_diamond_pearl: DP 포맷 여부
+        cache: 사용할 캐시 (None이면 기본 캐시)
+
+    Returns:
+        Image.Image: 전처리된 'P' 이미지 (매번 새 객체)
+    """
+    from indexed_bitmap_handler import preprocess_reference_image_for_pokemon, sprite_number_from_filename
+
+    if cache is None:
+        cache = get_default_cache()
+    if cache is None:
+        return preprocess_reference_image_for_pokemon(image_path, is_diamond_pearl)
+
+    with open(image_path, 'rb') as f:
+        key = cache_key(f.read(), is_diamond_pearl, sprite_number_from_filename(image_path))
+
+    image = cache.get(key)
+    if image is not None:
+        print(f"  전처리 캐시 사용: {os.path.basename(image_path)}")
+        return image
+
+    image = preprocess_reference_image_for_pokemon(image_path, is_diamond_pearl)
+    if image is not None and image.mode == 'P':
+        cache.put(key, image)
+    return image
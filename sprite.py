@@ -0,0 +1,185 @@
+"""
+sprite.py - 니블 패킹 형태의 메모리 절약형 스프라이트 표현
+
+복호화된 스프라이트를 PIL 'P' 이미지(12.8KB 인덱스 + 객체 오버헤드, 768개 팔레트 리스트)
+대신 RGCN과 같은 4bpp 패킹 평면(6400 bytes)과 BGR555 팔레트(32 bytes)로 보관합니다.
+픽셀 접근이 필요할 때만 uint8 배열로 풀어 주므로, pl_pokegra.narc 전체를
+메모리에 올려 두어도 수 MB 수준입니다.
+
+같은 스프라이트의 노말/색다른 버전은 패킹 평면 bytes 객체를 공유합니다.
+"""
+
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pokemon_sprite_converter import NIBBLE_SWAP, decrypt_sprite_words, encrypt_sprite_words
+
+SPRITE_WIDTH = 160
+SPRITE_HEIGHT = 80
+PACKED_SIZE = SPRITE_WIDTH * SPRITE_HEIGHT // 2  # 6400
+PALETTE_SIZE = 32  # BGR555 16색
+
+
+class Sprite:
+    """4bpp 패킹 평면 + BGR555 팔레트로 구성된 스프라이트"""
+
+    __slots__ = ('packed', 'palette')
+
+    def __init__(self, packed: bytes, palette: bytes):
+        """
+        Args:
+            packed: 복호화된 4bpp 평면 (6400 bytes, 리틀 엔디언 워드당 픽셀 4개, 하위 니블부터)
+            palette: BGR555 팔레트 (32 bytes, 16색)
+        """
+        if len(packed) != PACKED_SIZE:
+            raise ValueError(f"Invalid packed plane size: {len(packed)} (expected {PACKED_SIZE})")
+        if len(palette) != PALETTE_SIZE:
+            raise ValueError(f"Invalid palette size: {len(palette)} (expected {PALETTE_SIZE})")
+
+        self.packed = bytes(packed)
+        self.palette = bytes(palette)
+
+    @classmethod
+    def from_entries(cls, sprite_data: bytes, palette_data: bytes, is_diamond_pearl: bool = False) -> "Sprite":
+        """NARC 스프라이트(6448 bytes)와 팔레트(72 bytes) 엔트리로부터 생성"""
+        if len(palette_data) != 72:
+            raise ValueError(f"Invalid palette data size: {len(palette_data)} (expected 72)")
+
+        words = decrypt_sprite_words([sprite_data], is_diamond_pearl)[0]
+        return cls(words.astype('<u2').tobytes(), palette_data[40:72])
+
+    @classmethod
+    def from_pixels(cls, pixels: np.ndarray, palette: bytes) -> "Sprite":
+        """(80, 160) 인덱스 배열로부터 생성 (하위 4비트만 사용)"""
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        if pixels.shape != (SPRITE_HEIGHT, SPRITE_WIDTH):
+            raise ValueError(f"Invalid pixel array shape: {pixels.shape} (expected (80, 160))")
+
+        flat = (pixels & 0xF).reshape(-1)
+        return cls(((flat[1::2] << 4) | flat[0::2]).tobytes(), palette)
+
+    def with_palette(self, palette: bytes) -> "Sprite":
+        """같은 평면을 공유하고 팔레트만 다른 스프라이트"""
+        return Sprite(self.packed, palette)
+
+    @property
+    def nbytes(self) -> int:
+        """보관 중인 데이터 크기 (bytes)"""
+        return len(self.packed) + len(self.palette)
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """(80, 160) uint8 인덱스 배열 (접근할 때마다 새로 풀어서 반환)"""
+        packed = np.frombuffer(self.packed, dtype=np.uint8)
+        pixels = np.empty(PACKED_SIZE * 2, dtype=np.uint8)
+        pixels[0::2] = packed & 0xF
+        pixels[1::2] = packed >> 4
+        return pixels.reshape(SPRITE_HEIGHT, SPRITE_WIDTH)
+
+    def pixel(self, x: int, y: int) -> int:
+        """픽셀 하나의 인덱스 (전체 평면을 풀지 않음)"""
+        index = y * SPRITE_WIDTH + x
+        value = self.packed[index >> 1]
+        return (value >> 4) if index & 1 else (value & 0xF)
+
+    def rgb_palette(self) -> List[int]:
+        """평탄화된 16색 RGB 팔레트 (48개 값)"""
+        palette = []
+        for color_value in struct.unpack('<16H', self.palette):
+            palette.extend([(color_value & 0x1F) << 3,
+                            ((color_value >> 5) & 0x1F) << 3,
+                            ((color_value >> 10) & 0x1F) << 3])
+        return palette
+
+    def to_image(self):
+        """PIL 'P' 모드 이미지로 변환 (256색 팔레트로 확장)"""
+        from PIL import Image
+
+        image = Image.frombytes('P', (SPRITE_WIDTH, SPRITE_HEIGHT), self.pixels.tobytes())
+        image.putpalette(self.rgb_palette() + [0] * (768 - 48))
+        return image
+
+    def to_png(self, compression: str = 'default') -> bytes:
+        """4bpp PNG 바이트로 변환 (패킹 평면에서 니블 교환만 하여 바로 기록)"""
+        from png_chunks import compression_level, encode_indexed_png
+
+        packed = self.packed.translate(NIBBLE_SWAP)
+        rows = b''.join(b'\x00' + packed[row:row + SPRITE_WIDTH // 2]
+                        for row in range(0, PACKED_SIZE, SPRITE_WIDTH // 2))
+        return encode_indexed_png(rows, SPRITE_WIDTH, SPRITE_HEIGHT, 4, self.rgb_palette(),
+                                  compression_level(compression))
+
+    def to_sprite_data(self, is_diamond_pearl: bool = False) -> bytes:
+        """NARC 스프라이트 엔트리(6448 bytes)로 다시 암호화"""
+        words = np.frombuffer(self.packed, dtype='<u2')
+        return encrypt_sprite_words(words, is_diamond_pearl)[0]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sprite):
+            return NotImplemented
+        return self.packed == other.packed and self.palette == other.palette
+
+    def __hash__(self) -> int:
+        return hash((self.packed, self.palette))
+
+    def __repr__(self) -> str:
+        return f"Sprite({SPRITE_WIDTH}x{SPRITE_HEIGHT}, {self.nbytes} bytes)"
+
+
+def load_pokegra_sprites(narc_file: str, is_diamond_pearl: bool = False,
+                         reader=None) -> Dict[Tuple[int, str, str], Sprite]:
+    """pl_pokegra.narc 전체를 Sprite로 디코딩하여 메모리에 보관
+
+    모든 스프라이트는 한 번의 배치 복호화로 처리되며,
+    노말/색다른 버전은 같은 패킹 평면을 공유합니다.
+
+    Args:
+        narc_file: pl_pokegra.narc 경로
+        is_diamond_pearl: DP 포맷 여부
+        reader: 이미 열린 NarcReader (None이면 새로 엶)
+
+    Returns:
+        Dict[Tuple[int, str, str], Sprite]: (도감번호, 슬롯, 'normal'/'shiny') → Sprite
+    """
+    from narc_reader import NarcReader
+
+    if reader is None:
+        reader = NarcReader(narc_file)
+
+    slot_names = ["female_back", "male_back", "female_front", "male_front"]
+
+    sprite_keys = []
+    sprite_blobs = []
+    species_palettes: Dict[int, List[Tuple[str, bytes]]] = {}
+    for pokemon_id in range(len(reader) // 6):
+        base_index = pokemon_id * 6
+
+        palettes = []
+        for variant, offset in (('normal', 4), ('shiny', 5)):
+            if reader.file_entries[base_index + offset].size == 72:
+                palettes.append((variant, reader.extract_file(base_index + offset)[40:72]))
+        if not palettes:
+            continue
+        species_palettes[pokemon_id] = palettes
+
+        for slot_index, slot_name in enumerate(slot_names):
+            if reader.file_entries[base_index + slot_index].size == 6448:
+                sprite_keys.append((pokemon_id, slot_name))
+                sprite_blobs.append(reader.extract_file(base_index + slot_index))
+
+    words = decrypt_sprite_words(sprite_blobs, is_diamond_pearl).astype('<u2')
+
+    sprites = {}
+    for (pokemon_id, slot_name), plane_words in zip(sprite_keys, words):
+        packed = plane_words.tobytes()
+        for variant, palette in species_palettes[pokemon_id]:
+            sprites[(pokemon_id, slot_name, variant)] = Sprite(packed, palette)
+    return sprites
+
+
+def sprites_nbytes(sprites: Dict[Tuple[int, str, str], Sprite]) -> int:
+    """공유된 평면은 한 번만 세어 전체 보관 크기 계산"""
+    planes = {id(sprite.packed): len(sprite.packed) for sprite in sprites.values()}
+    return sum(planes.values()) + sum(len(sprite.palette) for sprite in sprites.values())
@@ -0,0 +1,273 @@
+"""
+sprite_arena.py - NARC 전체를 공유 메모리 아레나에 한 번만 디코딩
+
+여러 프로세스(미리보기/diff 워커)가 각자 NARC를 다시 읽고 복호화하는 대신,
+한 프로세스가 multiprocessing.shared_memory 블록에 전체 아카이브를 디코딩해 두고
+워커들은 이름으로 붙기만 합니다.
+
+블록 레이아웃:
+    헤더: magic 'SARN'(4) + version(4) + 스프라이트 수 N(4) + 팔레트 수 M(4)
+    sprite_ids: int32[N]  (각 평면의 NARC file_id)
+    palette_ids: int32[M] (각 팔레트의 NARC file_id)
+    planes: uint8[N, 80, 160] 인덱스 평면 (64바이트 정렬)
+    palettes: uint8[M, 16, 3] RGB 팔레트
+
+스프라이트/팔레트 엔트리는 NarcReader.file_entries의 크기(6448/72)로 찾으므로
+pl_pokegra.narc와 pl_otherpoke.narc 모두에 쓸 수 있습니다.
+"""
+
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+ARENA_MAGIC = b'SARN'
+ARENA_VERSION = 1
+HEADER_SIZE = 16
+ALIGNMENT = 64
+
+
+def _layout(sprite_count: int, palette_count: int) -> Dict[str, int]:
+    """블록 내 각 배열의 오프셋과 전체 크기"""
+    ids_offset = HEADER_SIZE
+    planes_offset = ids_offset + 4 * (sprite_count + palette_count)
+    planes_offset = (planes_offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+    palettes_offset = planes_offset + sprite_count * 80 * 160
+    return {
+        'ids': ids_offset,
+        'planes': planes_offset,
+        'palettes': palettes_offset,
+        'size': max(1, palettes_offset + palette_count * 16 * 3),
+    }
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """기존 블록에 붙기 (워커 종료시 resource_tracker가 블록을 지우지 않도록)"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # 3.12 이하: 붙는 쪽이 등록하지 않도록 잠시 등록 함수를 바꿔 둠
+    # (자식 프로세스는 부모와 같은 tracker를 쓰므로 등록 해제도 하면 안 됨)
+    from multiprocessing import resource_tracker
+
+    register = resource_tracker.register
+
+    def register_except_shared_memory(resource_name, rtype):
+        if rtype != "shared_memory":
+            register(resource_name, rtype)
+
+    resource_tracker.register = register_except_shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SpriteArena:
+    """공유 메모리에 디코딩된 스프라이트 평면/팔레트 배열
+
+    create()로 만든 쪽(소유자)은 close()시 블록을 해제(unlink)하고,
+    attach()로 붙은 쪽은 자신의 매핑만 닫습니다. with 문으로 사용하면 자동 정리됩니다.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+
+        header = bytes(shm.buf[:HEADER_SIZE])
+        if header[:4] != ARENA_MAGIC:
+            raise ValueError(f"Invalid sprite arena: {shm.name}")
+        version, sprite_count, palette_count = struct.unpack('<III', header[4:16])
+        if version != ARENA_VERSION:
+            raise ValueError(f"Unsupported sprite arena version: {version}")
+
+        layout = _layout(sprite_count, palette_count)
+        buffer = shm.buf
+        self.sprite_ids = np.ndarray((sprite_count,), dtype='<i4', buffer=buffer, offset=layout['ids'])
+        self.palette_ids = np.ndarray((palette_count,), dtype='<i4', buffer=buffer,
+                                      offset=layout['ids'] + 4 * sprite_count)
+        self.planes = np.ndarray((sprite_count, 80, 160), dtype=np.uint8, buffer=buffer, offset=layout['planes'])
+        self.palettes = np.ndarray((palette_count, 16, 3), dtype=np.uint8, buffer=buffer,
+                                   offset=layout['palettes'])
+
+        self._build_lookup()
+
+    def _build_lookup(self) -> None:
+        """file_id → 배열 행 조회표"""
+        self._sprite_rows = {int(file_id): row for row, file_id in enumerate(self.sprite_ids)}
+        self._palette_rows = {int(file_id): row for row, file_id in enumerate(self.palette_ids)}
+
+    @property
+    def name(self) -> str:
+        """워커가 attach()에 넘길 블록 이름"""
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    @classmethod
+    def create(cls, narc_file: str, is_diamond_pearl: bool = False, name: Optional[str] = None,
+               reader=None) -> "SpriteArena":
+        """NARC 전체를 새 공유 메모리 블록에 디코딩
+
+        Args:
+            narc_file: NARC 파일 경로
+            is_diamond_pearl: DP 포맷 여부
+            name: 블록 이름 (None이면 자동 생성)
+            reader: 이미 열린 NarcReader (None이면 새로 엶)
+
+        Returns:
+            SpriteArena: 소유자 아레나
+        """
+        from narc_reader import NarcReader
+        from pokemon_sprite_converter import PokemonSpriteConverter, decode_sprite_planes
+
+        if reader is None:
+            reader = NarcReader(narc_file)
+        converter = PokemonSpriteConverter(is_diamond_pearl)
+
+        sprite_ids = [i for i, entry in enumerate(reader.file_entries) if entry.size == 6448]
+        palette_ids = [i for i, entry in enumerate(reader.file_entries) if entry.size == 72]
+        layout = _layout(len(sprite_ids), len(palette_ids))
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=layout['size'])
+        try:
+            shm.buf[:HEADER_SIZE] = ARENA_MAGIC + struct.pack('<III', ARENA_VERSION, len(sprite_ids),
+                                                              len(palette_ids))
+            arena = cls(shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+        try:
+            arena.sprite_ids[:] = sprite_ids
+            arena.palette_ids[:] = palette_ids
+            arena._build_lookup()
+
+            # 평면은 공유 메모리 위에 직접 디코딩 (중간 복사 없음)
+            decode_sprite_planes([reader.extract_file(file_id) for file_id in sprite_ids],
+                                 is_diamond_pearl, out=arena.planes)
+
+            for row, file_id in enumerate(palette_ids):
+                palette = converter._parse_palette(reader.extract_file(file_id))
+                arena.palettes[row] = np.asarray(palette[:48], dtype=np.uint8).reshape(16, 3)
+        except BaseException:
+            arena.close()
+            raise
+
+        return arena
+
+    @classmethod
+    def attach(cls, name: str) -> "SpriteArena":
+        """다른 프로세스가 만든 블록에 이름으로 붙기"""
+        return cls(_attach_untracked(name), owner=False)
+
+    def plane(self, file_id: int) -> np.ndarray:
+        """file_id 스프라이트의 (80, 160) 인덱스 평면 (공유 메모리 뷰)"""
+        return self.planes[self._sprite_rows[file_id]]
+
+    def palette(self, file_id: int) -> np.ndarray:
+        """file_id 팔레트의 (16, 3) RGB 배열 (공유 메모리 뷰)"""
+        return self.palettes[self._palette_rows[file_id]]
+
+    def has_sprite(self, file_id: int) -> bool:
+        return file_id in self._sprite_rows
+
+    def has_palette(self, file_id: int) -> bool:
+        return file_id in self._palette_rows
+
+    def close(self) -> None:
+        """매핑 해제 (소유자면 블록도 삭제)"""
+        if self._shm is None:
+            return
+
+        # 공유 버퍼를 참조하는 배열을 먼저 놓아야 close()가 가능
+        self.sprite_ids = self.palette_ids = self.planes = self.palettes = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SpriteArena":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._sprite_rows)
+
+
+def _attach_worker(name: str) -> float:
+    """워커 프로세스: 아레나에 붙어 평면 하나를 읽는 데 걸린 시간(초)"""
+    start = time.perf_counter()
+    with SpriteArena.attach(name) as arena:
+        if len(arena):
+            int(arena.planes[len(arena) - 1].sum())
+    return time.perf_counter() - start
+
+
+def _decode_worker(narc_file: str, is_diamond_pearl: bool) -> float:
+    """워커 프로세스: NARC를 직접 읽고 전체 디코딩하는 데 걸린 시간(초)"""
+    from narc_reader import NarcReader
+    from pokemon_sprite_converter import decode_sprite_planes
+
+    start = time.perf_counter()
+    reader = NarcReader(narc_file)
+    decode_sprite_planes([reader.extract_file(i) for i, entry in enumerate(reader.file_entries)
+                          if entry.size == 6448], is_diamond_pearl)
+    return time.perf_counter() - start
+
+
+def measure_arena(narc_file: str, is_diamond_pearl: bool = False, workers: int = 4) -> dict:
+    """아레나 생성(디코딩) 시간과 워커의 attach 시간, 워커별 직접 디코딩 시간 비교
+
+    Returns:
+        dict: {'decode_seconds', 'attach_seconds', 'worker_decode_seconds', 'sprites', 'palettes', 'bytes'}
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    start = time.perf_counter()
+    with SpriteArena.create(narc_file, is_diamond_pearl) as arena:
+        decode_seconds = time.perf_counter() - start
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            attach_times = list(executor.map(_attach_worker, [arena.name] * workers))
+            decode_times = list(executor.map(_decode_worker, [narc_file] * workers, [is_diamond_pearl] * workers))
+
+        return {
+            'decode_seconds': decode_seconds,
+            'attach_seconds': max(attach_times),
+            'worker_decode_seconds': max(decode_times),
+            'sprites': len(arena),
+            'palettes': len(arena.palettes),
+            'bytes': arena.nbytes,
+        }
+
+
+def main(argv=None):
+    """명령줄 실행: python sprite_arena.py <narc> [--dp] [--workers 4]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="공유 메모리 스프라이트 아레나 attach/디코딩 시간 측정")
+    parser.add_argument("narc_file")
+    parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    result = measure_arena(args.narc_file, args.dp, args.workers)
+    print(f"아레나: 스프라이트 {result['sprites']}개, 팔레트 {result['palettes']}개, "
+          f"{result['bytes'] / 1024 / 1024:.1f} MB")
+    print(f"생성(디코딩): {result['decode_seconds'] * 1000:.1f} ms")
+    print(f"워커 attach: {result['attach_seconds'] * 1000:.2f} ms "
+          f"(워커 직접 디코딩시 {result['worker_decode_seconds'] * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+sprite_atlas.py - pl_pokegra.narc 전체를 하나(또는 몇 개)의 인덱스 시트로 내보내기/가져오기
+
+수천 개의 작은 PNG를 쓰는 대신 모든 스프라이트를 한 번에 복호화하여
+160x80 셀 단위로 큰 4bpp 인덱스 이미지에 타일링하고, 매니페스트(JSON)에
+종/슬롯/버전 → 시트 내 사각형 및 팔레트 행 매핑을 기록합니다.
+
+- 시트 픽셀 값은 RGCN 인덱스(0-15) 그대로이며, 시트 PLTE는 16단계 그레이스케일입니다.
+- 실제 색은 매니페스트의 palettes 행에 있으며, 노말/색다른 버전은 같은 셀을 공유하고
+  팔레트 행만 다릅니다.
+
+사용법:
+    python sprite_atlas.py export <pl_pokegra.narc> <출력 디렉토리> [--dp] [--columns 32]
+    python sprite_atlas.py import <atlas_000.png> <manifest.json> <원본.narc> <결과.narc> [--dp]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from pokemon_sprite_converter import PokemonSpriteConverter, decode_sprite_planes, encode_sprite_planes
+
+ATLAS_VERSION = 1
+CELL_WIDTH = 160
+CELL_HEIGHT = 80
+SPRITE_SLOT_NAMES = ["female_back", "male_back", "female_front", "male_front"]
+PALETTE_VARIANTS = {'normal': 4, 'shiny': 5}
+MANIFEST_NAME = "manifest.json"
+
+
+def _sheet_name(sheet_index: int) -> str:
+    return f"atlas_{sheet_index:03d}.png"
+
+
+def _write_sheet(plane: np.ndarray, output_path: str, compression: str = 'default') -> None:
+    """(높이, 너비) 인덱스 평면을 16단계 그레이스케일 4bpp PNG로 저장"""
+    from png_chunks import compression_level, encode_indexed_png
+
+    height, width = plane.shape
+    rows = np.zeros((height, 1 + width // 2), dtype=np.uint8)  # 각 행의 첫 바이트는 필터 타입 0
+    rows[:, 1:] = (plane[:, 0::2] << 4) | plane[:, 1::2]
+
+    gray_palette = []
+    for i in range(16):
+        gray_palette.extend([i * 17] * 3)
+
+    with open(output_path, 'wb') as f:
+        f.write(encode_indexed_png(rows.tobytes(), width, height, 4, gray_palette,
+                                   compression_level(compression)))
+
+
+def export_narc_to_atlas(narc_file: str, output_dir: str, is_diamond_pearl: bool = False,
+                         columns: int = 32, max_rows: int = 64, compression: str = 'default') -> dict:
+    """pl_pokegra.narc의 모든 스프라이트를 아틀라스 시트와 매니페스트로 내보내기
+
+    Args:
+        narc_file: pl_pokegra.narc 경로
+        output_dir: 시트(atlas_NNN.png)와 manifest.json을 저장할 디렉토리
+        is_diamond_pearl: DP 포맷 여부
+        columns: 시트 한 줄의 셀 수
+        max_rows: 시트 하나의 최대 셀 줄 수 (넘으면 다음 시트로)
+        compression: PNG 압축 프로파일 ('fast', 'default', 'max')
+
+    Returns:
+        dict: 매니페스트 데이터
+    """
+    from narc_reader import NarcReader
+
+    reader = NarcReader(narc_file)
+    converter = PokemonSpriteConverter(is_diamond_pearl)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    pokemon_count = len(reader) // 6
+    print(f"아틀라스 내보내기 시작: {pokemon_count}마리 포켓몬")
+
+    # 유효한 스프라이트/팔레트 엔트리 수집
+    sprite_ids = []
+    sprites = []
+    palettes = []
+    for pokemon_id in range(pokemon_count):
+        base_index = pokemon_id * 6
+
+        variants = {}
+        for variant, offset in PALETTE_VARIANTS.items():
+            palette_id = base_index + offset
+            if reader.file_entries[palette_id].size == 72:
+                palette = converter._parse_palette(reader.extract_file(palette_id))
+                variants[variant] = len(palettes)
+                palettes.append({'file_id': palette_id,
+                                 'colors': [palette[i * 3:i * 3 + 3] for i in range(16)]})
+
+        for slot_index, slot_name in enumerate(SPRITE_SLOT_NAMES):
+            file_id = base_index + slot_index
+            if reader.file_entries[file_id].size == 6448:
+                sprite_ids.append(file_id)
+                sprites.append({'species': pokemon_id, 'slot': slot_name, 'file_id': file_id,
+                                'variants': variants})
+
+    # 전체 스프라이트를 한 번에 복호화
+    planes = decode_sprite_planes([reader.extract_file(file_id) for file_id in sprite_ids], is_diamond_pearl)
+
+    # 셀 배치 및 시트 기록
+    cells_per_sheet = columns * max_rows
+    sheets = []
+    for sheet_index, start in enumerate(range(0, len(sprites), cells_per_sheet)):
+        sheet_planes = planes[start:start + cells_per_sheet]
+        rows = (len(sheet_planes) + columns - 1) // columns
+        sheet_columns = min(columns, len(sheet_planes))
+        sheet = np.zeros((rows * CELL_HEIGHT, sheet_columns * CELL_WIDTH), dtype=np.uint8)
+
+        for cell_index, plane in enumerate(sheet_planes):
+            x = (cell_index % columns) * CELL_WIDTH
+            y = (cell_index // columns) * CELL_HEIGHT
+            sheet[y:y + CELL_HEIGHT, x:x + CELL_WIDTH] = plane
+
+            sprite = sprites[start + cell_index]
+            sprite['sheet'] = sheet_index
+            sprite['rect'] = [x, y, CELL_WIDTH, CELL_HEIGHT]
+
+        sheet_name = _sheet_name(sheet_index)
+        _write_sheet(sheet, str(output_path / sheet_name), compression)
+        sheets.append({'file': sheet_name, 'size': [sheet.shape[1], sheet.shape[0]]})
+        print(f"시트 저장 완료: {sheet_name} ({len(sheet_planes)}개 셀)")
+
+    manifest = {
+        'version': ATLAS_VERSION,
+        'is_diamond_pearl': is_diamond_pearl,
+        'entries_count': len(reader),
+        'cell_size': [CELL_WIDTH, CELL_HEIGHT],
+        'sheets': sheets,
+        'palettes': palettes,
+        'sprites': sprites,
+    }
+
+    with open(output_path / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+
+    print(f"아틀라스 내보내기 완료: {output_dir} (스프라이트 {len(sprites)}개, 팔레트 {len(palettes)}개)")
+    return manifest
+
+
+def load_atlas_manifest(manifest_path: str) -> dict:
+    """매니페스트 읽기 및 버전 확인"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('version') != ATLAS_VERSION:
+        raise ValueError(f"Unsupported atlas manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def _flatten_colors(colors: List[List[int]]) -> List[int]:
+    palette = []
+    for color in colors:
+        palette.extend(color)
+    return palette
+
+
+def convert_atlas_to_narc(atlas_png: str, manifest_path: str, original_narc: str, output_narc: str,
+                          is_diamond_pearl: bool = None) -> None:
+    """아틀라스 시트와 매니페스트로부터 NARC 재구성
+
+    매니페스트에 있는 스프라이트/팔레트 엔트리는 시트와 팔레트 행으로 다시 인코딩하고,
+    나머지 엔트리(빈 슬롯 등)는 원본 NARC에서 그대로 복사합니다.
+    시트는 한 번만 NumPy 배열로 읽고, 셀은 잘라낸 이미지가 아니라 배열 뷰로 모아
+    전체를 한 번에 배치 인코딩합니다.
+
+    Args:
+        atlas_png: 첫 번째 시트 경로 (나머지 시트는 같은 디렉토리에서 찾음)
+        manifest_path: manifest.json 경로
+        original_narc: 원본 NARC 경로
+        output_narc: 생성할 NARC 경로
+        is_diamond_pearl: DP 포맷 여부 (None이면 매니페스트 값 사용)
+    """
+    from PIL import Image
+    from narc_reader import NarcReader, write_narc
+
+    if not os.path.exists(original_narc):
+        raise FileNotFoundError(f"NARC file not found: {original_narc}")
+
+    manifest = load_atlas_manifest(manifest_path)
+    if is_diamond_pearl is None:
+        is_diamond_pearl = manifest['is_diamond_pearl']
+
+    reader = NarcReader(original_narc)
+    if len(reader) != manifest['entries_count']:
+        raise ValueError(f"Atlas does not match original NARC: {manifest['entries_count']} entries "
+                         f"in manifest, {len(reader)} in {original_narc}")
+
+    converter = PokemonSpriteConverter(is_diamond_pearl)
+    replacements = {}
+
+    # 팔레트 행 → 팔레트 엔트리
+    for palette in manifest['palettes']:
+        replacements[palette['file_id']] = converter._palette_to_data(_flatten_colors(palette['colors']))
+
+    # 시트 셀 → 스프라이트 엔트리
+    sheet_dir = Path(atlas_png).parent
+    sheets = {}
+    cells = []
+    for sprite in manifest['sprites']:
+        sheet_index = sprite['sheet']
+        if sheet_index not in sheets:
+            sheet_path = atlas_png if sheet_index == 0 else str(sheet_dir / manifest['sheets'][sheet_index]['file'])
+            with Image.open(sheet_path) as sheet_image:
+                if sheet_image.mode != 'P':
+                    raise ValueError(f"Atlas sheet is not an indexed image: {sheet_path} ({sheet_image.mode})")
+                sheets[sheet_index] = np.asarray(sheet_image)
+
+        x, y, width, height = sprite['rect']
+        if (width, height) != (CELL_WIDTH, CELL_HEIGHT):
+            raise ValueError(f"Invalid atlas cell size for file {sprite['file_id']}: {width}x{height}")
+        cells.append(sheets[sheet_index][y:y + height, x:x + width])
+
+    if cells:
+        sprite_data_list = encode_sprite_planes(np.stack(cells), is_diamond_pearl)
+        for sprite, sprite_data in zip(manifest['sprites'], sprite_data_list):
+            replacements[sprite['file_id']] = sprite_data
+
+    file_data_list = [replacements[file_id] if file_id in replacements else reader.extract_file(file_id)
+                      for file_id in range(len(reader))]
+
+    write_narc(file_data_list, output_narc)
+    print(f"아틀라스에서 NARC 생성 완료: {output_narc} "
+          f"(스프라이트 {len(manifest['sprites'])}개, 팔레트 {len(manifest['palettes'])}개)")
+
+
+def main(argv=None):
+    """명령줄 실행
+
+    python sprite_atlas.py export <pl_pokegra.narc> <출력 디렉토리>
+    python sprite_atlas.py import <atlas_000.png> <manifest.json> <원본.narc> <결과.narc>
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="pl_pokegra.narc 스프라이트 아틀라스 내보내기/가져오기")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="NARC → 아틀라스 시트 + 매니페스트")
+    export_parser.add_argument("narc_file")
+    export_parser.add_argument("output_dir")
+    export_parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    export_parser.add_argument("--columns", type=int, default=32, help="시트 한 줄의 셀 수")
+    export_parser.add_argument("--max-rows", type=int, default=64, help="시트당 최대 셀 줄 수")
+    export_parser.add_argument("--compression", choices=("fast", "default", "max"), default="default")
+
+    import_parser = subparsers.add_parser("import", help="아틀라스 시트 + 매니페스트 → NARC")
+    import_parser.add_argument("atlas_png")
+    import_parser.add_argument("manifest")
+    import_parser.add_argument("original_narc")
+    import_parser.add_argument("output_narc")
+    import_parser.add_argument("--dp", action="store_true", default=None, help="Diamond/Pearl 포맷 (기본: 매니페스트 값)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_narc_to_atlas(args.narc_file, args.output_dir, args.dp, args.columns, args.max_rows, args.compression)
+    else:
+        convert_atlas_to_narc(args.atlas_png, args.manifest, args.original_narc, args.output_narc, args.dp)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+sprite_server.py - NARC에서 바로 스프라이트 PNG를 제공하는 로컬 HTTP 서버
+
+디스크에 추출하지 않고 /pokegra/<도감번호>/<슬롯>/<normal|shiny>.png 요청을
+pl_pokegra.narc에서 직접 렌더링합니다.
+
+- 슬롯: female_back, male_back, female_front, male_front (또는 0-3)
+- 디코딩된 인덱스 평면과 인코딩된 PNG 바이트를 바이트 크기 제한 LRU에 보관
+- 엔트리 해시 기반 ETag 반환 (If-None-Match 일치시 304)
+"""
+
+import io
+import re
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from narc_reader import NarcReader, hash_entry
+from pokemon_sprite_converter import PokemonSpriteConverter
+
+SPRITE_SLOT_NAMES = ["female_back", "male_back", "female_front", "male_front"]
+PALETTE_OFFSETS = {'normal': 4, 'shiny': 5}
+
+SPRITE_PATH_PATTERN = re.compile(r'^/pokegra/(\d+)/(\w+)/(normal|shiny)\.png$')
+
+
+class ByteLRUCache:
+    """전체 바이트 크기로 제한되는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """캐시 조회 (없으면 None)"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value: bytes) -> None:
+        """캐시에 저장하고, 제한을 넘으면 오래된 항목부터 제거"""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old_value = self._items.pop(key, None)
+            if old_value is not None:
+                self.current_bytes -= len(old_value)
+
+            self._items[key] = value
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SpriteRenderer:
+    """NARC 엔트리를 PNG로 렌더링하고 결과를 캐시"""
+
+    def __init__(self, narc_file: str, is_diamond_pearl: bool = False,
+                 plane_cache_bytes: int = 16 * 1024 * 1024, png_cache_bytes: int = 32 * 1024 * 1024,
+                 use_index: bool = False):
+        """
+        Args:
+            narc_file: pl_pokegra.narc 경로
+            is_diamond_pearl: DP 포맷 여부
+            plane_cache_bytes: 디코딩된 인덱스 평면 캐시 크기 제한
+            png_cache_bytes: 인코딩된 PNG 캐시 크기 제한
+            use_index: True면 사이드카 인덱스(.idx)의 엔트리 해시 재사용
+        """
+        self.reader = NarcReader(narc_file, use_index=use_index)
+        self.converter = PokemonSpriteConverter(is_diamond_pearl)
+        self.plane_cache = ByteLRUCache(plane_cache_bytes)
+        self.png_cache = ByteLRUCache(png_cache_bytes)
+        self._entry_hashes = {}
+        self._lock = threading.Lock()
+
+    def _entry_hash(self, file_id: int) -> bytes:
+        """엔트리 내용 해시 (인덱스에 있으면 재사용, 없으면 한 번만 계산)"""
+        if self.reader.entry_hashes is not None:
+            return self.reader.entry_hashes[file_id]
+
+        with self._lock:
+            entry_hash = self._entry_hashes.get(file_id)
+        if entry_hash is None:
+            entry_hash = hash_entry(self.reader.extract_file(file_id))
+            with self._lock:
+                self._entry_hashes[file_id] = entry_hash
+        return entry_hash
+
+    def resolve(self, species: int, slot: str, variant: str) -> Optional[Tuple[int, int]]:
+        """요청을 (스프라이트 file_id, 팔레트 file_id)로 변환 (유효하지 않으면 None)"""
+        if slot.isdigit():
+            slot_index = int(slot)
+        elif slot in SPRITE_SLOT_NAMES:
+            slot_index = SPRITE_SLOT_NAMES.index(slot)
+        else:
+            return None
+
+        if slot_index >= len(SPRITE_SLOT_NAMES) or variant not in PALETTE_OFFSETS:
+            return None
+
+        sprite_id = species * 6 + slot_index
+        palette_id = species * 6 + PALETTE_OFFSETS[variant]
+        if palette_id >= len(self.reader):
+            return None
+
+        if self.reader.file_entries[sprite_id].size != 6448 or self.reader.file_entries[palette_id].size != 72:
+            return None
+
+        return sprite_id, palette_id
+
+    def etag(self, sprite_id: int, palette_id: int) -> str:
+        """스프라이트/팔레트 엔트리 해시로부터 ETag 생성"""
+        return '"' + hash_entry(self._entry_hash(sprite_id) + self._entry_hash(palette_id)).hex() + '"'
+
+    def _index_plane(self, sprite_id: int) -> bytes:
+        """디코딩된 160x80 인덱스 평면 (캐시 사용)"""
+        plane = self.plane_cache.get(sprite_id)
+        if plane is None:
+            plane = self.converter._parse_sprite(self.reader.extract_file(sprite_id)).tobytes()
+            self.plane_cache.put(sprite_id, plane)
+        return plane
+
+    def render(self, sprite_id: int, palette_id: int) -> bytes:
+        """PNG 바이트 렌더링 (캐시 사용)"""
+        key = (sprite_id, palette_id)
+        png_data = self.png_cache.get(key)
+        if png_data is not None:
+            return png_data
+
+        image = Image.frombytes('P', (160, 80), self._index_plane(sprite_id))
+        image.putpalette(self.converter._parse_palette(self.reader.extract_file(palette_id)))
+
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+        png_data = buffer.getvalue()
+
+        self.png_cache.put(key, png_data)
+        return png_data
+
+
+class SpriteRequestHandler(BaseHTTPRequestHandler):
+    """/pokegra/<species>/<slot>/<normal|shiny>.png 요청 처리"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송시 지연 ACK 대기 방지
+    renderer: SpriteRenderer = None  # make_server()에서 설정
+
+    def do_GET(self):
+        match = SPRITE_PATH_PATTERN.match(self.path.split('?', 1)[0])
+        if not match:
+            self._send_empty(404)
+            return
+
+        resolved = self.renderer.resolve(int(match.group(1)), match.group(2), match.group(3))
+        if resolved is None:
+            self._send_empty(404)
+            return
+
+        etag = self.renderer.etag(*resolved)
+        if self.headers.get('If-None-Match') == etag:
+            self._send_empty(304, etag)
+            return
+
+        png_data = self.renderer.render(*resolved)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(png_data)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(png_data)
+
+    def _send_empty(self, status: int, etag: str = None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # 미리보기 스크러빙 중에는 요청마다 로그를 찍지 않음
+        pass
+
+
+def make_server(narc_file: str, host: str = "127.0.0.1", port: int = 8080,
+                is_diamond_pearl: bool = False, use_index: bool = False, **cache_options) -> ThreadingHTTPServer:
+    """스프라이트 서버 생성 (serve_forever()는 호출 측에서)"""
+    renderer = SpriteRenderer(narc_file, is_diamond_pearl, use_index=use_index, **cache_options)
+    handler = type('BoundSpriteRequestHandler', (SpriteRequestHandler,), {'renderer': renderer})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    """명령줄 실행: python sprite_server.py <pl_pokegra.narc> [--host H] [--port P] [--dp]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NARC 스프라이트 미리보기 HTTP 서버")
+    parser.add_argument("narc_file", help="pl_pokegra.narc 경로")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    parser.add_argument("--use-index", action="store_true", help="사이드카 인덱스(.idx) 사용")
+    parser.add_argument("--plane-cache-mb", type=int, default=16, help="인덱스 평면 캐시 크기 (MB)")
+    parser.add_argument("--png-cache-mb", type=int, default=32, help="PNG 캐시 크기 (MB)")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.narc_file, args.host, args.port, args.dp, args.use_index,
+                         plane_cache_bytes=args.plane_cache_mb * 1024 * 1024,
+                         png_cache_bytes=args.png_cache_mb * 1024 * 1024)
+
+    print(f"스프라이트 서버 시작: http://{args.host}:{server.server_address[1]}/pokegra/<도감번호>/<슬롯>/<normal|shiny>.png")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
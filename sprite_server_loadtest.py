@@ -0,0 +1,143 @@
+"""
+sprite_server_loadtest.py - sprite_server 로컬 부하 테스트
+
+종을 빠르게 넘겨 보는 편집기 미리보기 패턴을 흉내 내어,
+여러 스레드가 연속으로 스프라이트를 요청하고 초당 요청 수와 p50/p99 지연을 보고합니다.
+
+사용법:
+    python sprite_server_loadtest.py <pl_pokegra.narc> [--threads 8] [--requests 2000]
+    python sprite_server_loadtest.py --url http://127.0.0.1:8080 [--species 493]
+"""
+
+import http.client
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+from sprite_server import SPRITE_SLOT_NAMES, make_server
+
+
+def _percentile(sorted_values, fraction):
+    """정렬된 값에서 백분위수 계산"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _worker(host, port, paths, latencies, errors, lock):
+    """하나의 keep-alive 연결로 경로들을 순서대로 요청"""
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    local_latencies = []
+    local_errors = 0
+
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            if response.status not in (200, 304, 404):
+                local_errors += 1
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+        local_latencies.append(time.perf_counter() - start)
+
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def run_load_test(host: str, port: int, species_count: int, threads: int = 8,
+                  requests_per_thread: int = 250, seed: int = 0) -> dict:
+    """부하 테스트 실행
+
+    각 스레드는 임의의 시작 종에서 앞뒤로 스크러빙하듯 인접 종을 연속 요청합니다.
+
+    Returns:
+        dict: {'requests', 'errors', 'seconds', 'rps', 'p50_ms', 'p99_ms'}
+    """
+    rng = random.Random(seed)
+    thread_paths = []
+    for _ in range(threads):
+        species = rng.randrange(species_count)
+        paths = []
+        for _ in range(requests_per_thread):
+            species = min(species_count - 1, max(0, species + rng.choice((-1, 1, 1))))
+            slot = rng.choice(SPRITE_SLOT_NAMES)
+            variant = rng.choice(("normal", "shiny"))
+            paths.append(f"/pokegra/{species}/{slot}/{variant}.png")
+        thread_paths.append(paths)
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    workers = [threading.Thread(target=_worker, args=(host, port, paths, latencies, errors, lock))
+               for paths in thread_paths]
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="sprite_server 로컬 부하 테스트")
+    parser.add_argument("narc_file", nargs="?", help="pl_pokegra.narc (지정시 서버를 직접 띄움)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (예: http://127.0.0.1:8080)")
+    parser.add_argument("--species", type=int, default=None, help="요청할 종 수 (기본: NARC 엔트리 수 / 6)")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="전체 요청 수")
+    parser.add_argument("--dp", action="store_true", help="Diamond/Pearl 포맷")
+    args = parser.parse_args(argv)
+
+    if not args.narc_file and not args.url:
+        parser.error("narc_file 또는 --url 중 하나가 필요합니다")
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        species_count = args.species or 494
+    else:
+        server = make_server(args.narc_file, "127.0.0.1", 0, args.dp)
+        host, port = server.server_address[:2]
+        species_count = args.species or len(server.RequestHandlerClass.renderer.reader) // 6
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        per_thread = max(1, args.requests // args.threads)
+
+        # 콜드 캐시와 웜 캐시를 각각 측정
+        for label in ("cold", "warm"):
+            result = run_load_test(host, port, species_count, args.threads, per_thread)
+            print(f"[{label}] {result['requests']}건, 오류 {result['errors']}건, "
+                  f"{result['rps']:.0f} req/s, p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())